@@ -50,6 +50,77 @@ def token_required(f):
     
     return decorated
 
+# Tracker identity
+# Tracking endpoints run on every page view, so they verify the JWT signature
+# only (no User lookup) and cache the result until the token expires.
+import hmac
+import hashlib
+import secrets
+import threading
+import time
+from app.data_structures.recent_list import RecentList
+
+TOKEN_CACHE_SIZE = 10000
+ANONYMOUS_PREFIX = 'anon:'
+_token_cache = RecentList(TOKEN_CACHE_SIZE)
+_token_cache_lock = threading.Lock()
+
+def verify_token_cached(token):
+    """Return the user_id in a valid token, or None; cached per token until expiry"""
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached and cached[1] > now:
+        return cached[0]
+    try:
+        data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        user_id = data['user_id']
+    except Exception:
+        return None
+    with _token_cache_lock:
+        _token_cache.touch(token, (user_id, data.get('exp', now + 60)))
+    return user_id
+
+def _sign_anonymous(anon_id):
+    return hmac.new(SECRET_KEY.encode(), anon_id.encode(), hashlib.sha256).hexdigest()[:16]
+
+def issue_anonymous_id():
+    """New signed session-scoped id: returns (tracker key, token for the client)"""
+    anon_id = ANONYMOUS_PREFIX + secrets.token_hex(8)
+    return anon_id, f'{anon_id}.{_sign_anonymous(anon_id)}'
+
+def resolve_tracker_user(data=None, create=True):
+    """
+    Identify the caller for user tracking.
+    A verified bearer token (header, or `token` in the body for sendBeacon)
+    maps to the user's id. Otherwise a signed anonymous id from the
+    X-Tracker-Id header or `tracker_id` in the body / query is used, and
+    with create=True a new one is issued. Client-chosen ids are never trusted.
+
+    Returns:
+        (tracker key or None, newly issued tracker id or None)
+    """
+    data = data if isinstance(data, dict) else {}
+    token = None
+    auth_header = request.headers.get('Authorization', '')
+    if ' ' in auth_header:
+        token = auth_header.split(" ")[1]
+    token = token or data.get('token')
+    if token:
+        user_id = verify_token_cached(str(token))
+        if user_id is not None:
+            return str(user_id), None
+    
+    tracker_id = request.headers.get('X-Tracker-Id') or data.get('tracker_id') or request.args.get('tracker_id')
+    if tracker_id and '.' in str(tracker_id):
+        anon_id, signature = str(tracker_id).rsplit('.', 1)
+        if anon_id.startswith(ANONYMOUS_PREFIX) and hmac.compare_digest(signature, _sign_anonymous(anon_id)):
+            return anon_id, None
+    
+    if not create:
+        return None, None
+    return issue_anonymous_id()
+
 # Routes
 from .base import BaseAPI
 from app.models.user import User
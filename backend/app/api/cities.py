@@ -4,68 +4,126 @@ Endpoints for fetching cities from database
 Refactored to use OOP Class-Based Views
 """
 from flask import Blueprint, request, current_app
+from sqlalchemy.orm import load_only, selectinload
 from .base import BaseAPI
 from app.models.city import City
 from app.models.attraction import Attraction
 from app.database import db
-from app.api.auth import token_required
-from sqlalchemy import or_, String
+from app.api.auth import token_required, resolve_tracker_user
+from app.utils import encode_cursor, decode_cursor
 from app.managers import city_cache
 from app.managers import rating_manager
+from app.managers import ranking_engine
 from app.managers import user_tracker
+from app.managers import trending_engine
+from app.managers import unique_viewer_counter
+from app.managers import co_view_index
+from app.managers import city_search
+from app.managers import catalog_facets
+from app.managers import geo_index
 
 bp = Blueprint('cities', __name__)
+attractions_bp = Blueprint('attractions', __name__)
 
 class CityListAPI(BaseAPI):
     """
     API for City Listing and Creation.
     Inheritance: Inherits from BaseAPI.
     """
+    FACET_PARAMS = ('region', 'trip_type', 'category', 'budget')
+
     def get(self):
-        """Get all cities with filtered query"""
+        """
+        Get all cities with filtered query.
+        Sorted listings (?sort=id|name|budget|rating) are keyset-paginated:
+        pass the returned next_cursor back as ?cursor=. Search results
+        without a sort are ranked by relevance and paged with ?page=.
+        ?count=none skips the total and the facet counts.
+        ?fields= and ?include= select the columns and expansions returned.
+        """
         try:
             # Extract query params
             search = request.args.get('search', '').strip()
-            region = request.args.get('region', '').strip()
-            trip_type = request.args.get('trip_type', '').strip()
             budget_max = request.args.get('budget_max', type=int)
-            page = request.args.get('page', 1, type=int)
-            limit = request.args.get('limit', 9, type=int)
-            
-            # Query Construction
-            query = City.query
-            
+            page = max(request.args.get('page', 1, type=int), 1)
+            limit = max(request.args.get('limit', 9, type=int), 1)
+            fuzzy = request.args.get('fuzzy', '').lower() in ('1', 'true', 'yes')
+            with_counts = request.args.get('count', 'exact') != 'none'
+            sort = request.args.get('sort') or (None if search else 'id')
+            if sort is not None and sort not in catalog_facets.SORTS:
+                return self.send_error(f'sort must be one of: {", ".join(catalog_facets.SORTS)}')
+            fields, include = parse_projection()
+
+            after = None
+            cursor = request.args.get('cursor')
+            if cursor and sort:
+                try:
+                    values = decode_cursor(cursor, [str] + catalog_facets.SORT_KEY_TYPES[sort])
+                except ValueError as e:
+                    return self.send_error(str(e))
+                if values[0] != sort:
+                    return self.send_error('Cursor does not match sort order')
+                after = values[1:]
+
+            # Each facet accepts repeated or comma separated values (OR);
+            # trip_type_mode=all requires every listed trip type instead
+            selections = {facet: self._multi_arg(facet) for facet in self.FACET_PARAMS}
+            match_all = ('trip_type',) if request.args.get('trip_type_mode') == 'all' else ()
+
+            ranked_ids = None
             if search:
-                pattern = f'%{search}%'
-                query = query.filter(or_(
-                    City.name.ilike(pattern),
-                    City.state.ilike(pattern),
-                    City.description.ilike(pattern)
-                ))
-            
-            if region:
-                query = query.filter(City.region == region)
-                
-            if trip_type:
-                # Use string matching for broad compatibility (SQLite JSON is text)
-                query = query.filter(City.trip_types.cast(String).ilike(f'%"{trip_type}"%'))
-                
-            if budget_max:
-                query = query.filter(City.avg_budget_per_day <= budget_max)
-                
-            pagination = query.paginate(page=page, per_page=limit, error_out=False)
-            cities = pagination.items
-            
-            return self.send_response({
-                'count': pagination.total,
-                'pages': pagination.pages,
-                'current_page': page,
-                'has_next': pagination.has_next,
-                'cities': [city.to_dict() for city in cities]
-            })
+                # Rank with the in-memory search index; typo-tolerant matching is
+                # used when asked for (?fuzzy=1) or when exact search finds nothing
+                ranked_ids = [] if fuzzy else city_search.search(search)
+                if not ranked_ids:
+                    ranked_ids = city_search.fuzzy_search(search)
+                    fuzzy = True
+
+            # Filtering and facet counts both come from the bitmap index
+            matched, facets = catalog_facets.filter(
+                selections, budget_max or None, match_all, ranked_ids, with_counts
+            )
+
+            next_cursor = None
+            if sort:
+                offset = 0 if after else (page - 1) * limit
+                city_ids, next_key = catalog_facets.page(matched, sort, after, offset, limit)
+                if next_key:
+                    next_cursor = encode_cursor([sort] + next_key)
+                has_next = next_key is not None
+                total = matched.bit_count() if with_counts else None
+            else:
+                city_ids = [city_id for city_id in ranked_ids if matched >> city_id & 1]
+                total = len(city_ids) if with_counts else None
+                has_next = page * limit < len(city_ids)
+                city_ids = city_ids[(page - 1) * limit:page * limit]
+
+            cities = load_cities_by_ids(city_ids, fields, include)
+            response = {
+                'count': total,
+                'pages': None if total is None else (total + limit - 1) // limit,
+                'current_page': None if after else page,
+                'has_next': has_next,
+                'sort': sort or 'relevance',
+                'next_cursor': next_cursor,
+                'cities': [serialize_city(city, fields, include) for city in cities]
+            }
+            if facets is not None:
+                response['facets'] = facets
+            if search:
+                response['fuzzy'] = fuzzy
+            return self.send_response(response)
         except Exception as e:
             return self.send_error(str(e), 500)
 
+    @staticmethod
+    def _multi_arg(name):
+        """Values of a repeatable, comma separated query param"""
+        values = []
+        for raw in request.args.getlist(name):
+            values.extend(value.strip() for value in raw.split(',') if value.strip())
+        return values
+
     @token_required
     def post(self, current_user):
         """Create a new city (Admin only)"""
@@ -88,7 +146,9 @@ class CityListAPI(BaseAPI):
                 avg_budget_per_day=float(data.get('avg_budget_per_day', 0) or 0),
                 trip_types=data.get('trip_types', []),
                 best_season=data.get('best_season'),
-                recommended_days=data.get('recommended_days')
+                recommended_days=data.get('recommended_days'),
+                latitude=data.get('latitude'),
+                longitude=data.get('longitude')
             )
             
             db.session.add(city)
@@ -100,11 +160,17 @@ class CityListAPI(BaseAPI):
                         city_id=city.id,
                         name=attr_data.get('name'),
                         category=attr_data.get('category'),
-                        description=attr_data.get('description')
+                        description=attr_data.get('description'),
+                        latitude=attr_data.get('latitude'),
+                        longitude=attr_data.get('longitude')
                     )
                     db.session.add(attraction)
             
             db.session.commit()
+            ranking_engine.set_city_facets(city.id, city.region, city.trip_types)
+            city_search.index_city(city)
+            catalog_facets.index_city(city)
+            geo_index.index_city(city)
 
             return self.send_response({
                 'message': 'City created successfully',
@@ -119,36 +185,39 @@ class CityDetailAPI(BaseAPI):
     """
     API for Single City Operations.
     """
+    DEFAULT_INCLUDE = ('attractions', 'reviews_summary')
+
     def get(self, city_id):
         try:
-            # Check cache
-            cache_key = f'city_{city_id}'
-            cached_city = city_cache.get(cache_key)
+            fields, include = parse_projection(self.DEFAULT_INCLUDE)
             
-            if cached_city:
-                # Track recent city view
-                user_id = request.args.get('user_id')
-                if user_id:
-                    user_tracker.add_recent_city(user_id, city_id, cached_city.get('name', ''))
-                return self.send_response({'city': cached_city, 'from_cache': True})
+            # Check cache (each projection has its own key, grouped under the
+            # city's key so updates and new reviews drop all of them)
+            base_key = f'city_{city_id}'
+            cache_key = projection_key(base_key, fields, include, self.DEFAULT_INCLUDE)
+            city_data = city_cache.get(cache_key)
+            from_cache = city_data is not None
             
-            # Fetch from DB
-            city = City.query.get_or_404(city_id)
-            city_data = city.to_dict_details()
-            
-            # Cache result
-            city_cache.set(cache_key, city_data)
+            if not from_cache:
+                # Fetch from DB; the trending display fields are always loaded
+                # so view tracking works with any projection
+                load_fields = fields
+                if fields:
+                    load_fields = fields + tuple(f for f in trending_engine.CITY_FIELDS if f not in fields)
+                city = City.query.options(*projection_options(load_fields, include)).get_or_404(city_id)
+                city_data = serialize_city(city, load_fields, include)
+                city_cache.set(cache_key, city_data, group=base_key)
             
-            # Track
-            user_id = request.args.get('user_id')
+            # Track views and recent cities
+            trending_engine.record_view(city_id, city_data)
+            user_id, _ = resolve_tracker_user(create=False)
+            unique_viewer_counter.record_view(city_id, user_id or request.remote_addr)
             if user_id:
-                user_tracker.add_recent_city(user_id, city_id, city.name)
-            
-            # Add rating to BST
-            if hasattr(city, 'rating') and city.rating:
-                rating_manager.add_rating(city_id, int(city.rating))
+                user_tracker.add_recent_city(user_id, city_id, city_data.get('name', ''))
             
-            return self.send_response({'city': city_data, 'from_cache': False})
+            if fields:
+                city_data = {key: value for key, value in city_data.items() if key in fields or key in include}
+            return self.send_response({'city': city_data, 'from_cache': from_cache})
         except Exception as e:
              if '404' in str(e): return self.send_error('City not found', 404)
              return self.send_error(str(e), 500)
@@ -163,7 +232,8 @@ class CityDetailAPI(BaseAPI):
             data = request.get_json()
 
             fields = ['name', 'state', 'description', 'image_url', 'category', 
-                      'region', 'best_season', 'recommended_days', 'trip_types']
+                      'region', 'best_season', 'recommended_days', 'trip_types',
+                      'latitude', 'longitude']
             
             for field in fields:
                 if field in data:
@@ -176,6 +246,12 @@ class CityDetailAPI(BaseAPI):
             
             # Invalidate cache
             city_cache.delete(f'city_{city_id}')
+            city_cache.delete(TopRatedCityAPI.CACHE_KEY)
+            ranking_engine.set_city_facets(city.id, city.region, city.trip_types)
+            trending_engine.update_city(city.to_dict())
+            city_search.index_city(city)
+            catalog_facets.index_city(city)
+            geo_index.index_city(city)
 
             return self.send_response({
                 'message': 'City updated successfully',
@@ -196,6 +272,14 @@ class CityDetailAPI(BaseAPI):
             db.session.commit()
             
             city_cache.delete(f'city_{city_id}')
+            city_cache.delete(TopRatedCityAPI.CACHE_KEY)
+            ranking_engine.remove_city(city_id)
+            trending_engine.remove_city(city_id)
+            unique_viewer_counter.remove_city(city_id)
+            co_view_index.remove_city(city_id)
+            city_search.remove_city(city_id)
+            catalog_facets.remove_city(city_id)
+            geo_index.remove_city(city_id)
 
             return self.send_response({'message': 'City deleted successfully'})
         except Exception as e:
@@ -213,12 +297,7 @@ class RegionAPI(BaseAPI):
 class TripTypeAPI(BaseAPI):
     def get(self):
         try:
-            cities = City.query.filter(City.trip_types.isnot(None)).all()
-            trip_types = set()
-            for city in cities:
-                if city.trip_types:
-                    trip_types.update(city.trip_types)
-            return self.send_response({'trip_types': sorted(list(trip_types))})
+            return self.send_response({'trip_types': catalog_facets.get_trip_types()})
         except Exception as e:
             return self.send_error(str(e), 500)
 
@@ -230,23 +309,125 @@ class AttractionCategoryAPI(BaseAPI):
         except Exception as e:
             return self.send_error(str(e), 500)
 
+CITY_INCLUDES = ('attractions', 'reviews_summary')
+
+def _split_param(name):
+    raw = request.args.get(name, '')
+    return [value.strip() for value in raw.split(',') if value.strip()]
+
+def parse_projection(default_include=()):
+    """
+    Read ?fields= (City columns) and ?include= (attractions, reviews_summary).
+    Returns (fields, include) in canonical form, so equivalent requests share
+    a cache key: unknown names are dropped, duplicates and order are ignored,
+    fields is a tuple in City.FIELDS order that always starts with id, or
+    None when every column is asked for (or none is).
+    """
+    requested = set(_split_param('fields'))
+    fields = None
+    if requested:
+        fields = tuple(field for field in City.FIELDS if field == 'id' or field in requested)
+        if fields == tuple(City.FIELDS):
+            fields = None
+    
+    include = default_include
+    if 'include' in request.args:
+        include = _split_param('include')
+    return fields, tuple(name for name in CITY_INCLUDES if name in include)
+
+def projection_key(base_key, fields, include, default_include=()):
+    """Cache key for a projection of base_key; the default projection uses base_key itself"""
+    if fields is None and include == tuple(default_include):
+        return base_key
+    return f"{base_key}|{','.join(fields or ('*',))}|{','.join(include)}"
+
+def projection_options(fields, include):
+    """Loader options that fetch only the requested columns and relationships"""
+    options = []
+    if fields:
+        options.append(load_only(*[getattr(City, field) for field in fields]))
+    if 'attractions' in include:
+        options.append(selectinload(City.attractions))
+    return options
+
+def serialize_city(city, fields=None, include=()):
+    """City dict limited to fields, plus any requested expansions"""
+    data = city.to_dict(fields)
+    if 'attractions' in include:
+        data['attractions'] = [a.to_dict() for a in city.attractions]
+    if 'reviews_summary' in include:
+        data['reviews_summary'] = ranking_engine.get_summary(city.id)
+    return data
+
+def load_cities_by_ids(city_ids, fields=None, include=()):
+    """
+    Fetch cities for a list of IDs with a single IN query.
+    Returns them in the same order as city_ids, skipping missing ones.
+    Only the given columns (and relationships in include) are loaded.
+    """
+    if not city_ids:
+        return []
+    query = City.query.options(*projection_options(fields, include))
+    cities = query.filter(City.id.in_(set(city_ids))).all()
+    by_id = {city.id: city for city in cities}
+    return [by_id[city_id] for city_id in city_ids if city_id in by_id]
+
 class TopRatedCityAPI(BaseAPI):
+    """
+    API for top-rated cities, ranked by the Bayesian ranking engine.
+    Query params: limit, region, trip_type, decay (time-decayed scores),
+    fields, include.
+    """
+    CACHE_KEY = 'top_rated'
+
+    def _build_payload(self, ranked, fields=None, include=()):
+        """Hydrate ranked engine entries into city dicts"""
+        cities = load_cities_by_ids([item['city_id'] for item in ranked], fields, include)
+        by_id = {city.id: city for city in cities}
+        cities_data = []
+        for item in ranked:
+            city = by_id.get(item['city_id'])
+            if city:
+                city_dict = serialize_city(city, fields, include)
+                city_dict['rating'] = item['rating']
+                city_dict['score'] = item['score']
+                city_dict['review_count'] = item['review_count']
+                cities_data.append(city_dict)
+        return cities_data
+
     def get(self):
         try:
             limit = request.args.get('limit', 10, type=int)
-            top_ratings = rating_manager.get_top_ratings(limit)
+            region = request.args.get('region', '').strip()
+            trip_type = request.args.get('trip_type', '').strip()
+            decay = request.args.get('decay', '').lower() in ('1', 'true', 'yes')
+            fields, include = parse_projection()
             
-            cities_data = []
-            for item in top_ratings:
-                city = City.query.get(item['city_id'])
-                if city:
-                    city_dict = city.to_dict()
-                    city_dict['rating'] = item['rating']
-                    cities_data.append(city_dict)
+            ranking_engine.ensure_loaded()
+            
+            if region or trip_type or decay or limit > ranking_engine.TOP_K_SIZE:
+                ranked = ranking_engine.get_top(limit, region=region, trip_type=trip_type, decay=decay)
+                cities_data = self._build_payload(ranked, fields, include)
+                return self.send_response({
+                    'count': len(cities_data),
+                    'cities': cities_data
+                })
+            
+            # Common case: serve the precomputed top-K list for the current version
+            ranked = ranking_engine.get_top(ranking_engine.TOP_K_SIZE)
+            version = ranking_engine.version
+            cache_key = projection_key(self.CACHE_KEY, fields, include)
+            cached = city_cache.get(cache_key)
+            from_cache = cached is not None and cached['version'] == version
+            if not from_cache:
+                cached = {'version': version, 'cities': self._build_payload(ranked, fields, include)}
+                city_cache.set(cache_key, cached, group=self.CACHE_KEY)
             
+            cities_data = cached['cities'][:limit]
             return self.send_response({
                 'count': len(cities_data),
-                'cities': cities_data
+                'cities': cities_data,
+                'from_cache': from_cache
             })
         except Exception as e:
             return self.send_error(str(e), 500)
@@ -254,11 +435,204 @@ class TopRatedCityAPI(BaseAPI):
 class RatingStatsAPI(BaseAPI):
     def get(self):
         try:
-            stats = rating_manager.get_rating_stats()
+            ranking_engine.ensure_loaded()
+            percentiles = request.args.get('percentiles', '').strip()
+            if percentiles:
+                try:
+                    percentiles = [float(p) for p in percentiles.split(',') if p.strip()]
+                except ValueError:
+                    return self.send_error('percentiles must be a comma-separated list of numbers')
+                stats = rating_manager.get_rating_stats(percentiles)
+            else:
+                stats = rating_manager.get_rating_stats()
             return self.send_response({'stats': stats})
         except Exception as e:
             return self.send_error(str(e), 500)
 
+class RatingRangeAPI(BaseAPI):
+    """
+    API for cities whose rating falls within [min, max].
+    Counting is O(log n); listing is O(log n + k) on the rating BST.
+    Listings accept fields and include.
+    """
+    def get(self):
+        try:
+            low = request.args.get('min', type=float)
+            high = request.args.get('max', type=float)
+            limit = request.args.get('limit', 50, type=int)
+            count_only = request.args.get('count_only', '').lower() in ('1', 'true', 'yes')
+            
+            if low is None or high is None:
+                return self.send_error('min and max are required')
+            if low > high:
+                return self.send_error('min must not exceed max')
+            fields, include = parse_projection()
+            
+            ranking_engine.ensure_loaded()
+            count = rating_manager.count_in_range(low, high)
+            if count_only:
+                return self.send_response({'count': count})
+            
+            ratings = rating_manager.get_ratings_in_range(low, high, limit=limit)
+            rating_by_id = {item['city_id']: item['rating'] for item in ratings}
+            cities_data = []
+            for city in load_cities_by_ids([item['city_id'] for item in ratings], fields, include):
+                city_dict = serialize_city(city, fields, include)
+                city_dict['rating'] = rating_by_id[city.id]
+                cities_data.append(city_dict)
+            
+            return self.send_response({
+                'count': count,
+                'returned': len(cities_data),
+                'cities': cities_data
+            })
+        except Exception as e:
+            return self.send_error(str(e), 500)
+
+class TrendingCityAPI(BaseAPI):
+    """
+    API for cities viewed most in a recent window, served from memory.
+    Query params: window (e.g. 15m, 1h, 6h, 1d; default 1h, max 24h), limit.
+    """
+    WINDOW_UNITS = {'m': 1, 'h': 60, 'd': 1440}
+
+    def get(self):
+        try:
+            window = request.args.get('window', '1h').strip().lower()
+            limit = min(request.args.get('limit', 10, type=int), 50)
+            
+            unit = self.WINDOW_UNITS.get(window[-1:])
+            if unit is None or not window[:-1].isdigit() or int(window[:-1]) < 1:
+                return self.send_error('window must look like 15m, 1h or 1d')
+            window_minutes = int(window[:-1]) * unit
+            if window_minutes > trending_engine.MAX_WINDOW_MINUTES:
+                return self.send_error('window cannot exceed 24h')
+            
+            cities = trending_engine.get_trending(window_minutes, limit)
+            return self.send_response({
+                'window': window,
+                'window_minutes': window_minutes,
+                'count': len(cities),
+                'cities': cities
+            })
+        except Exception as e:
+            return self.send_error(str(e), 500)
+
+class AlsoViewedAPI(BaseAPI):
+    """
+    API for cities viewed in the same sessions as a city, served from memory.
+    Query params: limit (max CoViewIndex.NEIGHBOR_LIMIT).
+    """
+    def get(self, city_id):
+        try:
+            limit = request.args.get('limit', co_view_index.NEIGHBOR_LIMIT, type=int)
+            cities = co_view_index.get_also_viewed(city_id, limit)
+            return self.send_response({
+                'city_id': city_id,
+                'count': len(cities),
+                'cities': cities
+            })
+        except Exception as e:
+            return self.send_error(str(e), 500)
+
+class CitySuggestAPI(BaseAPI):
+    """
+    Typeahead suggestions for cities, states and attractions, from memory.
+    Query params: q (typed prefix), limit (max CitySearchIndex.SUGGEST_K).
+    """
+    def get(self):
+        try:
+            query = request.args.get('q', '').strip()
+            limit = min(request.args.get('limit', city_search.SUGGEST_K, type=int), city_search.SUGGEST_K)
+            suggestions = city_search.suggest(query, max(limit, 1))
+            return self.send_response({
+                'query': query,
+                'count': len(suggestions),
+                'suggestions': suggestions
+            })
+        except Exception as e:
+            return self.send_error(str(e), 500)
+
+def parse_nearby_args(max_radius_km, max_limit):
+    """
+    Read lat, lng, radius (km, optional) and limit for a nearby query.
+    Raises ValueError on missing or out-of-range values.
+    """
+    lat = request.args.get('lat', type=float)
+    lng = request.args.get('lng', type=float)
+    if lat is None or lng is None:
+        raise ValueError('lat and lng are required')
+    if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+        raise ValueError('lat must be within [-90, 90] and lng within [-180, 180]')
+    radius = request.args.get('radius', type=float)
+    if radius is not None and not 0 < radius <= max_radius_km:
+        raise ValueError(f'radius must be between 0 and {max_radius_km} km')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), max_limit)
+    return lat, lng, radius, limit
+
+class NearbyCityAPI(BaseAPI):
+    """
+    API for cities near a point, served from the in-memory geo index.
+    Query params: lat, lng, radius (km; omit for the nearest cities),
+    limit, fields, include. Results carry distance_km, nearest first.
+    """
+    MAX_RADIUS_KM = 2000
+    MAX_LIMIT = 100
+
+    def get(self):
+        try:
+            try:
+                lat, lng, radius, limit = parse_nearby_args(self.MAX_RADIUS_KM, self.MAX_LIMIT)
+                fields, include = parse_projection()
+            except ValueError as e:
+                return self.send_error(str(e))
+            
+            found = geo_index.nearby_cities(lat, lng, radius, limit)
+            cities = load_cities_by_ids([city_id for _, city_id in found], fields, include)
+            distances = {city_id: distance for distance, city_id in found}
+            cities_data = []
+            for city in cities:
+                city_dict = serialize_city(city, fields, include)
+                city_dict['distance_km'] = round(distances[city.id], 2)
+                cities_data.append(city_dict)
+            return self.send_response({'count': len(cities_data), 'cities': cities_data})
+        except Exception as e:
+            return self.send_error(str(e), 500)
+
+class NearbyAttractionAPI(BaseAPI):
+    """
+    API for attractions near a point, served from the in-memory geo index.
+    Query params: lat, lng, radius (km; omit for the nearest attractions), limit.
+    """
+    MAX_RADIUS_KM = 500
+    MAX_LIMIT = 100
+
+    def get(self):
+        try:
+            try:
+                lat, lng, radius, limit = parse_nearby_args(self.MAX_RADIUS_KM, self.MAX_LIMIT)
+            except ValueError as e:
+                return self.send_error(str(e))
+            
+            found = geo_index.nearby_attractions(lat, lng, radius, limit)
+            attraction_ids = [attraction_id for _, attraction_id in found]
+            by_id = {}
+            if attraction_ids:
+                rows = db.session.query(Attraction, City.name).join(City, City.id == Attraction.city_id)
+                for attraction, city_name in rows.filter(Attraction.id.in_(attraction_ids)):
+                    attraction_dict = attraction.to_dict()
+                    attraction_dict['city_name'] = city_name
+                    by_id[attraction.id] = attraction_dict
+            
+            attractions_data = []
+            for distance, attraction_id in found:
+                if attraction_id in by_id:
+                    by_id[attraction_id]['distance_km'] = round(distance, 2)
+                    attractions_data.append(by_id[attraction_id])
+            return self.send_response({'count': len(attractions_data), 'attractions': attractions_data})
+        except Exception as e:
+            return self.send_error(str(e), 500)
+
 class CacheStatsAPI(BaseAPI):
     def get(self):
         try:
@@ -300,5 +674,12 @@ bp.add_url_rule('/attraction-categories', view_func=AttractionCategoryAPI.as_vie
 # Stats and Special Routes
 bp.add_url_rule('/top-rated', view_func=TopRatedCityAPI.as_view('top_rated'))
 bp.add_url_rule('/ratings/stats', view_func=RatingStatsAPI.as_view('rating_stats'))
+bp.add_url_rule('/ratings/range', view_func=RatingRangeAPI.as_view('rating_range'))
+bp.add_url_rule('/<int:city_id>/also-viewed', view_func=AlsoViewedAPI.as_view('also_viewed'))
+bp.add_url_rule('/suggest', view_func=CitySuggestAPI.as_view('suggest'))
+bp.add_url_rule('/trending', view_func=TrendingCityAPI.as_view('trending'))
+bp.add_url_rule('/nearby', view_func=NearbyCityAPI.as_view('nearby'))
 bp.add_url_rule('/cache/stats', view_func=CacheStatsAPI.as_view('cache_stats'))
 bp.add_url_rule('/explore', view_func=ExploreCityAPI.as_view('explore_city'))
+
+attractions_bp.add_url_rule('/nearby', view_func=NearbyAttractionAPI.as_view('nearby_attractions'))
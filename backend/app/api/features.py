@@ -9,9 +9,10 @@ Consolidated endpoints for secondary features:
 """
 from flask import Blueprint, request, jsonify
 from .base import BaseAPI
-from app.database import db
-from app.api.auth import token_required
-from app.managers import user_tracker
+from app.database import db, insert_unique
+from app.api.auth import token_required, resolve_tracker_user
+from app.managers import user_tracker, ranking_engine, city_cache, unique_viewer_counter, catalog_facets, ReviewIngestor
+from app.utils import encode_cursor, decode_cursor, keyset_filter
 
 # Models
 from app.models.review import Review
@@ -26,6 +27,8 @@ import hashlib
 import uuid
 import time
 import os
+import json
+from datetime import datetime
 from werkzeug.utils import secure_filename
 
 # ==============================================================================
@@ -41,24 +44,33 @@ class ReviewListAPI(BaseAPI):
             data = request.get_json()
             if not all(k in data for k in ['city_id', 'rating', 'comment']):
                 return self.send_error('Missing required fields')
+            rating = data['rating']
+            if isinstance(rating, bool) or not isinstance(rating, int) or not 1 <= rating <= 5:
+                return self.send_error('rating must be an integer from 1 to 5')
+            city_id = data['city_id']
+            if isinstance(city_id, bool) or not isinstance(city_id, int):
+                return self.send_error('city_id must be an integer')
+            # Known cities are answered from memory; only unknown ids (e.g. a
+            # city seeded since the catalog was loaded) cost a lookup
+            if not catalog_facets.has_city(city_id) and db.session.get(City, city_id) is None:
+                return self.send_error('City not found', 404)
                 
-            existing_review = Review.query.filter_by(
-                user_id=current_user.id, 
-                city_id=data['city_id']
-            ).first()
-            
-            if existing_review:
+            values = {
+                'user_id': current_user.id,
+                'city_id': city_id,
+                'rating': data['rating'],
+                'comment': data['comment'],
+                'created_at': datetime.utcnow()
+            }
+            # Single INSERT; the (user_id, city_id) unique constraint rejects repeats
+            review_id = insert_unique(Review, values)
+            if review_id is None:
                 return self.send_error('You have already reviewed this city')
-                
-            review = Review(
-                user_id=current_user.id,
-                city_id=data['city_id'],
-                rating=data['rating'],
-                comment=data['comment']
-            )
+            review = Review(id=review_id, **values)
             
-            db.session.add(review)
-            db.session.commit()
+            ranking_engine.add_review(review.id, review.city_id, review.rating, review.created_at)
+            # Cached city details embed the review summary
+            city_cache.delete(f'city_{review.city_id}')
             
             return self.send_response({
                 'message': 'Review added successfully',
@@ -69,25 +81,120 @@ class ReviewListAPI(BaseAPI):
             return self.send_error(str(e), 500)
 
 class CityReviewsAPI(BaseAPI):
+    """
+    API for a city's reviews.
+    Keyset-paginated: pass the returned next_cursor back as ?cursor=.
+    """
+    MAX_LIMIT = 100
+    # Each ordering ends in Review.id so the keyset is unique
+    SORTS = {
+        'newest': [(Review.created_at, 'desc'), (Review.id, 'desc')],
+        'highest': [(Review.rating, 'desc'), (Review.created_at, 'desc'), (Review.id, 'desc')],
+        'lowest': [(Review.rating, 'asc'), (Review.created_at, 'desc'), (Review.id, 'desc')],
+    }
+    CURSOR_TYPES = {'id': int, 'rating': int, 'created_at': datetime.fromisoformat}
+
     def get(self, city_id):
         """Get reviews for a city"""
         try:
-            reviews = Review.query.filter_by(city_id=city_id).order_by(Review.created_at.desc()).all()
+            sort = request.args.get('sort', 'newest')
+            if sort not in self.SORTS:
+                return self.send_error(f'sort must be one of: {", ".join(self.SORTS)}')
+            limit = min(max(request.args.get('limit', 20, type=int), 1), self.MAX_LIMIT)
+            cursor = request.args.get('cursor')
+            order_spec = self.SORTS[sort]
+            
+            # Reviewer names come from the same query (no per-review lookups)
+            query = db.session.query(Review, User.full_name).outerjoin(
+                User, User.id == Review.user_id
+            ).filter(Review.city_id == city_id)
+            
+            if cursor:
+                try:
+                    values = decode_cursor(cursor, [self.CURSOR_TYPES[c.key] for c, _ in order_spec])
+                except ValueError as e:
+                    return self.send_error(str(e))
+                query = query.filter(keyset_filter(order_spec, values))
+            
+            query = query.order_by(*[c.desc() if d == 'desc' else c.asc() for c, d in order_spec])
+            rows = query.limit(limit + 1).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            
             reviews_data = []
-            for review in reviews:
-                user = User.query.get(review.user_id)
+            for review, full_name in rows:
                 review_dict = review.to_dict()
-                review_dict['user_name'] = user.full_name if user else 'Anonymous'
+                review_dict['user_name'] = full_name or 'Anonymous'
                 reviews_data.append(review_dict)
+            
+            next_cursor = None
+            if has_more:
+                last_review = rows[-1][0]
+                next_cursor = encode_cursor([getattr(last_review, c.key) for c, _ in order_spec])
+            
             return self.send_response({
                 'count': len(reviews_data),
+                'total': ranking_engine.review_count(city_id),
+                'sort': sort,
+                'has_more': has_more,
+                'next_cursor': next_cursor,
                 'reviews': reviews_data
             })
         except Exception as e:
             return self.send_error(str(e), 500)
 
+class ReviewBulkAPI(BaseAPI):
+    """
+    Bulk review import (Admin only).
+    Accepts a JSON array, or NDJSON (one review per line) which is
+    streamed from the request body without buffering it whole.
+    """
+    @staticmethod
+    def _ndjson_rows(stream):
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None  # Counted as invalid by the ingestor
+
+    @token_required
+    def post(self, current_user):
+        if not current_user.is_admin: return self.send_error('Admin privileges required', 403)
+        try:
+            chunk_size = request.args.get('chunk_size', ReviewIngestor.DEFAULT_CHUNK_SIZE, type=int)
+            chunk_size = min(max(chunk_size, 1), 10000)
+            
+            if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+                rows = self._ndjson_rows(request.stream)
+            else:
+                rows = request.get_json()
+                if not isinstance(rows, list):
+                    return self.send_error('Expected a JSON array of reviews')
+            
+            stats = ReviewIngestor(chunk_size=chunk_size).ingest(rows)
+            return self.send_response({'message': 'Bulk import complete', 'stats': stats})
+        except Exception as e:
+            db.session.rollback()
+            return self.send_error(str(e), 500)
+
+class CityReviewSummaryAPI(BaseAPI):
+    def get(self, city_id):
+        """Get review count, average and star histogram without the review list"""
+        try:
+            return self.send_response({
+                'city_id': city_id,
+                'summary': ranking_engine.get_summary(city_id)
+            })
+        except Exception as e:
+            return self.send_error(str(e), 500)
+
 reviews_bp.add_url_rule('', view_func=ReviewListAPI.as_view('review_create'), methods=['POST'])
+reviews_bp.add_url_rule('/bulk', view_func=ReviewBulkAPI.as_view('review_bulk'), methods=['POST'])
 reviews_bp.add_url_rule('/<int:city_id>', view_func=CityReviewsAPI.as_view('city_reviews'), methods=['GET'])
+reviews_bp.add_url_rule('/<int:city_id>/summary', view_func=CityReviewSummaryAPI.as_view('city_review_summary'), methods=['GET'])
 
 
 # ==============================================================================
@@ -109,12 +216,12 @@ class FavoriteDetailAPI(BaseAPI):
     @token_required
     def post(self, current_user, city_id):
         try:
-            existing = Favorite.query.filter_by(user_id=current_user.id, city_id=city_id).first()
-            if existing: return self.send_response({'message': 'Already in favorites'})
-            
-            favorite = Favorite(user_id=current_user.id, city_id=city_id)
-            db.session.add(favorite)
-            db.session.commit()
+            favorite_id = insert_unique(Favorite, {
+                'user_id': current_user.id,
+                'city_id': city_id,
+                'created_at': datetime.utcnow()
+            })
+            if favorite_id is None: return self.send_response({'message': 'Already in favorites'})
             return self.send_response({'message': 'Added to favorites'}, status=201)
         except Exception as e:
             db.session.rollback()
@@ -142,34 +249,83 @@ favorites_bp.add_url_rule('/<int:city_id>', view_func=FavoriteDetailAPI.as_view(
 # ==============================================================================
 users_bp = Blueprint('users', __name__)
 
-class UserTrackAPI(BaseAPI):
+class UserTrackerAPI(BaseAPI):
+    """
+    Base for tracking endpoints: the user comes from a verified token or a
+    signed anonymous tracker id (see resolve_tracker_user), never from a
+    client-supplied user_id. A newly issued anonymous id is returned as
+    `tracker_id` so the client can send it back on later requests.
+    """
+    def send_tracked(self, data, issued_id, status=200):
+        if issued_id:
+            data['tracker_id'] = issued_id
+        return self.send_response(data, status)
+
+class UserTrackAPI(UserTrackerAPI):
     def post(self):
         try:
-            data = request.get_json()
-            if not data.get('user_id') or not data.get('page'):
-                return self.send_error('user_id and page required')
-            user_tracker.track_navigation(data['user_id'], data['page'])
-            return self.send_response({'message': 'Navigation tracked successfully'})
+            data = request.get_json() or {}
+            if not data.get('page'):
+                return self.send_error('page required')
+            user_id, issued_id = resolve_tracker_user(data)
+            user_tracker.track_navigation(user_id, data['page'])
+            return self.send_tracked({'message': 'Navigation tracked successfully'}, issued_id)
         except Exception as e:
             return self.send_error(str(e), 500)
 
-class UserHistoryAPI(BaseAPI):
+class UserTrackBatchAPI(UserTrackerAPI):
+    """
+    Batched navigation tracking.
+    Body: {"events": [{"page", "client_timestamp"}, ...], "token" | "tracker_id"}
+    Parsed regardless of Content-Type so browsers can send it with
+    navigator.sendBeacon (text/plain, no custom headers) while the page is
+    unloading; the identity may therefore also be given in the body.
+    """
+    MAX_EVENTS = 500
+
+    def post(self):
+        try:
+            data = request.get_json(force=True, silent=True)
+            events = data.get('events') if isinstance(data, dict) else data
+            if not isinstance(events, list):
+                return self.send_error('events array required')
+            if len(events) > self.MAX_EVENTS:
+                return self.send_error(f'At most {self.MAX_EVENTS} events per batch')
+            
+            user_id, issued_id = resolve_tracker_user(data)
+            valid = []
+            for event in events:
+                if isinstance(event, dict) and event.get('page'):
+                    # Timestamps are only used for ordering; drop non-strings
+                    client_timestamp = event.get('client_timestamp')
+                    if not isinstance(client_timestamp, str):
+                        client_timestamp = None
+                    valid.append((user_id, str(event['page']), client_timestamp))
+            
+            user_tracker.track_navigation_batch(valid)
+            return self.send_tracked({
+                'message': 'Navigation batch tracked successfully',
+                'accepted': len(valid),
+                'rejected': len(events) - len(valid)
+            }, issued_id)
+        except Exception as e:
+            return self.send_error(str(e), 500)
+
+class UserHistoryAPI(UserTrackerAPI):
     def get(self):
         try:
-            user_id = request.args.get('user_id')
             limit = request.args.get('limit', 10, type=int)
-            if not user_id: return self.send_error('user_id required')
-            history = user_tracker.get_navigation_history(user_id, limit)
+            user_id, _ = resolve_tracker_user(create=False)
+            history = user_tracker.get_navigation_history(user_id, limit) if user_id else []
             return self.send_response({'count': len(history), 'history': history})
         except Exception as e:
             return self.send_error(str(e), 500)
 
-class UserBackAPI(BaseAPI):
+class UserBackAPI(UserTrackerAPI):
     def post(self):
         try:
-            data = request.get_json()
-            if not data.get('user_id'): return self.send_error('user_id required')
-            previous_page = user_tracker.go_back(data['user_id'])
+            user_id, _ = resolve_tracker_user(request.get_json(silent=True), create=False)
+            previous_page = user_tracker.go_back(user_id) if user_id else None
             if previous_page:
                 return self.send_response({'previous_page': previous_page})
             else:
@@ -177,17 +333,17 @@ class UserBackAPI(BaseAPI):
         except Exception as e:
             return self.send_error(str(e), 500)
 
-class UserRecentCitiesAPI(BaseAPI):
+class UserRecentCitiesAPI(UserTrackerAPI):
     def get(self):
         try:
-            user_id = request.args.get('user_id')
-            if not user_id: return self.send_error('user_id required')
-            recent_cities = user_tracker.get_recent_cities(user_id)
+            user_id, _ = resolve_tracker_user(create=False)
+            recent_cities = user_tracker.get_recent_cities(user_id) if user_id else []
             return self.send_response({'count': len(recent_cities), 'recent_cities': recent_cities})
         except Exception as e:
             return self.send_error(str(e), 500)
 
 users_bp.add_url_rule('/navigation', view_func=UserTrackAPI.as_view('user_track'))
+users_bp.add_url_rule('/navigation/batch', view_func=UserTrackBatchAPI.as_view('user_track_batch'), methods=['POST'])
 users_bp.add_url_rule('/navigation/history', view_func=UserHistoryAPI.as_view('user_history'))
 users_bp.add_url_rule('/navigation/back', view_func=UserBackAPI.as_view('user_back'))
 users_bp.add_url_rule('/recent-cities', view_func=UserRecentCitiesAPI.as_view('recent_cities'))
@@ -255,6 +411,20 @@ class AdminStatsAPI(BaseAPI):
                 'bookings': Booking.query.count(),
                 'reviews': Review.query.count()
             }
+            
+            # Approximate unique viewers per city: ?period=day|week|month
+            period = request.args.get('period', 'day')
+            if period not in unique_viewer_counter.PERIOD_DAYS:
+                return self.send_error('period must be day, week or month')
+            unique_viewers = unique_viewer_counter.get_unique_viewers(period, request.args.get('limit', 10, type=int))
+            names = dict(
+                db.session.query(City.id, City.name)
+                .filter(City.id.in_([item['city_id'] for item in unique_viewers['cities']]))
+                .all()
+            )
+            for item in unique_viewers['cities']:
+                item['city_name'] = names.get(item['city_id'])
+            stats['unique_viewers'] = unique_viewers
             return self.send_response({'stats': stats})
         except Exception as e:
             return self.send_error(str(e), 500)
@@ -269,5 +439,15 @@ class AdminUsersAPI(BaseAPI):
         except Exception as e:
             return self.send_error(str(e), 500)
 
+class AdminTrackerStatsAPI(BaseAPI):
+    @token_required
+    def get(self, current_user):
+        if not current_user.is_admin: return self.send_error('Admin privileges required', 403)
+        try:
+            return self.send_response({'tracker_stats': user_tracker.get_memory_stats()})
+        except Exception as e:
+            return self.send_error(str(e), 500)
+
 admin_bp.add_url_rule('/stats', view_func=AdminStatsAPI.as_view('admin_stats'), methods=['GET'])
 admin_bp.add_url_rule('/users', view_func=AdminUsersAPI.as_view('admin_users'), methods=['GET'])
+admin_bp.add_url_rule('/tracker/stats', view_func=AdminTrackerStatsAPI.as_view('admin_tracker_stats'), methods=['GET'])
@@ -0,0 +1,186 @@
+"""
+Bitmap Index Data Structure Implementation
+One bitset per attribute value - useful for fast filtering on low-cardinality fields
+"""
+
+
+class BitmapIndex:
+    """
+    Maps each value of a multi-valued attribute to a bitmap of document ids
+    Bitmaps are Python ints where bit n is set when document n has the value,
+    so AND / OR of whole filters are single integer operations and counting
+    matches is a popcount. Values are matched case-insensitively and keep the
+    spelling they were first added with.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self.bitmaps = {}       # normalized value -> int bitmap
+        self.labels = {}        # normalized value -> display spelling
+        self.doc_values = {}    # doc_id -> tuple of normalized values
+
+    @staticmethod
+    def _normalize(value):
+        return str(value).strip().lower()
+
+    def add(self, doc_id, values):
+        """
+        Set a document's values, replacing any it had before
+        Time Complexity: O(v) bitmap updates for v values
+
+        Args:
+            doc_id: Non-negative integer id (used as the bit position)
+            values: Iterable of values (None and blanks are skipped)
+        """
+        self.remove(doc_id)
+        bit = 1 << doc_id
+        keys = []
+        for value in values or ():
+            if value is None or not str(value).strip():
+                continue
+            key = self._normalize(value)
+            if key in keys:
+                continue
+            keys.append(key)
+            self.bitmaps[key] = self.bitmaps.get(key, 0) | bit
+            self.labels.setdefault(key, str(value).strip())
+        self.doc_values[doc_id] = tuple(keys)
+
+    def remove(self, doc_id):
+        """
+        Remove a document from every value's bitmap
+        Time Complexity: O(v)
+
+        Returns:
+            bool: True if removed, False if not found
+        """
+        keys = self.doc_values.pop(doc_id, None)
+        if keys is None:
+            return False
+        mask = ~(1 << doc_id)
+        for key in keys:
+            bitmap = self.bitmaps[key] & mask
+            if bitmap:
+                self.bitmaps[key] = bitmap
+            else:
+                del self.bitmaps[key]
+                del self.labels[key]
+        return True
+
+    def get(self, value):
+        """
+        Bitmap of documents having a value (0 if none)
+        Time Complexity: O(1)
+        """
+        return self.bitmaps.get(self._normalize(value), 0)
+
+    def any_of(self, values):
+        """
+        Bitmap of documents having at least one of the values (OR)
+        Time Complexity: O(len(values)) bitmap operations
+        """
+        result = 0
+        for value in values:
+            result |= self.get(value)
+        return result
+
+    def all_of(self, values):
+        """
+        Bitmap of documents having every one of the values (AND)
+        Time Complexity: O(len(values)) bitmap operations
+        """
+        result = None
+        for value in values:
+            bitmap = self.get(value)
+            result = bitmap if result is None else result & bitmap
+        return result or 0
+
+    def values(self):
+        """
+        Distinct values, in their display spelling, sorted
+        Time Complexity: O(k log k) for k values
+        """
+        return sorted(self.labels.values())
+
+    def counts(self, within=None):
+        """
+        Number of documents per value, optionally restricted to a bitmap
+        Time Complexity: O(k) popcounts
+
+        Returns:
+            dict: display value -> count (values with no matches are omitted)
+        """
+        result = {}
+        for key, bitmap in self.bitmaps.items():
+            if within is not None:
+                bitmap &= within
+            count = bitmap.bit_count()
+            if count:
+                result[self.labels[key]] = count
+        return result
+
+    @staticmethod
+    def ids(bitmap):
+        """
+        Document ids set in a bitmap, ascending
+        Time Complexity: O(matches) bit operations
+        """
+        result = []
+        while bitmap:
+            low = bitmap & -bitmap
+            result.append(low.bit_length() - 1)
+            bitmap ^= low
+        return result
+
+    @staticmethod
+    def bitmap(doc_ids):
+        """
+        Bitmap with the given document ids set - the inverse of ids()
+        Bits are set in a bytearray and converted once, instead of
+        OR-ing one big integer per id
+        Time Complexity: O(n + max_id / 8)
+        """
+        doc_ids = set(doc_ids)
+        if not doc_ids:
+            return 0
+        bits = bytearray((max(doc_ids) >> 3) + 1)
+        for doc_id in doc_ids:
+            bits[doc_id >> 3] |= 1 << (doc_id & 7)
+        return int.from_bytes(bits, 'little')
+
+    def __len__(self):
+        """Return the number of indexed documents"""
+        return len(self.doc_values)
+
+    def __contains__(self, doc_id):
+        """Check if a document is indexed using 'in' operator"""
+        return doc_id in self.doc_values
+
+    def __str__(self):
+        """String representation of the index"""
+        return f"BitmapIndex(documents={len(self.doc_values)}, values={len(self.bitmaps)})"
+
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
+# Example usage and practical application
+if __name__ == "__main__":
+    # Example: Filtering cities by trip type
+    print("=" * 60)
+    print("BITMAP INDEX - Trip Type Filter Example")
+    print("=" * 60)
+
+    index = BitmapIndex()
+    index.add(1, ["Heritage", "Culture"])
+    index.add(2, ["Beach", "Relaxation"])
+    index.add(3, ["Heritage", "Beach"])
+    index.add(4, ["Adventure"])
+    print(f"\n📚 {index}")
+    print(f"🏷️ Trip types: {index.values()}")
+
+    print(f"\n🔍 Heritage: {index.ids(index.get('heritage'))}")
+    print(f"🔍 Heritage OR Adventure: {index.ids(index.any_of(['Heritage', 'Adventure']))}")
+    print(f"🔍 Heritage AND Beach: {index.ids(index.all_of(['Heritage', 'Beach']))}")
+    print(f"📊 Counts: {index.counts()}")
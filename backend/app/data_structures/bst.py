@@ -7,7 +7,9 @@ Hierarchical data structure - useful for sorted data, range queries, hierarchica
 class TreeNode:
     """
     Node class for Binary Search Tree
-    Each node contains data, left child, and right child
+    Each node contains data, left child, and right child.
+    Nodes are augmented with their subtree size and height so that
+    rank/range queries and height() run in O(log n).
     """
     
     def __init__(self, data):
@@ -20,17 +22,31 @@ class TreeNode:
         self.data = data
         self.left = None
         self.right = None
+        self.size = 1
+        self.height = 1
     
     def __str__(self):
         """String representation of the node"""
         return str(self.data)
 
 
+def _size_of(node):
+    return node.size if node else 0
+
+
+def _height_of(node):
+    return node.height if node else 0
+
+
 class BinarySearchTree:
     """
     Binary Search Tree implementation
     Properties: Left child < Parent < Right child
-    Operations: insert (O(log n) average), search (O(log n) average), delete (O(log n) average)
+    Operations: insert (O(log n)), search (O(log n)), delete (O(log n)),
+    range_count / rank / kth_smallest (O(log n)), range_search (O(log n + k))
+    
+    The tree rebalances itself with AVL rotations, so the bounds above
+    hold in the worst case too (e.g. when keys arrive already sorted).
     """
     
     def __init__(self):
@@ -41,37 +57,71 @@ class BinarySearchTree:
     def insert(self, data):
         """
         Insert a new value into the tree
-        Time Complexity: O(log n) average, O(n) worst case
+        Time Complexity: O(log n)
         
         Args:
             data: The data to insert
         """
-        if self.root is None:
-            self.root = TreeNode(data)
-            self._size += 1
-        else:
-            self._insert_recursive(self.root, data)
+        self.root = self._insert_recursive(self.root, data)
     
     def _insert_recursive(self, node, data):
-        """Helper method for recursive insertion"""
+        """Helper method for recursive insertion, returns the new subtree root"""
+        if node is None:
+            self._size += 1
+            return TreeNode(data)
+        
         if data < node.data:
-            if node.left is None:
-                node.left = TreeNode(data)
-                self._size += 1
-            else:
-                self._insert_recursive(node.left, data)
+            node.left = self._insert_recursive(node.left, data)
         elif data > node.data:
-            if node.right is None:
-                node.right = TreeNode(data)
-                self._size += 1
-            else:
-                self._insert_recursive(node.right, data)
-        # If data == node.data, don't insert (no duplicates)
+            node.right = self._insert_recursive(node.right, data)
+        else:
+            # If data == node.data, don't insert (no duplicates)
+            return node
+        
+        return self._rebalance(node)
+    
+    def _update(self, node):
+        """Recompute the size and height augmentations of a node"""
+        node.size = 1 + _size_of(node.left) + _size_of(node.right)
+        node.height = 1 + max(_height_of(node.left), _height_of(node.right))
+    
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+    
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+    
+    def _rebalance(self, node):
+        """Restore the AVL invariant at node and return the new subtree root"""
+        self._update(node)
+        balance = _height_of(node.left) - _height_of(node.right)
+        
+        if balance > 1:
+            if _height_of(node.left.left) < _height_of(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        
+        if balance < -1:
+            if _height_of(node.right.right) < _height_of(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        
+        return node
     
     def search(self, data):
         """
         Search for a value in the tree
-        Time Complexity: O(log n) average, O(n) worst case
+        Time Complexity: O(log n)
         
         Args:
             data: The data to search for
@@ -96,7 +146,7 @@ class BinarySearchTree:
     def delete(self, data):
         """
         Delete a value from the tree
-        Time Complexity: O(log n) average, O(n) worst case
+        Time Complexity: O(log n)
         
         Args:
             data: The data to delete
@@ -132,7 +182,7 @@ class BinarySearchTree:
             node.data = min_larger_node.data
             node.right = self._delete_recursive(node.right, min_larger_node.data)
         
-        return node
+        return self._rebalance(node)
     
     def _find_min(self, node):
         """Find the minimum value node in a subtree"""
@@ -144,7 +194,7 @@ class BinarySearchTree:
     def find_min(self):
         """
         Find the minimum value in the tree
-        Time Complexity: O(log n) average
+        Time Complexity: O(log n)
         
         Returns:
             The minimum value, or None if tree is empty
@@ -156,7 +206,7 @@ class BinarySearchTree:
     def find_max(self):
         """
         Find the maximum value in the tree
-        Time Complexity: O(log n) average
+        Time Complexity: O(log n)
         
         Returns:
             The maximum value, or None if tree is empty
@@ -230,22 +280,145 @@ class BinarySearchTree:
     def height(self):
         """
         Get the height of the tree
-        Time Complexity: O(n)
+        Time Complexity: O(1) (maintained on every insert/delete)
         
         Returns:
             int: Height of the tree (0 for empty tree)
         """
-        return self._height_recursive(self.root)
+        return _height_of(self.root)
     
-    def _height_recursive(self, node):
-        """Helper method for calculating height"""
-        if node is None:
+    def descending_traversal(self, limit=None):
+        """
+        Return values from largest to smallest, stopping after limit items
+        Time Complexity: O(log n + k) for k returned values
+        
+        Args:
+            limit: Maximum number of values to return (None for all)
+            
+        Returns:
+            list: Values in descending order
+        """
+        result = []
+        stack = []
+        current = self.root
+        while (stack or current) and (limit is None or len(result) < limit):
+            while current:
+                stack.append(current)
+                current = current.right
+            current = stack.pop()
+            result.append(current.data)
+            current = current.left
+        return result
+    
+    def rank(self, value):
+        """
+        Count the values strictly less than value
+        Time Complexity: O(log n)
+        
+        Args:
+            value: The value to rank (need not be in the tree)
+            
+        Returns:
+            int: Number of stored values < value
+        """
+        count = 0
+        current = self.root
+        while current:
+            if value <= current.data:
+                current = current.left
+            else:
+                count += _size_of(current.left) + 1
+                current = current.right
+        return count
+    
+    def _count_at_most(self, value):
+        """Count the values less than or equal to value"""
+        count = 0
+        current = self.root
+        while current:
+            if value < current.data:
+                current = current.left
+            else:
+                count += _size_of(current.left) + 1
+                current = current.right
+        return count
+    
+    def range_count(self, low, high):
+        """
+        Count the values v with low <= v <= high
+        Time Complexity: O(log n)
+        
+        Args:
+            low: Inclusive lower bound
+            high: Inclusive upper bound
+            
+        Returns:
+            int: Number of values in the range
+        """
+        if high < low:
             return 0
+        return self._count_at_most(high) - self.rank(low)
+    
+    def range_search(self, low, high, limit=None):
+        """
+        Report the values v with low <= v <= high in ascending order
+        Time Complexity: O(log n + k) for k reported values
+        
+        Args:
+            low: Inclusive lower bound
+            high: Inclusive upper bound
+            limit: Maximum number of values to return (None for all)
+            
+        Returns:
+            list: Values in the range, sorted
+        """
+        result = []
+        stack = []
+        current = self.root
+        while stack or current:
+            # Descend left, skipping subtrees that lie entirely below low
+            while current:
+                if current.data < low:
+                    current = current.right
+                else:
+                    stack.append(current)
+                    current = current.left
+            if not stack:
+                break
+            current = stack.pop()
+            if current.data > high or (limit is not None and len(result) >= limit):
+                break
+            result.append(current.data)
+            current = current.right
+        return result
+    
+    def kth_smallest(self, k):
+        """
+        Get the k-th smallest value (0-indexed)
+        Time Complexity: O(log n)
         
-        left_height = self._height_recursive(node.left)
-        right_height = self._height_recursive(node.right)
+        Args:
+            k: Zero-based position in sorted order
+            
+        Returns:
+            The value at position k
+            
+        Raises:
+            IndexError: If k is out of range
+        """
+        if k < 0 or k >= self._size:
+            raise IndexError(f"Invalid position: {k}")
         
-        return 1 + max(left_height, right_height)
+        current = self.root
+        while current:
+            left_size = _size_of(current.left)
+            if k < left_size:
+                current = current.left
+            elif k == left_size:
+                return current.data
+            else:
+                k -= left_size + 1
+                current = current.right
     
     def is_empty(self):
         """
@@ -335,6 +508,11 @@ if __name__ == "__main__":
     city_ratings.delete(78)
     print(f"  ✓ Deleted. Updated ratings: {city_ratings.inorder_traversal()}")
     
+    # Range and order-statistic queries
+    print(f"\n🎯 Ratings between 85 and 92: {city_ratings.range_search(85, 92)}")
+    print(f"🔢 Count between 85 and 92: {city_ratings.range_count(85, 92)}")
+    print(f"📐 Median rating: {city_ratings.kth_smallest(city_ratings.size() // 2)}")
+    
     # Different traversals
     print("\n🔄 Tree Traversals:")
     print(f"  Preorder:  {city_ratings.preorder_traversal()}")
@@ -0,0 +1,249 @@
+"""
+Geo Grid Data Structure Implementation
+Points bucketed into fixed latitude/longitude cells - useful for nearby and radius queries
+"""
+import math
+from array import array
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    Great-circle distance between two points in kilometres
+
+    Args:
+        lat1, lng1, lat2, lng2: Coordinates in degrees
+
+    Returns:
+        float: Distance in km
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoCell:
+    """
+    One grid cell: parallel float arrays of its points
+    Latitudes and longitudes are kept in radians together with cos(latitude),
+    so the haversine formula needs no per-point conversions. Points are
+    removed by moving the last point into the freed slot.
+    """
+    __slots__ = ('ids', 'lats', 'lngs', 'cos_lats')
+
+    def __init__(self):
+        """Initialize an empty cell"""
+        self.ids = []
+        self.lats = array('d')
+        self.lngs = array('d')
+        self.cos_lats = array('d')
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class GeoGrid:
+    """
+    Spatial index over (latitude, longitude) points
+    The globe is cut into cells of cell_degrees x cell_degrees. A radius
+    query only visits the cells overlapping the circle's bounding box and
+    computes haversine distances for their points in one pass, rejecting
+    far points before the square root. Nearest-neighbour queries widen the
+    radius until enough points are found.
+    """
+
+    def __init__(self, cell_degrees=0.5):
+        """
+        Initialize an empty grid
+
+        Args:
+            cell_degrees: Cell size in degrees (default: 0.5, about 55 km)
+        """
+        if cell_degrees <= 0 or 180 % cell_degrees:
+            raise ValueError("cell_degrees must divide 180")
+        self.cell_degrees = cell_degrees
+        self.columns = int(round(360 / cell_degrees))
+        self.cells = {}         # (row, column) -> GeoCell
+        self.positions = {}     # point_id -> (cell key, index in cell)
+
+    def _cell_key(self, lat, lng):
+        row = min(int((lat + 90) // self.cell_degrees), int(round(180 / self.cell_degrees)) - 1)
+        column = int((lng + 180) // self.cell_degrees) % self.columns
+        return row, column
+
+    def add(self, point_id, lat, lng):
+        """
+        Add a point, replacing any previous position with the same id
+        Time Complexity: O(1)
+
+        Args:
+            point_id: Unique id returned by queries
+            lat: Latitude in degrees (-90..90)
+            lng: Longitude in degrees (-180..180)
+        """
+        if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+            raise ValueError("Coordinates out of range")
+        self.remove(point_id)
+        key = self._cell_key(lat, lng)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = GeoCell()
+        phi = math.radians(lat)
+        self.positions[point_id] = (key, len(cell.ids))
+        cell.ids.append(point_id)
+        cell.lats.append(phi)
+        cell.lngs.append(math.radians(lng))
+        cell.cos_lats.append(math.cos(phi))
+
+    def remove(self, point_id):
+        """
+        Remove a point
+        Time Complexity: O(1)
+
+        Returns:
+            bool: True if removed, False if not found
+        """
+        position = self.positions.pop(point_id, None)
+        if position is None:
+            return False
+        key, index = position
+        cell = self.cells[key]
+        last = len(cell.ids) - 1
+        if index != last:
+            moved = cell.ids[last]
+            cell.ids[index] = moved
+            cell.lats[index] = cell.lats[last]
+            cell.lngs[index] = cell.lngs[last]
+            cell.cos_lats[index] = cell.cos_lats[last]
+            self.positions[moved] = (key, index)
+        cell.ids.pop()
+        cell.lats.pop()
+        cell.lngs.pop()
+        cell.cos_lats.pop()
+        if not cell.ids:
+            del self.cells[key]
+        return True
+
+    def _cells_near(self, lat, lng, radius_km):
+        """Cells overlapping the bounding box of a circle"""
+        delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        low_lat, high_lat = lat - delta_lat, lat + delta_lat
+        rows = int(round(180 / self.cell_degrees))
+        first_row = max(int((low_lat + 90) // self.cell_degrees), 0)
+        last_row = min(int((high_lat + 90) // self.cell_degrees), rows - 1)
+
+        cos_lat = math.cos(math.radians(max(abs(low_lat), abs(high_lat))))
+        if low_lat <= -90 or high_lat >= 90 or cos_lat <= 0:
+            columns = range(self.columns)
+        else:
+            delta_lng = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+            if delta_lng >= 180:
+                columns = range(self.columns)
+            else:
+                first = int((lng - delta_lng + 180) // self.cell_degrees)
+                last = int((lng + delta_lng + 180) // self.cell_degrees)
+                columns = sorted({column % self.columns for column in range(first, last + 1)})
+
+        for row in range(first_row, last_row + 1):
+            for column in columns:
+                cell = self.cells.get((row, column))
+                if cell is not None:
+                    yield cell
+
+    def within(self, lat, lng, radius_km, limit=None):
+        """
+        Points within radius_km of (lat, lng), nearest first
+        Time Complexity: O(c + p log p) for c visited cells holding p points
+
+        Returns:
+            list: (distance_km, point_id) tuples
+        """
+        phi = math.radians(lat)
+        lam = math.radians(lng)
+        cos_phi = math.cos(phi)
+        # Compare haversine's a against the radius's a: no sqrt/asin for misses
+        a_max = math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi) / 2) ** 2
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+        diameter = 2 * EARTH_RADIUS_KM
+
+        results = []
+        for cell in self._cells_near(lat, lng, radius_km):
+            ids, lngs, cos_lats = cell.ids, cell.lngs, cell.cos_lats
+            for index, point_lat in enumerate(cell.lats):
+                a = sin((point_lat - phi) / 2) ** 2 + cos_phi * cos_lats[index] * sin((lngs[index] - lam) / 2) ** 2
+                if a <= a_max:
+                    results.append((diameter * asin(sqrt(min(a, 1.0))), ids[index]))
+        results.sort()
+        return results if limit is None else results[:limit]
+
+    def nearest(self, lat, lng, k=10, max_radius_km=None):
+        """
+        The k points closest to (lat, lng), optionally within max_radius_km
+        Time Complexity: O(c + p log p) for the final search radius
+
+        Returns:
+            list: (distance_km, point_id) tuples, nearest first
+        """
+        if not self.positions or k < 1:
+            return []
+        half_circumference = math.pi * EARTH_RADIUS_KM
+        limit = min(max_radius_km or half_circumference, half_circumference)
+        radius = min(self.cell_degrees * 111.0, limit)
+        while True:
+            found = self.within(lat, lng, radius, limit=k)
+            if len(found) >= k or radius >= limit:
+                return found
+            radius = min(radius * 2, limit)
+
+    def clear(self):
+        """Remove all points - O(1)"""
+        self.cells = {}
+        self.positions = {}
+
+    def __len__(self):
+        """Return the number of points"""
+        return len(self.positions)
+
+    def __contains__(self, point_id):
+        """Check if a point exists using 'in' operator"""
+        return point_id in self.positions
+
+    def __str__(self):
+        """String representation of the grid"""
+        return f"GeoGrid(points={len(self.positions)}, cells={len(self.cells)}, cell_degrees={self.cell_degrees})"
+
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
+# Example usage and practical application
+if __name__ == "__main__":
+    # Example: Cities near a traveller
+    print("=" * 60)
+    print("GEO GRID - Nearby Cities Example")
+    print("=" * 60)
+
+    grid = GeoGrid()
+    cities = {
+        "New Delhi": (28.6139, 77.2090),
+        "Agra": (27.1767, 78.0081),
+        "Jaipur": (26.9124, 75.7873),
+        "Mumbai": (19.0760, 72.8777),
+        "Goa": (15.2993, 74.1240),
+    }
+    for name, (lat, lng) in cities.items():
+        grid.add(name, lat, lng)
+        print(f"  ✓ Added: {name} ({lat}, {lng})")
+    print(f"\n📍 {grid}")
+
+    print("\n🔍 Within 250 km of New Delhi:")
+    for distance, name in grid.within(28.6139, 77.2090, 250):
+        print(f"  {name}: {distance:.1f} km")
+
+    print("\n🔍 2 nearest to Pune (18.52, 73.86):")
+    for distance, name in grid.nearest(18.5204, 73.8567, k=2):
+        print(f"  {name}: {distance:.1f} km")
@@ -0,0 +1,125 @@
+"""
+Heavy Hitters Data Structure Implementation
+Space-Saving algorithm - approximate top-K counting in fixed memory
+"""
+import heapq
+
+
+class SpaceSaving:
+    """
+    Approximate frequency counter that keeps at most `capacity` keys
+    When a new key arrives and the table is full, the key with the smallest
+    count is replaced and the newcomer inherits that count (+1). Any key whose
+    true frequency exceeds total / capacity is guaranteed to be kept, and
+    every reported count overestimates the true count by at most its error.
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Initialize an empty counter
+
+        Args:
+            capacity: Maximum number of keys tracked (default: 64)
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+
+    def add(self, key, count=1):
+        """
+        Count an occurrence of key
+        Time Complexity: O(1) for tracked keys or while not full,
+        O(capacity) when a new key replaces the minimum
+
+        Args:
+            key: The item being counted
+            count: How many occurrences to add (default: 1)
+        """
+        self.total += count
+        if key in self.counts:
+            self.counts[key] += count
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+            return
+
+        victim = min(self.counts, key=self.counts.get)
+        floor = self.counts.pop(victim)
+        del self.errors[victim]
+        self.counts[key] = floor + count
+        self.errors[key] = floor
+
+    def remove(self, key):
+        """
+        Stop tracking a key (its occurrences stay in the total)
+        Time Complexity: O(1)
+        """
+        self.errors.pop(key, None)
+        return self.counts.pop(key, None) is not None
+
+    def estimate(self, key):
+        """
+        Estimated count for a key (0 if not tracked)
+        Time Complexity: O(1)
+        """
+        return self.counts.get(key, 0)
+
+    def merge(self, other):
+        """
+        Add another counter's counts into this one
+        Time Complexity: O(capacity)
+        """
+        for key, count in other.counts.items():
+            self.add(key, count)
+            self.total -= count
+            self.errors[key] = self.errors.get(key, 0) + other.errors[key]
+        self.total += other.total
+
+    def top(self, k):
+        """
+        Get the k keys with the highest estimated counts
+        Time Complexity: O(capacity log k)
+
+        Returns:
+            list: (key, count, error) tuples, highest count first
+        """
+        best = heapq.nlargest(k, self.counts.items(), key=lambda item: item[1])
+        return [(key, count, self.errors[key]) for key, count in best]
+
+    def __len__(self):
+        """Return the number of tracked keys"""
+        return len(self.counts)
+
+    def __contains__(self, key):
+        """Check if a key is tracked using 'in' operator"""
+        return key in self.counts
+
+    def __str__(self):
+        """String representation of the counter"""
+        return f"SpaceSaving({self.top(5)}, total={self.total})"
+
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
+# Example usage and practical application
+if __name__ == "__main__":
+    # Example: Most viewed cities from a stream of page views
+    print("=" * 60)
+    print("SPACE-SAVING HEAVY HITTERS - Most Viewed Cities Example")
+    print("=" * 60)
+
+    views = ["Goa"] * 50 + ["Jaipur"] * 30 + ["Delhi"] * 20 + [f"Town{i}" for i in range(40)]
+    counter = SpaceSaving(capacity=5)
+    for city in views:
+        counter.add(city)
+
+    print(f"\n📊 {counter.total} views tracked with {len(counter)} counters")
+    print("\n🔥 Top 3:")
+    for city, count, error in counter.top(3):
+        print(f"  {city}: ~{count} views (overcount <= {error})")
@@ -0,0 +1,132 @@
+"""
+HyperLogLog Data Structure Implementation
+Approximate distinct counting in fixed memory - useful for unique visitor counts
+"""
+import hashlib
+import math
+
+
+class HyperLogLog:
+    """
+    Cardinality estimator using 2^precision one-byte registers
+    Each item is hashed to 64 bits: the first `precision` bits pick a register
+    and the register keeps the longest run of leading zeros seen in the rest.
+    Memory is fixed (2 KB at the default precision of 11) no matter how many
+    items are added, and the relative standard error is 1.04 / sqrt(2^precision)
+    (about 2.3% at precision 11; roughly 95% of estimates fall within twice that).
+    Two sketches with the same precision merge by taking register maxima, which
+    gives exactly the sketch of the union - so daily counters roll up into
+    weekly or monthly ones without double counting repeat visitors.
+    """
+
+    def __init__(self, precision=11):
+        """
+        Initialize an empty sketch
+
+        Args:
+            precision: Number of index bits, 4-16 (default: 11 -> 2048 registers)
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("Precision must be between 4 and 16")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = bytearray(self.num_registers)
+
+    @property
+    def standard_error(self):
+        """Relative standard error of count()"""
+        return 1.04 / math.sqrt(self.num_registers)
+
+    def add(self, item):
+        """
+        Add an item (anything with a stable str())
+        Time Complexity: O(1)
+
+        Returns:
+            bool: True if a register changed
+        """
+        digest = hashlib.blake2b(str(item).encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'big')
+        index = value >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        rest = value & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def count(self):
+        """
+        Estimate the number of distinct items added
+        Uses linear counting while it estimates under 3x the register count,
+        where it is less biased than the raw HyperLogLog estimate
+        Time Complexity: O(registers)
+        """
+        m = self.num_registers
+        zeros = self.registers.count(0)
+        if zeros:
+            estimate = m * math.log(m / zeros)
+            if estimate <= 3 * m:
+                return int(round(estimate))
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        return int(round(estimate))
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one (union of both item sets)
+        Time Complexity: O(registers)
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def copy(self):
+        """Return an independent copy of the sketch"""
+        clone = HyperLogLog(self.precision)
+        clone.registers = bytearray(self.registers)
+        return clone
+
+    def __len__(self):
+        """Return the estimated distinct count"""
+        return self.count()
+
+    def __str__(self):
+        """String representation of the sketch"""
+        return f"HyperLogLog(~{self.count()} distinct, {self.num_registers} registers)"
+
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
+# Example usage and practical application
+if __name__ == "__main__":
+    # Example: Unique viewers of a city page over a week
+    print("=" * 60)
+    print("HYPERLOGLOG - Unique City Viewers Example")
+    print("=" * 60)
+
+    week = HyperLogLog()
+    print(f"\n📏 {week.num_registers} registers, standard error {week.standard_error:.1%}")
+
+    print("\n📅 Daily unique viewers (20% of each day's viewers are repeat visitors):")
+    seen = set()
+    for day in range(7):
+        daily = HyperLogLog()
+        for n in range(5000):
+            user = f"user{day * 4000 + n}"
+            daily.add(user)
+            seen.add(user)
+        actual = 5000
+        error = (daily.count() - actual) / actual
+        print(f"  Day {day + 1}: ~{daily.count()} (actual {actual}, error {error:+.2%})")
+        week.merge(daily)
+
+    error = (week.count() - len(seen)) / len(seen)
+    print(f"\n📊 Week rollup: ~{week.count()} (actual {len(seen)}, error {error:+.2%})")
+    print(f"   Within 2 standard errors: {abs(error) <= 2 * week.standard_error}")
@@ -0,0 +1,201 @@
+"""
+Inverted Index Data Structure Implementation
+Term -> postings map with BM25 ranking - useful for full-text search
+"""
+import bisect
+import math
+import re
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'by', 'for', 'from', 'in', 'is',
+    'it', 'its', 'of', 'on', 'or', 'the', 'to', 'with'
+])
+
+
+def tokenize(text):
+    """
+    Split text into lowercase alphanumeric terms, dropping stopwords
+
+    Args:
+        text: Any string (None is treated as empty)
+
+    Returns:
+        list: Terms in order of appearance
+    """
+    if not text:
+        return []
+    return [term for term in TOKEN_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+
+class InvertedIndex:
+    """
+    Inverted index over documents made of named text fields
+    Each term maps to a postings dict {doc_id: weighted term frequency}, where
+    a match in a heavier field (e.g. a city name) counts more than one in a
+    lighter field (e.g. a description). Queries are ranked with BM25 and
+    documents can be added, replaced and removed at any time.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    MAX_PREFIX_EXPANSIONS = 50
+
+    def __init__(self, field_weights):
+        """
+        Initialize an empty index
+
+        Args:
+            field_weights: dict of field name -> weight, e.g. {'name': 3, 'description': 1}
+        """
+        self.field_weights = dict(field_weights)
+        self.postings = {}
+        self.documents = {}
+        self.total_length = 0.0
+        self._sorted_terms = None
+
+    def add_document(self, doc_id, fields):
+        """
+        Index a document, replacing any previous version with the same id
+        Time Complexity: O(t) for t tokens in the document
+
+        Args:
+            doc_id: Unique document id
+            fields: dict of field name -> text (unknown fields are ignored)
+        """
+        self.remove_document(doc_id)
+        frequencies = {}
+        length = 0.0
+        for field, weight in self.field_weights.items():
+            for term in tokenize(fields.get(field)):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+                length += weight
+
+        for term, frequency in frequencies.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                self._sorted_terms = None
+            postings[doc_id] = frequency
+        self.documents[doc_id] = (length, tuple(frequencies))
+        self.total_length += length
+
+    def remove_document(self, doc_id):
+        """
+        Remove a document from the index
+        Time Complexity: O(u) for u distinct terms in the document
+
+        Returns:
+            bool: True if removed, False if not found
+        """
+        entry = self.documents.pop(doc_id, None)
+        if entry is None:
+            return False
+        length, terms = entry
+        self.total_length -= length
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                self._sorted_terms = None
+        return True
+
+    def _expand_prefix(self, prefix):
+        """Indexed terms starting with prefix, most common first"""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = bisect.bisect_left(self._sorted_terms, prefix + '\uffff')
+        terms = self._sorted_terms[start:end]
+        if len(terms) > self.MAX_PREFIX_EXPANSIONS:
+            terms.sort(key=lambda term: len(self.postings[term]), reverse=True)
+            terms = terms[:self.MAX_PREFIX_EXPANSIONS]
+        return terms
+
+    def search(self, query, prefix=True):
+        """
+        Find documents containing every query term, best BM25 score first
+        With prefix=True the last term also matches longer words
+        ("jai" finds "jaipur"), for search-as-you-type.
+        Time Complexity: O(sum of matched postings + r log r) for r results
+
+        Returns:
+            list: (doc_id, score) tuples, highest score first
+        """
+        terms = tokenize(query)
+        if not terms or not self.documents:
+            return []
+
+        doc_count = len(self.documents)
+        average_length = self.total_length / doc_count or 1.0
+        scores = None
+        for position, term in enumerate(terms):
+            expansions = [term]
+            if prefix and position == len(terms) - 1:
+                expansions = self._expand_prefix(term)
+            term_scores = {}
+            for expansion in expansions:
+                postings = self.postings.get(expansion)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    if scores is not None and doc_id not in scores:
+                        continue
+                    norm = self.K1 * (1 - self.B + self.B * self.documents[doc_id][0] / average_length)
+                    score = idf * frequency * (self.K1 + 1) / (frequency + norm)
+                    term_scores[doc_id] = term_scores.get(doc_id, 0.0) + score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: scores[doc_id] + score for doc_id, score in term_scores.items()}
+            if not scores:
+                return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def clear(self):
+        """Remove all documents - O(1)"""
+        self.postings = {}
+        self.documents = {}
+        self.total_length = 0.0
+        self._sorted_terms = None
+
+    def __len__(self):
+        """Return the number of indexed documents"""
+        return len(self.documents)
+
+    def __contains__(self, doc_id):
+        """Check if a document is indexed using 'in' operator"""
+        return doc_id in self.documents
+
+    def __str__(self):
+        """String representation of the index"""
+        return f"InvertedIndex(documents={len(self.documents)}, terms={len(self.postings)})"
+
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
+# Example usage and practical application
+if __name__ == "__main__":
+    # Example: Searching cities by name, state and description
+    print("=" * 60)
+    print("INVERTED INDEX - City Search Example")
+    print("=" * 60)
+
+    index = InvertedIndex({'name': 3, 'state': 2, 'description': 1})
+    index.add_document(1, {'name': 'Jaipur', 'state': 'Rajasthan', 'description': 'The Pink City of forts and palaces'})
+    index.add_document(2, {'name': 'Udaipur', 'state': 'Rajasthan', 'description': 'City of lakes and palaces'})
+    index.add_document(3, {'name': 'Goa', 'state': 'Goa', 'description': 'Beaches, forts and nightlife'})
+    print(f"\n📚 {index}")
+
+    for query in ['palaces', 'rajasthan forts', 'fort', 'goa']:
+        print(f"\n🔍 '{query}': {index.search(query)}")
+
+    print("\n🗑️ Removing Jaipur:")
+    index.remove_document(1)
+    print(f"  'palaces': {index.search('palaces')}")
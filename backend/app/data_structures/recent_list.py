@@ -0,0 +1,239 @@
+"""
+Recent List Data Structure Implementation
+Hash index + bounded doubly linked list - useful for "recently viewed" lists and LRU caches
+"""
+
+
+class DoublyLinkedNode:
+    """
+    Node class for the Recent List
+    Each node holds a key, its data, and links to both neighbours
+    """
+    __slots__ = ('key', 'data', 'prev', 'next')
+
+    def __init__(self, key, data):
+        """
+        Initialize a node with a key and data
+
+        Args:
+            key: The identity used for de-duplication
+            data: The data to store in the node
+        """
+        self.key = key
+        self.data = data
+        self.prev = None
+        self.next = None
+
+    def __str__(self):
+        """String representation of the node"""
+        return str(self.data)
+
+
+class RecentList:
+    """
+    Most-recently-used list with a fixed capacity
+    A dict maps each key to its node, so every operation below is O(1):
+    touch (insert or move-to-front), remove, get, and eviction of the
+    least recently used entry when the list is full.
+    """
+
+    def __init__(self, capacity=10):
+        """
+        Initialize an empty recent list
+
+        Args:
+            capacity: Maximum number of entries kept (default: 10)
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.capacity = capacity
+        self._index = {}
+        self.head = None  # Most recent
+        self.tail = None  # Least recent
+        self._snapshot = None
+
+    def _unlink(self, node):
+        """Detach a node from the list"""
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        node.prev = node.next = None
+
+    def _push_front(self, node):
+        """Attach a node as the most recent entry"""
+        node.next = self.head
+        if self.head:
+            self.head.prev = node
+        self.head = node
+        if self.tail is None:
+            self.tail = node
+
+    def touch(self, key, data):
+        """
+        Insert an entry, or replace it and move it to the front if the key exists
+        Evicts the least recent entry when the capacity is exceeded
+        Time Complexity: O(1)
+
+        Args:
+            key: The identity used for de-duplication
+            data: The data to store
+
+        Returns:
+            The evicted entry's data, or None
+        """
+        self._snapshot = None
+        node = self._index.get(key)
+        if node:
+            node.data = data
+            if node is not self.head:
+                self._unlink(node)
+                self._push_front(node)
+            return None
+
+        node = DoublyLinkedNode(key, data)
+        self._index[key] = node
+        self._push_front(node)
+
+        if len(self._index) > self.capacity:
+            evicted = self.tail
+            self._unlink(evicted)
+            del self._index[evicted.key]
+            return evicted.data
+        return None
+
+    def remove(self, key):
+        """
+        Remove an entry by key
+        Time Complexity: O(1)
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            bool: True if removed, False if not found
+        """
+        node = self._index.pop(key, None)
+        if node is None:
+            return False
+        self._snapshot = None
+        self._unlink(node)
+        return True
+
+    def get(self, key, default=None):
+        """
+        Get the data stored for a key without changing its position
+        Time Complexity: O(1)
+        """
+        node = self._index.get(key)
+        return node.data if node else default
+
+    def peek_oldest(self):
+        """
+        Get the least recently touched entry without removing it
+        Time Complexity: O(1)
+
+        Returns:
+            The oldest entry's data, or None if the list is empty
+        """
+        return self.tail.data if self.tail else None
+
+    def pop_oldest(self):
+        """
+        Remove and return the least recently touched entry
+        Time Complexity: O(1)
+
+        Returns:
+            The oldest entry's data
+
+        Raises:
+            IndexError: If the list is empty
+        """
+        if self.tail is None:
+            raise IndexError("Cannot pop from an empty list")
+        node = self.tail
+        self._unlink(node)
+        del self._index[node.key]
+        self._snapshot = None
+        return node.data
+
+    def to_list(self):
+        """
+        Get all entries, most recent first
+        Time Complexity: O(1) if unchanged since the last call, O(n) otherwise
+
+        Returns:
+            list: Entries in recency order (shared; do not modify)
+        """
+        if self._snapshot is None:
+            result = []
+            current = self.head
+            while current:
+                result.append(current.data)
+                current = current.next
+            self._snapshot = result
+        return self._snapshot
+
+    def is_empty(self):
+        """Check if the list is empty - O(1)"""
+        return not self._index
+
+    def size(self):
+        """Get the number of entries - O(1)"""
+        return len(self._index)
+
+    def clear(self):
+        """Remove all entries - O(1)"""
+        self._index = {}
+        self.head = None
+        self.tail = None
+        self._snapshot = None
+
+    def __len__(self):
+        """Return the number of entries"""
+        return self.size()
+
+    def __contains__(self, key):
+        """Check if a key exists using 'in' operator"""
+        return key in self._index
+
+    def __iter__(self):
+        """Iterate over entries, most recent first"""
+        current = self.head
+        while current:
+            yield current.data
+            current = current.next
+
+    def __str__(self):
+        """String representation of the recent list"""
+        return f"RecentList([{' -> '.join(str(data) for data in self)}])"
+
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
+# Example usage and practical application
+if __name__ == "__main__":
+    # Example: Recently viewed cities
+    print("=" * 60)
+    print("RECENT LIST DATA STRUCTURE - Recently Viewed Cities Example")
+    print("=" * 60)
+
+    recent = RecentList(capacity=3)
+
+    print("\n🏙️ Viewing cities:")
+    for city in ["Mumbai", "Delhi", "Goa", "Mumbai", "Jaipur"]:
+        evicted = recent.touch(city, city)
+        print(f"  ✓ Viewed: {city}" + (f" (evicted {evicted})" if evicted else ""))
+
+    print(f"\n📋 Most recent first: {recent.to_list()}")
+    print(f"📊 Size: {recent.size()} / {recent.capacity}")
+
+    print("\n🗑️ Removing 'Goa':")
+    recent.remove("Goa")
+    print(f"  ✓ Updated list: {recent}")
@@ -0,0 +1,92 @@
+"""
+Sliding Window Data Structure Implementation
+Circular array of time buckets - fixed-memory counts over the last N intervals
+"""
+
+
+class TimeBucketRing:
+    """
+    Circular array of `size` buckets, one per time interval (e.g. one minute)
+    Interval number n lives in slot n % size. Each slot remembers which
+    interval it holds, so a slot left over from a previous lap is reset
+    when reused and skipped when reading - no background expiry is needed
+    and memory never grows past `size` buckets.
+    """
+
+    def __init__(self, size, bucket_factory):
+        """
+        Initialize an empty ring
+
+        Args:
+            size: Number of buckets (the longest window that can be read)
+            bucket_factory: Callable creating an empty bucket
+        """
+        if size < 1:
+            raise ValueError("Size must be at least 1")
+        self.size = size
+        self.bucket_factory = bucket_factory
+        self._intervals = [None] * size
+        self._buckets = [None] * size
+
+    def bucket(self, interval):
+        """
+        Get the bucket for an interval, resetting the slot if it is stale
+        Time Complexity: O(1)
+
+        Args:
+            interval: Interval number (e.g. int(time.time()) // 60)
+        """
+        slot = interval % self.size
+        if self._intervals[slot] != interval:
+            self._intervals[slot] = interval
+            self._buckets[slot] = self.bucket_factory()
+        return self._buckets[slot]
+
+    def window(self, current, count):
+        """
+        Iterate the live buckets of the last `count` intervals, newest first
+        Time Complexity: O(count)
+
+        Args:
+            current: The current interval number
+            count: Number of intervals, at most `size`
+        """
+        for interval in range(current, current - min(count, self.size), -1):
+            slot = interval % self.size
+            if self._intervals[slot] == interval:
+                yield self._buckets[slot]
+
+    def clear(self):
+        """Drop all buckets - O(size)"""
+        self._intervals = [None] * self.size
+        self._buckets = [None] * self.size
+
+    def __len__(self):
+        """Return the number of buckets"""
+        return self.size
+
+    def __str__(self):
+        """String representation of the ring"""
+        live = sum(1 for interval in self._intervals if interval is not None)
+        return f"TimeBucketRing(size={self.size}, live={live})"
+
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
+# Example usage and practical application
+if __name__ == "__main__":
+    # Example: Page views over the last 5 minutes
+    print("=" * 60)
+    print("TIME BUCKET RING - Views in the Last 5 Minutes Example")
+    print("=" * 60)
+
+    ring = TimeBucketRing(5, lambda: [0])
+    for minute, views in [(100, 3), (101, 7), (102, 2), (104, 5), (106, 4)]:
+        ring.bucket(minute)[0] += views
+        print(f"  ✓ Minute {minute}: {views} views")
+
+    for window in (1, 3, 5):
+        total = sum(bucket[0] for bucket in ring.window(106, window))
+        print(f"\n📊 Last {window} minute(s) at minute 106: {total} views")
@@ -74,6 +74,21 @@ class Stack:
         """
         return len(self._items)
     
+    def top_items(self, k):
+        """
+        Return up to k items from the top down, without modifying the stack
+        Time Complexity: O(k)
+        
+        Args:
+            k: Maximum number of items to return
+            
+        Returns:
+            list: Items, most recently pushed first
+        """
+        if k <= 0:
+            return []
+        return self._items[:-k - 1:-1]
+    
     def clear(self):
         """
         Remove all items from the stack
@@ -94,6 +109,132 @@ class Stack:
         return self.__str__()
 
 
+class BoundedStack:
+    """
+    Stack with a fixed capacity, backed by a ring buffer
+    When full, pushing overwrites the oldest (bottom) item, so memory stays bounded
+    Operations: push (O(1)), pop (O(1)), peek (O(1)), top_items (O(k))
+    """
+    
+    def __init__(self, capacity):
+        """
+        Initialize an empty bounded stack
+        
+        Args:
+            capacity: Maximum number of items kept
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._top = 0  # Slot the next push writes to
+        self._count = 0
+    
+    def push(self, item):
+        """
+        Add an item to the top, dropping the bottom item if full
+        Time Complexity: O(1)
+        
+        Args:
+            item: The item to add to the stack
+        """
+        self._items[self._top] = item
+        self._top = (self._top + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+    
+    def pop(self):
+        """
+        Remove and return the top item from the stack
+        Time Complexity: O(1)
+        
+        Returns:
+            The top item from the stack
+            
+        Raises:
+            IndexError: If the stack is empty
+        """
+        if self.is_empty():
+            raise IndexError("Cannot pop from an empty stack")
+        self._top = (self._top - 1) % self.capacity
+        item = self._items[self._top]
+        self._items[self._top] = None
+        self._count -= 1
+        return item
+    
+    def peek(self):
+        """
+        Return the top item without removing it
+        Time Complexity: O(1)
+        
+        Returns:
+            The top item from the stack
+            
+        Raises:
+            IndexError: If the stack is empty
+        """
+        if self.is_empty():
+            raise IndexError("Cannot peek at an empty stack")
+        return self._items[(self._top - 1) % self.capacity]
+    
+    def top_items(self, k):
+        """
+        Return up to k items from the top down, without modifying the stack
+        Time Complexity: O(k)
+        
+        Args:
+            k: Maximum number of items to return
+            
+        Returns:
+            list: Items, most recently pushed first
+        """
+        return [
+            self._items[(self._top - 1 - i) % self.capacity]
+            for i in range(min(max(k, 0), self._count))
+        ]
+    
+    def is_empty(self):
+        """
+        Check if the stack is empty
+        Time Complexity: O(1)
+        
+        Returns:
+            bool: True if stack is empty, False otherwise
+        """
+        return self._count == 0
+    
+    def size(self):
+        """
+        Get the number of items in the stack
+        Time Complexity: O(1)
+        
+        Returns:
+            int: Number of items in the stack
+        """
+        return self._count
+    
+    def clear(self):
+        """
+        Remove all items from the stack
+        Time Complexity: O(capacity)
+        """
+        self._items = [None] * self.capacity
+        self._top = 0
+        self._count = 0
+    
+    def __len__(self):
+        """Return the size of the stack"""
+        return self.size()
+    
+    def __str__(self):
+        """String representation of the stack (bottom to top)"""
+        return f"BoundedStack({self.top_items(self._count)[::-1]})"
+    
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
 # Example usage and practical application
 if __name__ == "__main__":
     # Example 1: Navigation history (like browser back button)
@@ -0,0 +1,129 @@
+"""
+Trie (Prefix Tree) Data Structure Implementation
+Prefix lookups with precomputed top-k results - useful for autocomplete
+"""
+
+
+class TrieNode:
+    """
+    Node class for the Trie
+    Each node holds its children by character and the best k item ids
+    among every key that passes through it
+    """
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        """Initialize an empty node"""
+        self.children = {}
+        self.top = []  # [(-score, item_id)], best first, at most k entries
+
+
+class TopKTrie:
+    """
+    Prefix tree whose nodes cache the k highest-scoring items below them
+    An item can be inserted under several keys (e.g. "amber fort" and "fort");
+    it appears at most once in any node's list. Answering a prefix query is
+    a walk down len(prefix) nodes plus reading a precomputed list, so it
+    does not depend on how many keys share the prefix.
+    """
+
+    def __init__(self, k=10):
+        """
+        Initialize an empty trie
+
+        Args:
+            k: Number of results kept per node (default: 10)
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.root = TrieNode()
+        self.size = 0
+
+    def insert(self, key, item_id, score):
+        """
+        Add an item under a key
+        Time Complexity: O(len(key) * k)
+
+        Args:
+            key: The string to match prefixes of
+            item_id: Identifier returned by search
+            score: Higher scores rank first
+        """
+        entry = (-score, item_id)
+        node = self.root
+        self._offer(node, entry)
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = TrieNode()
+            node = child
+            self._offer(node, entry)
+        self.size += 1
+
+    def _offer(self, node, entry):
+        """Place entry in the node's top-k list if it qualifies"""
+        top = node.top
+        for i, existing in enumerate(top):
+            if existing[1] == entry[1]:
+                if existing <= entry:
+                    return
+                del top[i]
+                break
+        if len(top) == self.k and entry >= top[-1]:
+            return
+        position = 0
+        while position < len(top) and top[position] < entry:
+            position += 1
+        top.insert(position, entry)
+        del top[self.k:]
+
+    def search(self, prefix, limit=None):
+        """
+        Best items under every key starting with prefix
+        Time Complexity: O(len(prefix) + k)
+
+        Returns:
+            list: Item ids, highest score first
+        """
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        top = node.top if limit is None else node.top[:limit]
+        return [item_id for _, item_id in top]
+
+    def clear(self):
+        """Remove all keys - O(1)"""
+        self.root = TrieNode()
+        self.size = 0
+
+    def __len__(self):
+        """Return the number of inserted keys"""
+        return self.size
+
+    def __str__(self):
+        """String representation of the trie"""
+        return f"TopKTrie(keys={self.size}, k={self.k})"
+
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
+# Example usage and practical application
+if __name__ == "__main__":
+    # Example: City name autocomplete ranked by popularity
+    print("=" * 60)
+    print("TRIE DATA STRUCTURE - City Autocomplete Example")
+    print("=" * 60)
+
+    trie = TopKTrie(k=3)
+    cities = [("mumbai", 95), ("manali", 80), ("mysore", 70), ("madurai", 60), ("delhi", 90)]
+    for name, popularity in cities:
+        trie.insert(name, name.title(), popularity)
+        print(f"  ✓ Inserted: {name.title()} (popularity {popularity})")
+
+    for prefix in ["m", "ma", "my", "d", "x"]:
+        print(f"\n🔍 '{prefix}': {trie.search(prefix)}")
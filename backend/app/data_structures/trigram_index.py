@@ -0,0 +1,153 @@
+"""
+Trigram Index Data Structure Implementation
+Character 3-gram postings with edit-distance verification - useful for typo-tolerant lookups
+"""
+
+
+def levenshtein(a, b, max_distance=None):
+    """
+    Edit distance (insertions, deletions, substitutions) between two strings
+    Stops early once every alignment exceeds max_distance
+    Time Complexity: O(len(a) * len(b))
+
+    Returns:
+        int: The distance, or max_distance + 1 if it is larger than max_distance
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def trigrams(term):
+    """
+    Padded character trigrams of a term: "goa" -> {"  g", " go", "goa", "oa "}
+    Padding lets short terms and word edges produce trigrams too
+    """
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Index of terms by their character trigrams
+    One edit changes at most 3 trigrams, so a term within d edits of the
+    query must share at least (trigrams in the longer term) - 3d of them.
+    A lookup counts shared trigrams using only the query's postings lists,
+    keeps the terms that pass that bound (and the length bound), and
+    computes the exact edit distance for those few candidates only.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self.postings = {}  # trigram -> set of terms
+        self.terms = {}     # term -> number of distinct trigrams
+
+    def add(self, term):
+        """
+        Index a term (duplicates are ignored)
+        Time Complexity: O(len(term))
+
+        Returns:
+            bool: True if the term was new
+        """
+        if term in self.terms:
+            return False
+        grams = trigrams(term)
+        self.terms[term] = len(grams)
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(term)
+        return True
+
+    def remove(self, term):
+        """
+        Remove a term
+        Time Complexity: O(len(term))
+
+        Returns:
+            bool: True if removed, False if not found
+        """
+        if term not in self.terms:
+            return False
+        del self.terms[term]
+        for gram in trigrams(term):
+            postings = self.postings.get(gram)
+            if postings is not None:
+                postings.discard(term)
+                if not postings:
+                    del self.postings[gram]
+        return True
+
+    def search(self, query, max_distance):
+        """
+        Find all terms within max_distance edits of query
+        Time Complexity: O(sum of the query's postings + candidates * len^2)
+
+        Returns:
+            list: (distance, term) tuples, closest first
+        """
+        query_grams = trigrams(query)
+        shared = {}
+        for gram in query_grams:
+            for term in self.postings.get(gram, ()):
+                shared[term] = shared.get(term, 0) + 1
+
+        results = []
+        for term, count in shared.items():
+            if abs(len(term) - len(query)) > max_distance:
+                continue
+            if count < max(self.terms[term], len(query_grams)) - 3 * max_distance:
+                continue
+            distance = levenshtein(query, term, max_distance)
+            if distance <= max_distance:
+                results.append((distance, term))
+        results.sort()
+        return results
+
+    def __len__(self):
+        """Return the number of terms"""
+        return len(self.terms)
+
+    def __contains__(self, term):
+        """Check if a term is indexed using 'in' operator"""
+        return term in self.terms
+
+    def __str__(self):
+        """String representation of the index"""
+        return f"TrigramIndex(terms={len(self.terms)}, trigrams={len(self.postings)})"
+
+    def __repr__(self):
+        """Official string representation"""
+        return self.__str__()
+
+
+# Example usage and practical application
+if __name__ == "__main__":
+    # Example: Correcting misspelled city names
+    print("=" * 60)
+    print("TRIGRAM INDEX - Typo-Tolerant City Lookup Example")
+    print("=" * 60)
+
+    index = TrigramIndex()
+    for city in ["bangalore", "bengaluru", "varanasi", "mysore", "mysuru", "mumbai", "manali"]:
+        index.add(city)
+    print(f"\n📚 {index}")
+
+    for typo in ["banglore", "varansi", "mysor", "mumbay"]:
+        print(f"\n🔍 '{typo}' (<= 2 edits): {index.search(typo, 2)}")
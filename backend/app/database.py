@@ -3,6 +3,8 @@ Database Configuration
 SQLAlchemy setup for MySQL
 """
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import DeclarativeBase
 
 class Base(DeclarativeBase):
@@ -15,3 +17,28 @@ def init_db(app):
     db.init_app(app)
     with app.app_context():
         db.create_all()
+
+def is_unique_violation(error):
+    """Check whether an IntegrityError came from a UNIQUE / primary key conflict"""
+    orig = getattr(error, 'orig', None)
+    args = getattr(orig, 'args', ())
+    if args and args[0] == 1062:  # MySQL ER_DUP_ENTRY
+        return True
+    message = str(orig).lower()
+    return 'unique' in message or 'duplicate' in message
+
+def insert_unique(model, values):
+    """
+    Insert one row with a single INSERT and commit, letting the table's
+    unique constraints reject duplicates (no SELECT beforehand, no race).
+    Returns the new primary key, or None if an equal row already exists.
+    """
+    try:
+        result = db.session.execute(insert(model).values(**values))
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_unique_violation(e):
+            return None
+        raise
+    return result.inserted_primary_key[0]
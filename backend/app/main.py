@@ -27,13 +27,27 @@ def create_app():
     )
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['JSON_SORT_KEYS'] = False
+    app.config['RATING_SNAPSHOT_PATH'] = os.getenv(
+        'RATING_SNAPSHOT_PATH',
+        os.path.join(app.instance_path, 'rating_index.bin')
+    )
     
     # Enable CORS
     CORS(app, resources={r"/api/*": {"origins": "*"}})
     
-    # Initialize database
+    # Initialize database; user_tracker_state is only used lazily by the
+    # managers, so register it before init_db() runs create_all()
+    from app.models.tracker_state import UserTrackerState  # noqa: F401
     init_db(app)
     
+    # In-memory rating index is rebuilt from this snapshot on first use
+    from app.managers import ranking_engine
+    ranking_engine.snapshot_path = app.config['RATING_SNAPSHOT_PATH']
+    
+    # Navigation / recent-city state is flushed write-behind to MySQL
+    from app.managers import user_tracker
+    user_tracker.start_persistence(app)
+    
     # Register blueprints
     # Register blueprints
     from app.api import auth, cities, bookings
@@ -41,6 +55,7 @@ def create_app():
     
     app.register_blueprint(auth.bp, url_prefix='/api/auth')
     app.register_blueprint(cities.bp, url_prefix='/api/cities')
+    app.register_blueprint(cities.attractions_bp, url_prefix='/api/attractions')
     app.register_blueprint(bookings.bookings_bp)
     
     # Secondary Features
@@ -61,8 +76,15 @@ def create_app():
                 'HashMap': 'City caching',
                 'Queue': 'Booking queue',
                 'Stack': 'Navigation history',
-                'LinkedList': 'Recent cities',
-                'BST': 'City ratings'
+                'RecentList': 'Recent cities',
+                'BST': 'City ratings',
+                'TimeBucketRing': 'Trending view windows',
+                'SpaceSaving': 'Trending top-K',
+                'InvertedIndex': 'City search',
+                'Trie': 'Search suggestions',
+                'TrigramIndex': 'Fuzzy city search',
+                'BitmapIndex': 'Trip type filters',
+                'GeoGrid': 'Nearby cities and attractions'
             },
             'endpoints': {
                 'cities': '/api/cities',
@@ -71,6 +93,8 @@ def create_app():
                 'users': '/api/users',
                 'cache_stats': '/api/cities/cache/stats',
                 'top_rated': '/api/cities/top-rated',
+                'trending': '/api/cities/trending',
+                'nearby': '/api/cities/nearby',
                 'queue_status': '/api/bookings/queue/status'
             }
         })
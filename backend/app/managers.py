@@ -2,20 +2,47 @@
 Managers
 Consolidated services for data structures, caching, queuing, and tracking.
 """
-from datetime import datetime
+import atexit
+import bisect
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
 from app.data_structures.hashmap import HashMap
 from app.data_structures.queue import Queue
 from app.data_structures.bst import BinarySearchTree
-from app.data_structures.stack import Stack
-from app.data_structures.linked_list import LinkedList
+from app.data_structures.stack import BoundedStack
+from app.data_structures.recent_list import RecentList
+from app.data_structures.sliding_window import TimeBucketRing
+from app.data_structures.heavy_hitters import SpaceSaving
+from app.data_structures.hyperloglog import HyperLogLog
+from app.data_structures.inverted_index import InvertedIndex, TOKEN_PATTERN
+from app.data_structures.trie import TopKTrie
+from app.data_structures.trigram_index import TrigramIndex
+from app.data_structures.bitmap_index import BitmapIndex
+from app.data_structures.geo_grid import GeoGrid
+
+logger = logging.getLogger(__name__)
 
 # -----------------------------------------------------------------------------
 # Cache Manager
 # -----------------------------------------------------------------------------
 class CacheManager:
     """Global cache manager using HashMap for fast lookups"""
+    # Most keys cached under one group; further variants are served uncached
+    MAX_GROUP_SIZE = 16
+
     def __init__(self):
         self.cache = HashMap()
+        # group key -> keys deleted along with it (e.g. a city's projections)
+        self.groups = {}
         self.stats = {'hits': 0, 'misses': 0, 'total_requests': 0}
     
     def get(self, key):
@@ -27,14 +54,24 @@ class CacheManager:
             self.stats['misses'] += 1
         return value
     
-    def set(self, key, value):
+    def set(self, key, value, group=None):
+        """Store a value; returns False if its group is already full"""
+        if group is not None and group != key:
+            members = self.groups.setdefault(group, set())
+            if key not in members and len(members) >= self.MAX_GROUP_SIZE:
+                return False
+            members.add(key)
         self.cache.put(key, value)
+        return True
     
     def delete(self, key):
+        for member in self.groups.pop(key, ()):
+            self.cache.delete(member)
         return self.cache.delete(key)
     
     def clear(self):
         self.cache.clear()
+        self.groups = {}
         self.stats = {'hits': 0, 'misses': 0, 'total_requests': 0}
     
     def get_stats(self):
@@ -102,107 +139,2035 @@ booking_queue_manager = QueueManager()
 # Rating Manager
 # -----------------------------------------------------------------------------
 class RatingManager:
-    """Manage city ratings using BST for sorted access"""
+    """
+    Manage city ratings using BST for sorted access.
+    The tree is keyed by (rating, city_id) so every city appears once and
+    range/rank queries count cities rather than distinct rating values.
+    """
     def __init__(self):
         self.rating_tree = BinarySearchTree()
-        # Map ratings to city IDs (since BST stores only ratings)
-        self.rating_to_cities = {}
+        # Current rating of each city in the tree
+        self.city_ratings = {}
+        # Running sum so average and count are O(1)
+        self._rating_sum = 0
     
     def add_rating(self, city_id, rating):
-        self.rating_tree.insert(rating)
-        if rating not in self.rating_to_cities:
-            self.rating_to_cities[rating] = []
-        if city_id not in self.rating_to_cities[rating]:
-            self.rating_to_cities[rating].append(city_id)
-    
-    def get_top_ratings(self, limit=10):
-        sorted_ratings = self.rating_tree.inorder_traversal()
-        top_ratings = sorted_ratings[-limit:][::-1]
-        result = []
-        for rating in top_ratings:
-            cities = self.rating_to_cities.get(rating, [])
-            for city_id in cities:
-                result.append({'rating': rating, 'city_id': city_id})
-        return result[:limit]
+        old_rating = self.city_ratings.get(city_id)
+        if old_rating == rating:
+            return
+        if old_rating is not None:
+            self.rating_tree.delete((old_rating, city_id))
+            self._rating_sum -= old_rating
+        self.rating_tree.insert((rating, city_id))
+        self.city_ratings[city_id] = rating
+        self._rating_sum += rating
+    
+    def remove_city(self, city_id):
+        old_rating = self.city_ratings.pop(city_id, None)
+        if old_rating is None:
+            return False
+        self.rating_tree.delete((old_rating, city_id))
+        self._rating_sum -= old_rating
+        return True
     
     def get_highest_rating(self):
-        return self.rating_tree.find_max()
+        highest = self.rating_tree.find_max()
+        return highest[0] if highest else None
     
     def get_lowest_rating(self):
-        return self.rating_tree.find_min()
+        lowest = self.rating_tree.find_min()
+        return lowest[0] if lowest else None
+    
+    def get_count(self):
+        return len(self.city_ratings)
+    
+    def get_average(self):
+        if not self.city_ratings:
+            return 0
+        return self._rating_sum / len(self.city_ratings)
+    
+    @staticmethod
+    def _range_keys(low, high):
+        # (low,) sorts before every (low, city_id); (high, inf) after every (high, city_id)
+        return (low,), (high, float('inf'))
+    
+    def count_in_range(self, low, high):
+        return self.rating_tree.range_count(*self._range_keys(low, high))
+    
+    def get_ratings_in_range(self, low, high, limit=None):
+        keys = self.rating_tree.range_search(*self._range_keys(low, high), limit=limit)
+        return [{'rating': rating, 'city_id': city_id} for rating, city_id in keys]
     
-    def get_rating_stats(self):
+    def get_percentile(self, percentile):
+        """Nearest-rank percentile (0-100) of city ratings"""
+        count = self.get_count()
+        if count == 0:
+            return None
+        percentile = min(max(percentile, 0), 100)
+        k = max(math.ceil(percentile / 100 * count) - 1, 0)
+        return self.rating_tree.kth_smallest(k)[0]
+    
+    def get_rating_stats(self, percentiles=(25, 50, 75, 90)):
         if self.rating_tree.is_empty():
             return {'total_ratings': 0, 'highest': None, 'lowest': None, 'tree_height': 0}
-        all_ratings = self.rating_tree.inorder_traversal()
-        avg_rating = sum(all_ratings) / len(all_ratings) if all_ratings else 0
         return {
-            'total_ratings': len(all_ratings),
-            'highest': self.rating_tree.find_max(),
-            'lowest': self.rating_tree.find_min(),
-            'average': round(avg_rating, 2),
+            'total_ratings': self.get_count(),
+            'highest': self.get_highest_rating(),
+            'lowest': self.get_lowest_rating(),
+            'average': round(self.get_average(), 2),
+            'percentiles': {f'p{p:g}': self.get_percentile(p) for p in percentiles},
             'tree_height': self.rating_tree.height()
         }
 
 # Global rating manager instance
 rating_manager = RatingManager()
 
+# -----------------------------------------------------------------------------
+# Ranking Engine
+# -----------------------------------------------------------------------------
+class CityRatingAggregate:
+    """Incremental review aggregate for one city"""
+    __slots__ = ('count', 'total', 'weighted_count', 'weighted_total', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        # Sums weighted by exp(decay_rate * (t - DECAY_ORIGIN)), see RankingEngine
+        self.weighted_count = 0.0
+        self.weighted_total = 0.0
+        # histogram[i] = number of (i + 1)-star reviews
+        self.histogram = [0, 0, 0, 0, 0]
+
+    def average(self):
+        return self.total / self.count if self.count else 0
+
+
+class RankingEngine:
+    """
+    Rank cities by a Bayesian average of their reviews, optionally with
+    exponential time decay so stale reviews fade out.
+
+        score = (C * m + sum(w_i * r_i)) / (C + sum(w_i))
+
+    C is PRIOR_WEIGHT (virtual reviews at the global mean m) and
+    w_i = 0.5 ** (age_i / half_life) in decayed mode, 1 otherwise.
+    Decayed sums are stored relative to a fixed origin, so an insert only
+    touches its own city; a single factor rescales them at query time.
+
+    Per-facet (global / region / trip type) top-K lists are maintained
+    incrementally on every review. The prior mean and decay factor are
+    frozen per RESCORE_INTERVAL epoch, after which lists are rebuilt lazily
+    from the aggregates (never from the reviews table).
+    """
+    PRIOR_WEIGHT = 10
+    DEFAULT_PRIOR_MEAN = 3.0
+    HALF_LIFE_DAYS = 180
+    RESCORE_INTERVAL = 3600  # seconds
+    TOP_K_SIZE = 20
+    DECAY_ORIGIN = datetime(2020, 1, 1)
+
+    def __init__(self, rating_index=None):
+        # Optional RatingManager kept in sync with each city's average rating
+        self.rating_index = rating_index
+        self.aggregates = {}
+        # facet key -> set of city ids; city id -> its facet keys
+        self.facet_members = {}
+        self.city_facets = {}
+        self.total_count = 0
+        self.total_sum = 0
+        # Every review up to this id is folded into the aggregates
+        self.high_water_id = 0
+        self._loaded_high_water_id = 0
+        # Live inserts applied past the contiguous mark (possibly with gaps)
+        self._live_ids = set()
+        # Binary snapshot of the aggregates (set from app config at startup)
+        self.snapshot_path = None
+        self._reviews_since_snapshot = 0
+        self.version = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._decay_rate = math.log(2) / (self.HALF_LIFE_DAYS * 86400)
+        self._epoch = None
+        self._prior_mean = self.DEFAULT_PRIOR_MEAN
+        self._decay_factor = 1.0
+        # (facet key, decay) -> [(-score, city_id), ...] ascending, or absent when dirty
+        self._top_lists = {}
+
+    # -- loading ---------------------------------------------------------------
+    def ensure_loaded(self):
+        """
+        Build aggregates once per process: from the snapshot file when one
+        exists, then catch up on reviews past its high-water mark. Falls
+        back to a full scan of the reviews table.
+        """
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            from app.database import db
+            from app.models.city import City
+            from app.models.review import Review
+
+            for city_id, region, trip_types in db.session.query(City.id, City.region, City.trip_types):
+                self._set_facets(city_id, region, trip_types)
+
+            from_snapshot = bool(self.snapshot_path) and self.load_snapshot(self.snapshot_path)
+            # Drop aggregates of cities deleted since the snapshot was taken
+            for city_id in [c for c in self.aggregates if c not in self.city_facets]:
+                aggregate = self.aggregates.pop(city_id)
+                self.total_count -= aggregate.count
+                self.total_sum -= aggregate.total
+
+            rows = (db.session.query(Review.id, Review.city_id, Review.rating, Review.created_at)
+                    .filter(Review.id > self.high_water_id)
+                    .order_by(Review.id))
+            caught_up = 0
+            for review_id, city_id, rating, created_at in rows.yield_per(1000):
+                self._apply_review(city_id, rating, created_at)
+                self.high_water_id = review_id
+                caught_up += 1
+
+            self._sync_rating_index(self.aggregates)
+            self._top_lists = {}
+            self._loaded_high_water_id = self.high_water_id
+            self.version += 1
+            self._loaded = True
+
+            if self.snapshot_path and (not from_snapshot or caught_up):
+                self._write_snapshot()
+
+    # -- snapshots -------------------------------------------------------------
+    # Header: magic, format version, record count, high-water review id,
+    # total review count, total rating sum, decay rate the weights were built with
+    SNAPSHOT_MAGIC = b'SCGR'
+    SNAPSHOT_FORMAT = 1
+    SNAPSHOT_HEADER = struct.Struct('<4sHIqqqd')
+    # Record: city_id, count, total, weighted_count, weighted_total, histogram[5]
+    SNAPSHOT_RECORD = struct.Struct('<IIqdd5I')
+    # Rewrite the snapshot after this many live inserts to bound catch-up work
+    SNAPSHOT_INTERVAL_REVIEWS = 500
+
+    def save_snapshot(self, path):
+        """Atomically write the aggregates to a compact binary file"""
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            records = [
+                self.SNAPSHOT_RECORD.pack(
+                    city_id, a.count, a.total, a.weighted_count, a.weighted_total, *a.histogram
+                )
+                for city_id, a in self.aggregates.items()
+            ]
+            header = self.SNAPSHOT_HEADER.pack(
+                self.SNAPSHOT_MAGIC, self.SNAPSHOT_FORMAT, len(records),
+                self.high_water_id, self.total_count, self.total_sum, self._decay_rate
+            )
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(header)
+                    f.write(b''.join(records))
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._reviews_since_snapshot = 0
+
+    def _catch_up(self):
+        """
+        Fold in reviews committed by other workers since the contiguous mark,
+        so every id up to the new high-water mark is counted exactly once.
+        """
+        from app.database import db
+        from app.models.review import Review
+
+        rows = (db.session.query(Review.id, Review.city_id, Review.rating, Review.created_at)
+                .filter(Review.id > self._loaded_high_water_id)
+                .order_by(Review.id))
+        mark = max(self._live_ids, default=self._loaded_high_water_id)
+        touched = set()
+        for review_id, city_id, rating, created_at in rows.yield_per(1000):
+            mark = max(mark, review_id)
+            if review_id in self._live_ids:
+                continue
+            self._apply_review(city_id, rating, created_at)
+            touched.add(city_id)
+        self._loaded_high_water_id = self.high_water_id = mark
+        self._live_ids = set()
+        if touched:
+            for city_id in touched:
+                if city_id not in self.city_facets:
+                    self._set_facets(city_id, None, None)
+                for decay in (False, True):
+                    self._update_top_lists(city_id, decay)
+            self._sync_rating_index(touched)
+            self.version += 1
+
+    def _write_snapshot(self):
+        """
+        Catch up with the reviews table, then save the snapshot. Failures
+        are logged: the snapshot only shortens the next startup.
+        """
+        with self._lock:
+            try:
+                self._catch_up()
+                self.save_snapshot(self.snapshot_path)
+            except Exception:
+                logger.exception('Could not write rating snapshot to %s', self.snapshot_path)
+
+    def load_snapshot(self, path):
+        """
+        Memory-map a snapshot file into the aggregates.
+        Returns False (leaving state untouched) if it is missing or unusable.
+        """
+        if not os.path.exists(path):
+            return False
+        header_size = self.SNAPSHOT_HEADER.size
+        record_size = self.SNAPSHOT_RECORD.size
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < header_size:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                magic, file_format, count, high_water_id, total_count, total_sum, decay_rate = \
+                    self.SNAPSHOT_HEADER.unpack_from(mapped, 0)
+                if (magic != self.SNAPSHOT_MAGIC or file_format != self.SNAPSHOT_FORMAT
+                        or decay_rate != self._decay_rate
+                        or len(mapped) != header_size + count * record_size):
+                    return False
+                aggregates = {}
+                view = memoryview(mapped)
+                try:
+                    for record in self.SNAPSHOT_RECORD.iter_unpack(view[header_size:]):
+                        aggregate = CityRatingAggregate()
+                        (city_id, aggregate.count, aggregate.total,
+                         aggregate.weighted_count, aggregate.weighted_total) = record[:5]
+                        aggregate.histogram = list(record[5:])
+                        aggregates[city_id] = aggregate
+                finally:
+                    view.release()
+        self.aggregates = aggregates
+        self.high_water_id = high_water_id
+        self.total_count = total_count
+        self.total_sum = total_sum
+        self._reviews_since_snapshot = 0
+        return True
+
+    def _sync_rating_index(self, city_ids):
+        if self.rating_index is None:
+            return
+        for city_id in city_ids:
+            aggregate = self.aggregates.get(city_id)
+            if aggregate and aggregate.count:
+                self.rating_index.add_rating(city_id, round(aggregate.average(), 2))
+
+    def review_count(self, city_id):
+        self.ensure_loaded()
+        aggregate = self.aggregates.get(city_id)
+        return aggregate.count if aggregate else 0
+
+    def get_summary(self, city_id):
+        """Review count, average and 1-5 star histogram for a city in O(1)"""
+        self.ensure_loaded()
+        aggregate = self.aggregates.get(city_id) or CityRatingAggregate()
+        return {
+            'count': aggregate.count,
+            'average': round(aggregate.average(), 2),
+            'histogram': {str(stars): n for stars, n in enumerate(aggregate.histogram, start=1)}
+        }
+
+    # -- facets ----------------------------------------------------------------
+    @staticmethod
+    def _facet_keys(region, trip_types):
+        keys = [('all', None)]
+        if region:
+            keys.append(('region', region))
+        for trip_type in trip_types or []:
+            keys.append(('trip_type', trip_type))
+        return keys
+
+    def _clear_facets(self, city_id):
+        for key in self.city_facets.pop(city_id, []):
+            self.facet_members.get(key, set()).discard(city_id)
+            for decay in (False, True):
+                self._top_lists.pop((key, decay), None)
+
+    def _set_facets(self, city_id, region, trip_types):
+        keys = self._facet_keys(region, trip_types)
+        if self.city_facets.get(city_id) == keys:
+            return
+        self._clear_facets(city_id)
+        self.city_facets[city_id] = keys
+        for key in keys:
+            self.facet_members.setdefault(key, set()).add(city_id)
+            for decay in (False, True):
+                self._top_lists.pop((key, decay), None)
+
+    def set_city_facets(self, city_id, region, trip_types):
+        """Register or update the region / trip types of a city"""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._set_facets(city_id, region, trip_types)
+            self.version += 1
+
+    def remove_city(self, city_id):
+        with self._lock:
+            if not self._loaded:
+                return
+            self._clear_facets(city_id)
+            aggregate = self.aggregates.pop(city_id, None)
+            if aggregate:
+                self.total_count -= aggregate.count
+                self.total_sum -= aggregate.total
+            if self.rating_index is not None:
+                self.rating_index.remove_city(city_id)
+            self.version += 1
+
+    # -- updates ---------------------------------------------------------------
+    def _apply_review(self, city_id, rating, created_at):
+        aggregate = self.aggregates.get(city_id)
+        if aggregate is None:
+            aggregate = self.aggregates[city_id] = CityRatingAggregate()
+        weight = self._weight(created_at)
+        aggregate.count += 1
+        aggregate.total += rating
+        aggregate.weighted_count += weight
+        aggregate.weighted_total += weight * rating
+        if 1 <= rating <= 5:
+            aggregate.histogram[int(rating) - 1] += 1
+        self.total_count += 1
+        self.total_sum += rating
+        return aggregate
+
+    def _weight(self, created_at):
+        created_at = created_at or datetime.utcnow()
+        age = (created_at - self.DECAY_ORIGIN).total_seconds()
+        return math.exp(self._decay_rate * age)
+
+    def add_review(self, review_id, city_id, rating, created_at=None):
+        """Fold one new review into the aggregates and top-K lists"""
+        self.add_reviews([(review_id, city_id, rating, created_at)])
+
+    def add_reviews(self, reviews):
+        """
+        Fold a batch of (review_id, city_id, rating, created_at) tuples in,
+        updating top-K lists and the rating index once per touched city.
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            self._check_epoch()
+            touched = set()
+            applied = 0
+            for review_id, city_id, rating, created_at in reviews:
+                # Reviews committed before the initial load are already counted
+                if review_id <= self._loaded_high_water_id or review_id in self._live_ids:
+                    continue
+                self._apply_review(city_id, rating, created_at)
+                self._live_ids.add(review_id)
+                touched.add(city_id)
+                applied += 1
+            if not applied:
+                return
+
+            for city_id in touched:
+                if city_id not in self.city_facets:
+                    self._set_facets(city_id, None, None)
+                for decay in (False, True):
+                    self._update_top_lists(city_id, decay)
+            self._sync_rating_index(touched)
+            self.version += 1
+
+            self._reviews_since_snapshot += applied
+            if self.snapshot_path and self._reviews_since_snapshot >= self.SNAPSHOT_INTERVAL_REVIEWS:
+                self._write_snapshot()
+
+    def _update_top_lists(self, city_id, decay):
+        entry = (-self._score(self.aggregates[city_id], decay), city_id)
+        for key in self.city_facets.get(city_id, []):
+            top = self._top_lists.get((key, decay))
+            if top is None:
+                continue
+            was_full = len(top) >= self.TOP_K_SIZE
+            for i, (_, member_id) in enumerate(top):
+                if member_id == city_id:
+                    del top[i]
+                    break
+            else:
+                # Not listed: only enters if it beats the current K-th entry
+                if not was_full or entry < top[-1]:
+                    bisect.insort(top, entry)
+                    del top[self.TOP_K_SIZE:]
+                continue
+            if was_full and top and entry > top[-1]:
+                # Dropped below the cut-off: an unlisted city may now rank higher
+                del self._top_lists[(key, decay)]
+            else:
+                bisect.insort(top, entry)
+
+    # -- scoring ---------------------------------------------------------------
+    def _check_epoch(self):
+        epoch = int(time.time() // self.RESCORE_INTERVAL)
+        if epoch == self._epoch:
+            return
+        self._epoch = epoch
+        if self.total_count:
+            self._prior_mean = self.total_sum / self.total_count
+        epoch_start = datetime.utcfromtimestamp(epoch * self.RESCORE_INTERVAL)
+        age = (epoch_start - self.DECAY_ORIGIN).total_seconds()
+        self._decay_factor = math.exp(-self._decay_rate * age)
+        self._top_lists = {}
+        self.version += 1
+
+    def _score(self, aggregate, decay):
+        if decay:
+            weight = aggregate.weighted_count * self._decay_factor
+            total = aggregate.weighted_total * self._decay_factor
+        else:
+            weight = aggregate.count
+            total = aggregate.total
+        prior = self.PRIOR_WEIGHT
+        return (prior * self._prior_mean + total) / (prior + weight)
+
+    def _rank(self, city_ids, decay, limit):
+        entries = [
+            (-self._score(self.aggregates[city_id], decay), city_id)
+            for city_id in city_ids
+            if city_id in self.aggregates and self.aggregates[city_id].count
+        ]
+        return heapq.nsmallest(limit, entries)
+
+    def get_top(self, limit=10, region=None, trip_type=None, decay=False):
+        """
+        Top cities by score, optionally restricted to a region and/or trip type.
+        Single-facet requests up to TOP_K_SIZE are served from the
+        precomputed lists; anything else ranks the facet's members.
+        """
+        self.ensure_loaded()
+        with self._lock:
+            self._check_epoch()
+            keys = []
+            if region:
+                keys.append(('region', region))
+            if trip_type:
+                keys.append(('trip_type', trip_type))
+            if not keys:
+                keys.append(('all', None))
+
+            if len(keys) == 1 and limit <= self.TOP_K_SIZE:
+                list_key = (keys[0], decay)
+                top = self._top_lists.get(list_key)
+                if top is None:
+                    top = self._rank(self.facet_members.get(keys[0], ()), decay, self.TOP_K_SIZE)
+                    self._top_lists[list_key] = top
+                ranked = top[:limit]
+            else:
+                members = [self.facet_members.get(key, set()) for key in keys]
+                members.sort(key=len)
+                candidates = [c for c in members[0] if all(c in other for other in members[1:])]
+                ranked = self._rank(candidates, decay, limit)
+
+            result = []
+            for neg_score, city_id in ranked:
+                aggregate = self.aggregates[city_id]
+                result.append({
+                    'city_id': city_id,
+                    'score': round(-neg_score, 4),
+                    'rating': round(aggregate.average(), 2),
+                    'review_count': aggregate.count
+                })
+            return result
+
+    def get_scores(self):
+        """Undecayed score of every reviewed city, {city_id: score}"""
+        self.ensure_loaded()
+        with self._lock:
+            self._check_epoch()
+            return {
+                city_id: self._score(aggregate, False)
+                for city_id, aggregate in self.aggregates.items()
+                if aggregate.count
+            }
+
+# Global ranking engine instance (feeds the rating BST with per-city averages)
+ranking_engine = RankingEngine(rating_manager)
+
+# -----------------------------------------------------------------------------
+# Review Ingestion
+# -----------------------------------------------------------------------------
+class ReviewIngestor:
+    """
+    Stream historical reviews into the database in chunks.
+    Duplicate (user_id, city_id) pairs are dropped in memory (first one wins)
+    and against existing rows; each chunk is one multi-row INSERT and one
+    aggregate update on the ranking engine.
+    """
+    DEFAULT_CHUNK_SIZE = 1000
+    MAX_REPORTED_ERRORS = 20
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, engine=None):
+        self.chunk_size = chunk_size
+        self.engine = engine or ranking_engine
+        self._seen = set()
+        self._city_ids = None
+        self.stats = {
+            'received': 0, 'inserted': 0, 'duplicates': 0, 'invalid': 0,
+            'chunks': 0, 'elapsed_seconds': 0, 'rows_per_second': 0, 'errors': []
+        }
+
+    def _invalid(self, line_no, message):
+        self.stats['invalid'] += 1
+        if len(self.stats['errors']) < self.MAX_REPORTED_ERRORS:
+            self.stats['errors'].append({'row': line_no, 'error': message})
+
+    @staticmethod
+    def _integer(value):
+        """int() that refuses to truncate: 4.7 and True are errors, 4.0 and '4' are not"""
+        if isinstance(value, bool):
+            raise TypeError('booleans are not integers')
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError('not an integral value')
+        return int(value)
+
+    def _parse(self, line_no, row):
+        """Validate one raw row, returning an insertable dict or None"""
+        if not isinstance(row, dict):
+            self._invalid(line_no, 'Row must be an object')
+            return None
+        try:
+            user_id = self._integer(row['user_id'])
+            city_id = self._integer(row['city_id'])
+            rating = self._integer(row['rating'])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            self._invalid(line_no, 'user_id, city_id and rating must be integers')
+            return None
+        if not 1 <= rating <= 5:
+            self._invalid(line_no, 'rating must be between 1 and 5')
+            return None
+        if city_id not in self._city_ids:
+            self._invalid(line_no, f'Unknown city_id {city_id}')
+            return None
+        created_at = row.get('created_at')
+        if created_at:
+            try:
+                created_at = datetime.fromisoformat(str(created_at))
+            except ValueError:
+                self._invalid(line_no, 'created_at must be an ISO 8601 timestamp')
+                return None
+        return {
+            'user_id': user_id,
+            'city_id': city_id,
+            'rating': rating,
+            'comment': row.get('comment'),
+            'created_at': created_at or datetime.utcnow()
+        }
+
+    def ingest(self, rows):
+        """
+        Consume an iterable of review dicts and return throughput stats.
+        The iterable is read lazily, so generators over files or request
+        streams are never materialized.
+        """
+        from app.database import db
+        from app.models.city import City
+
+        started = time.perf_counter()
+        self.engine.ensure_loaded()
+        self._city_ids = {city_id for (city_id,) in db.session.query(City.id)}
+
+        chunk = []
+        for line_no, row in enumerate(rows, start=1):
+            self.stats['received'] += 1
+            review = self._parse(line_no, row)
+            if review is None:
+                continue
+            pair = (review['user_id'], review['city_id'])
+            if pair in self._seen:
+                self.stats['duplicates'] += 1
+                continue
+            self._seen.add(pair)
+            chunk.append((line_no, review))
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+        if chunk:
+            self._flush(chunk)
+
+        elapsed = time.perf_counter() - started
+        self.stats['elapsed_seconds'] = round(elapsed, 3)
+        self.stats['rows_per_second'] = round(self.stats['received'] / elapsed, 1) if elapsed else 0
+        return self.stats
+
+    def _flush(self, chunk):
+        """Insert a chunk of (line number, review) pairs"""
+        from sqlalchemy import insert
+        from app.database import db
+        from app.models.review import Review
+        from app.models.user import User
+
+        user_ids = {r['user_id'] for _, r in chunk}
+        city_ids = {r['city_id'] for _, r in chunk}
+        known_users = {user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(user_ids))}
+        existing = set(
+            db.session.query(Review.user_id, Review.city_id)
+            .filter(Review.user_id.in_(user_ids), Review.city_id.in_(city_ids))
+        )
+
+        rows = []
+        for line_no, review in chunk:
+            if review['user_id'] not in known_users:
+                self._invalid(line_no, f"Unknown user_id {review['user_id']}")
+                continue
+            if (review['user_id'], review['city_id']) in existing:
+                self.stats['duplicates'] += 1
+                continue
+            rows.append(review)
+        self.stats['chunks'] += 1
+        if not rows:
+            return
+
+        try:
+            db.session.execute(insert(Review), rows)
+            # Read back ids so the engine can apply the chunk exactly once
+            pairs = {(r['user_id'], r['city_id']) for r in rows}
+            inserted = [
+                (review_id, city_id, rating, created_at)
+                for review_id, user_id, city_id, rating, created_at in db.session.query(
+                    Review.id, Review.user_id, Review.city_id, Review.rating, Review.created_at
+                ).filter(Review.user_id.in_(user_ids), Review.city_id.in_(city_ids))
+                if (user_id, city_id) in pairs
+            ]
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        self.stats['inserted'] += len(rows)
+        self.engine.add_reviews(sorted(inserted))
+        for city_id in {r['city_id'] for r in rows}:
+            city_cache.delete(f'city_{city_id}')
+
+# -----------------------------------------------------------------------------
+# Co-View Index
+# -----------------------------------------------------------------------------
+class CoViewIndex:
+    """
+    "People who viewed X also viewed Y", mined from recent-city lists.
+    When a city enters a user's recent list, it is paired with every other
+    city already in that list and both directions are counted. Counts are
+    sparse (only pairs that occurred) and each city keeps at most
+    MAX_CANDIDATES neighbours: past that, the list is pruned back to the
+    strongest PRUNE_TO, so memory stays O(cities * MAX_CANDIDATES). The
+    top NEIGHBOR_LIMIT neighbours are kept sorted and rebuilt only after a
+    city's counts change, so reads are O(NEIGHBOR_LIMIT).
+    """
+    NEIGHBOR_LIMIT = 10
+    MAX_CANDIDATES = 50
+    PRUNE_TO = 25
+
+    def __init__(self):
+        self.counts = {}   # city_id -> {neighbour_id: co-view count}
+        self.names = {}    # city_id -> city name
+        self._top = {}     # city_id -> [(count, neighbour_id)], strongest first
+        self._lock = threading.Lock()
+        self.prunes = 0
+
+    def _increment(self, city_id, neighbour_id):
+        neighbours = self.counts.get(city_id)
+        if neighbours is None:
+            neighbours = self.counts[city_id] = {}
+        neighbours[neighbour_id] = neighbours.get(neighbour_id, 0) + 1
+        if len(neighbours) > self.MAX_CANDIDATES:
+            keep = heapq.nlargest(self.PRUNE_TO, neighbours.items(), key=lambda item: item[1])
+            self.counts[city_id] = dict(keep)
+            self.prunes += 1
+        self._top.pop(city_id, None)
+
+    def record(self, city_id, city_name, session_city_ids):
+        """Pair a newly viewed city with the other cities in the session"""
+        with self._lock:
+            self.names[city_id] = city_name
+            for other_id in session_city_ids:
+                if other_id == city_id:
+                    continue
+                self._increment(city_id, other_id)
+                self._increment(other_id, city_id)
+
+    def remove_city(self, city_id):
+        with self._lock:
+            for neighbour_id in self.counts.pop(city_id, {}):
+                neighbours = self.counts.get(neighbour_id)
+                if neighbours and neighbours.pop(city_id, None) is not None:
+                    self._top.pop(neighbour_id, None)
+            self._top.pop(city_id, None)
+            self.names.pop(city_id, None)
+
+    def get_also_viewed(self, city_id, limit=None):
+        """Strongest co-viewed cities, most co-views first"""
+        limit = min(limit or self.NEIGHBOR_LIMIT, self.NEIGHBOR_LIMIT)
+        top = self._top.get(city_id)
+        if top is None:
+            with self._lock:
+                neighbours = self.counts.get(city_id, {})
+                top = heapq.nlargest(
+                    self.NEIGHBOR_LIMIT,
+                    ((count, neighbour_id) for neighbour_id, count in neighbours.items()),
+                    key=lambda item: (item[0], -item[1])
+                )
+                self._top[city_id] = top
+        return [
+            {'city_id': neighbour_id, 'city_name': self.names.get(neighbour_id), 'co_views': count}
+            for count, neighbour_id in top[:limit]
+        ]
+
+# Global co-view index instance (fed by UserTracker.add_recent_city)
+co_view_index = CoViewIndex()
+
 # -----------------------------------------------------------------------------
 # User Tracking Manager
 # -----------------------------------------------------------------------------
 class UserTracker:
-    """Track user navigation and recently viewed cities"""
+    """
+    Track user navigation and recently viewed cities.
+    Each user's navigation history is a BoundedStack (ring buffer), and
+    all access to a user's state goes through that user's lock.
+    
+    Tracked users are kept in a RecentList ordered by last activity: the
+    least recently active user is evicted once MAX_TRACKED_USERS is
+    reached, and users idle for longer than IDLE_TIMEOUT are dropped as
+    new activity comes in, so client-supplied ids cannot grow memory
+    without bound.
+    
+    Once start_persistence(app) is called, state is persisted write-behind:
+    mutations only mark the user dirty, and a background thread upserts
+    all dirty users into user_tracker_state every FLUSH_INTERVAL seconds
+    (sooner if MAX_DIRTY_USERS pile up), so at most one interval of
+    activity is lost on a crash. Users seen for the first time since a
+    restart, or since being evicted, are rehydrated from that table.
+    
+    Anonymous, session-scoped ids (ANONYMOUS_PREFIX) get much smaller
+    per-id limits and are never persisted.
+    """
+    RECENT_CITIES_LIMIT = 10
+    NAVIGATION_HISTORY_LIMIT = 50
+    ANONYMOUS_PREFIX = 'anon:'
+    ANONYMOUS_RECENT_CITIES_LIMIT = 5
+    ANONYMOUS_NAVIGATION_LIMIT = 10
+    MAX_TRACKED_USERS = 10000
+    IDLE_TIMEOUT = 30 * 60  # seconds
+    # Rough footprints used by get_memory_stats (entry dict with its strings,
+    # per-user bookkeeping across the dicts, lock and activity node)
+    APPROX_ENTRY_BYTES = 450
+    APPROX_USER_BYTES = 400
+    FLUSH_INTERVAL = 5  # seconds
+    MAX_DIRTY_USERS = 1000
+    # Failed flushes an evicted user's snapshot is retried for before it is dropped
+    MAX_FLUSH_RETRIES = 3
+    MAX_USER_KEY_LENGTH = 100  # user_tracker_state.user_key column size
+
     def __init__(self):
         self.navigation_stacks = {}
         self.recent_cities = {}
+        self._locks = {}
+        # user_id -> (user_id, last_active), least recently active at the tail
+        self._activity = RecentList(self.MAX_TRACKED_USERS)
+        self._activity_lock = threading.Lock()
+        self.evictions = {'capacity': 0, 'idle': 0}
+        # Write-behind state: users changed since the last flush, and final
+        # snapshots of dirty users that were evicted before being flushed
+        self._app = None
+        self._dirty = set()
+        self._evicted_states = {}
+        self._flush_failures = {}  # evicted user_id -> failed flushes so far
+        self._dirty_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self.persistence_stats = {'flushes': 0, 'rows_written': 0, 'rehydrated': 0, 'errors': 0, 'dropped': 0}
+    
+    def _lock_for(self, user_id):
+        # dict.setdefault is atomic, so concurrent first requests share one lock
+        return self._locks.setdefault(user_id, threading.Lock())
+    
+    def _touch(self, user_id):
+        """Record activity for user_id and evict idle / over-capacity users"""
+        now = time.monotonic()
+        expired = []
+        with self._activity_lock:
+            is_new = user_id not in self._activity
+            evicted = self._activity.touch(user_id, (user_id, now))
+            if evicted:
+                expired.append(evicted[0])
+                self.evictions['capacity'] += 1
+            while True:
+                oldest = self._activity.peek_oldest()
+                if oldest is None or now - oldest[1] <= self.IDLE_TIMEOUT:
+                    break
+                self._activity.pop_oldest()
+                expired.append(oldest[0])
+                self.evictions['idle'] += 1
+        for expired_id in expired:
+            self._forget(expired_id)
+        if is_new and self._app is not None and not self._is_anonymous(user_id):
+            self._rehydrate(user_id)
+    
+    def _forget(self, user_id):
+        lock = self._locks.get(user_id)
+        if lock is not None and user_id in self._dirty:
+            with lock:
+                state = self._serialize(user_id)
+            with self._dirty_lock:
+                self._evicted_states[user_id] = state
+        self.navigation_stacks.pop(user_id, None)
+        self.recent_cities.pop(user_id, None)
+        self._locks.pop(user_id, None)
+    
+    def _is_anonymous(self, user_id):
+        return str(user_id).startswith(self.ANONYMOUS_PREFIX)
+    
+    def _new_navigation_stack(self, user_id):
+        if self._is_anonymous(user_id):
+            return BoundedStack(self.ANONYMOUS_NAVIGATION_LIMIT)
+        return BoundedStack(self.NAVIGATION_HISTORY_LIMIT)
+    
+    def _new_recent_list(self, user_id):
+        if self._is_anonymous(user_id):
+            return RecentList(self.ANONYMOUS_RECENT_CITIES_LIMIT)
+        return RecentList(self.RECENT_CITIES_LIMIT)
+    
+    def _ensure_resident(self, user_id):
+        """Make a read see persisted state for users not yet in memory"""
+        if self._app is not None and user_id not in self._activity and not self._is_anonymous(user_id):
+            self._touch(user_id)
+    
+    # ==================== Write-behind persistence ====================
+    
+    def start_persistence(self, app):
+        """Enable write-behind persistence and start the background flusher"""
+        if self._app is not None:
+            return
+        self._app = app
+        threading.Thread(target=self._flush_loop, name='user-tracker-flush', daemon=True).start()
+        atexit.register(self.flush)
+    
+    def _mark_dirty(self, user_id):
+        if self._app is None or self._is_anonymous(user_id) or len(str(user_id)) > self.MAX_USER_KEY_LENGTH:
+            return
+        with self._dirty_lock:
+            self._dirty.add(user_id)
+            if len(self._dirty) >= self.MAX_DIRTY_USERS:
+                self._flush_requested.set()
+    
+    def _flush_loop(self):
+        while True:
+            self._flush_requested.wait(self.FLUSH_INTERVAL)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception:
+                self.persistence_stats['errors'] += 1
+    
+    def _serialize(self, user_id):
+        """Compact JSON columns for one user's current state"""
+        stack = self.navigation_stacks.get(user_id)
+        recent = self.recent_cities.get(user_id)
+        navigation = stack.top_items(len(stack))[::-1] if stack else []
+        recent_cities = recent.to_list() if recent else []
+        return {
+            'user_key': str(user_id),
+            'navigation': json.dumps(navigation, separators=(',', ':')),
+            'recent_cities': json.dumps(recent_cities, separators=(',', ':')),
+            'updated_at': datetime.utcnow()
+        }
+    
+    def flush(self):
+        """
+        Upsert every dirty user's state in one bulk statement.
+        Returns the number of rows written.
+        """
+        if self._app is None:
+            return 0
+        with self._flush_lock:
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+                rows = self._evicted_states
+                self._evicted_states = {}
+            for user_id in dirty:
+                # Live state supersedes a snapshot taken at eviction
+                lock = self._locks.get(user_id)
+                if lock is None:
+                    continue
+                with lock:
+                    rows[user_id] = self._serialize(user_id)
+            if not rows:
+                return 0
+            
+            try:
+                with self._app.app_context():
+                    self._upsert(list(rows.values()))
+            except Exception:
+                # Retry next time: live users are re-serialized, evicted
+                # snapshots are kept unless a newer one has been taken, and
+                # dropped after MAX_FLUSH_RETRIES failures so a missing table
+                # or a dead database cannot grow the backlog without bound
+                with self._dirty_lock:
+                    for user_id, row in rows.items():
+                        if user_id in self._locks:
+                            self._dirty.add(user_id)
+                            continue
+                        failures = self._flush_failures.get(user_id, 0) + 1
+                        if failures > self.MAX_FLUSH_RETRIES:
+                            self._flush_failures.pop(user_id, None)
+                            self.persistence_stats['dropped'] += 1
+                        elif user_id not in self._evicted_states:
+                            self._flush_failures[user_id] = failures
+                            self._evicted_states[user_id] = row
+                raise
+            with self._dirty_lock:
+                for user_id in rows:
+                    self._flush_failures.pop(user_id, None)
+            self.persistence_stats['flushes'] += 1
+            self.persistence_stats['rows_written'] += len(rows)
+            return len(rows)
+    
+    def _upsert(self, rows):
+        from app.database import db
+        from app.models.tracker_state import UserTrackerState
+        
+        table = UserTrackerState.__table__
+        dialect = db.engine.dialect.name
+        if dialect == 'mysql':
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
+            stmt = dialect_insert(table)
+            stmt = stmt.on_duplicate_key_update(
+                navigation=stmt.inserted.navigation,
+                recent_cities=stmt.inserted.recent_cities,
+                updated_at=stmt.inserted.updated_at
+            )
+        else:
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            stmt = dialect_insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.user_key],
+                set_={
+                    'navigation': stmt.excluded.navigation,
+                    'recent_cities': stmt.excluded.recent_cities,
+                    'updated_at': stmt.excluded.updated_at
+                }
+            )
+        try:
+            db.session.execute(stmt, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    def _rehydrate(self, user_id):
+        """
+        Load a user's persisted state underneath anything recorded in
+        memory since (a concurrent request may already have pushed)
+        """
+        from app.database import db
+        from app.models.tracker_state import UserTrackerState
+        
+        with self._dirty_lock:
+            pending = self._evicted_states.get(user_id)
+        try:
+            if pending is not None:
+                row = pending
+            else:
+                with self._app.app_context():
+                    state = db.session.get(UserTrackerState, str(user_id))
+                    if state is None:
+                        return
+                    row = {'navigation': state.navigation, 'recent_cities': state.recent_cities}
+            navigation = json.loads(row['navigation'])
+            recent_cities = json.loads(row['recent_cities'])
+        except Exception:
+            self.persistence_stats['errors'] += 1
+            return
+        
+        with self._lock_for(user_id):
+            stack = BoundedStack(self.NAVIGATION_HISTORY_LIMIT)
+            for entry in navigation:
+                stack.push(entry)
+            current = self.navigation_stacks.get(user_id)
+            if current:
+                for entry in current.top_items(len(current))[::-1]:
+                    stack.push(entry)
+            self.navigation_stacks[user_id] = stack
+            
+            recent = RecentList(self.RECENT_CITIES_LIMIT)
+            for entry in reversed(recent_cities):
+                recent.touch(entry['city_id'], entry)
+            current = self.recent_cities.get(user_id)
+            if current:
+                for entry in reversed(current.to_list()):
+                    recent.touch(entry['city_id'], entry)
+            self.recent_cities[user_id] = recent
+        self.persistence_stats['rehydrated'] += 1
+    
+    def get_memory_stats(self):
+        """Counts of tracked users and entries, with a rough size estimate"""
+        with self._activity_lock:
+            tracked_users = len(self._activity)
+            oldest = self._activity.peek_oldest()
+        navigation_entries = sum(len(stack) for stack in list(self.navigation_stacks.values()))
+        recent_city_entries = sum(len(recent) for recent in list(self.recent_cities.values()))
+        # Ring buffers are preallocated, so count their slots rather than entries
+        navigation_slots = sum(stack.capacity for stack in list(self.navigation_stacks.values()))
+        approx_bytes = (
+            navigation_slots * 8
+            + (navigation_entries + recent_city_entries) * self.APPROX_ENTRY_BYTES
+            + tracked_users * self.APPROX_USER_BYTES
+        )
+        return {
+            'tracked_users': tracked_users,
+            'max_tracked_users': self.MAX_TRACKED_USERS,
+            'idle_timeout_seconds': self.IDLE_TIMEOUT,
+            'users_with_navigation': len(self.navigation_stacks),
+            'users_with_recent_cities': len(self.recent_cities),
+            'navigation_entries': navigation_entries,
+            'recent_city_entries': recent_city_entries,
+            'anonymous_users': sum(1 for user_id in list(self._locks) if self._is_anonymous(user_id)),
+            'oldest_idle_seconds': round(time.monotonic() - oldest[1], 1) if oldest else 0,
+            'evictions': dict(self.evictions),
+            'approx_bytes': approx_bytes,
+            'persistence': dict(
+                self.persistence_stats,
+                enabled=self._app is not None,
+                dirty_users=len(self._dirty) + len(self._evicted_states),
+                flush_interval_seconds=self.FLUSH_INTERVAL
+            )
+        }
     
     def track_navigation(self, user_id, page):
-        if user_id not in self.navigation_stacks:
-            self.navigation_stacks[user_id] = Stack()
-        self.navigation_stacks[user_id].push({
-            'page': page,
-            'timestamp': datetime.utcnow().isoformat()
-        })
+        self._touch(user_id)
+        with self._lock_for(user_id):
+            if user_id not in self.navigation_stacks:
+                self.navigation_stacks[user_id] = self._new_navigation_stack(user_id)
+            self.navigation_stacks[user_id].push({
+                'page': page,
+                'timestamp': datetime.utcnow().isoformat()
+            })
+        self._mark_dirty(user_id)
+    
+    def track_navigation_batch(self, events):
+        """
+        Record many (user_id, page, client_timestamp) events in one pass.
+        Events are grouped per user so each user's lock is taken once;
+        within a user they are applied in client timestamp order.
+        """
+        by_user = {}
+        for user_id, page, client_timestamp in events:
+            if not isinstance(client_timestamp, str):
+                client_timestamp = ''
+            by_user.setdefault(user_id, []).append((client_timestamp, page))
+        
+        server_timestamp = datetime.utcnow().isoformat()
+        for user_id, user_events in by_user.items():
+            user_events.sort(key=lambda event: event[0])
+            self._touch(user_id)
+            with self._lock_for(user_id):
+                stack = self.navigation_stacks.get(user_id)
+                if stack is None:
+                    stack = self.navigation_stacks[user_id] = self._new_navigation_stack(user_id)
+                for client_timestamp, page in user_events:
+                    entry = {'page': page, 'timestamp': server_timestamp}
+                    if client_timestamp:
+                        entry['client_timestamp'] = client_timestamp
+                    stack.push(entry)
+            self._mark_dirty(user_id)
+        return len(by_user)
     
     def go_back(self, user_id):
+        self._ensure_resident(user_id)
         if user_id not in self.navigation_stacks: return None
-        stack = self.navigation_stacks[user_id]
-        if stack.is_empty(): return None
-        stack.pop() # Pop current
-        if not stack.is_empty(): return stack.peek() # Return prev
-        return None
+        with self._lock_for(user_id):
+            stack = self.navigation_stacks[user_id]
+            if stack.is_empty(): return None
+            stack.pop() # Pop current
+            self._mark_dirty(user_id)
+            if not stack.is_empty(): return stack.peek() # Return prev
+            return None
     
     def get_navigation_history(self, user_id, limit=10):
+        """Last `limit` pages, newest first; read-only, O(limit)"""
+        self._ensure_resident(user_id)
         if user_id not in self.navigation_stacks: return []
-        stack = self.navigation_stacks[user_id]
-        history = []
-        temp_stack = Stack()
-        count = 0
-        while not stack.is_empty() and count < limit:
-            item = stack.pop()
-            history.append(item)
-            temp_stack.push(item)
-            count += 1
-        while not temp_stack.is_empty():
-            stack.push(temp_stack.pop())
-        return history
+        with self._lock_for(user_id):
+            return self.navigation_stacks[user_id].top_items(limit)
     
     def add_recent_city(self, user_id, city_id, city_name):
-        if user_id not in self.recent_cities:
-            self.recent_cities[user_id] = LinkedList()
-        recent_list = self.recent_cities[user_id]
-        recent_list.delete_by_value(city_id)
-        if recent_list.size() >= 10:
-            recent_list.delete_at_beginning()
-        recent_list.insert_at_end({
-            'city_id': city_id,
-            'city_name': city_name,
-            'viewed_at': datetime.utcnow().isoformat()
-        })
+        self._touch(user_id)
+        with self._lock_for(user_id):
+            if user_id not in self.recent_cities:
+                self.recent_cities[user_id] = self._new_recent_list(user_id)
+            recent = self.recent_cities[user_id]
+            # Only a city new to the session forms new co-view pairs
+            session_city_ids = None
+            if city_id not in recent:
+                session_city_ids = [entry['city_id'] for entry in recent.to_list()]
+            # Keyed by city_id: a repeat view moves the city to the front
+            recent.touch(city_id, {
+                'city_id': city_id,
+                'city_name': city_name,
+                'viewed_at': datetime.utcnow().isoformat()
+            })
+        self._mark_dirty(user_id)
+        if session_city_ids is not None:
+            co_view_index.record(city_id, city_name, session_city_ids)
     
     def get_recent_cities(self, user_id):
+        """Most recently viewed first"""
+        self._ensure_resident(user_id)
         if user_id not in self.recent_cities: return []
-        return self.recent_cities[user_id].to_list()
+        with self._lock_for(user_id):
+            return self.recent_cities[user_id].to_list()
 
 # Global user tracker instance
 user_tracker = UserTracker()
+
+# -----------------------------------------------------------------------------
+# Trending Cities
+# -----------------------------------------------------------------------------
+class TrendingEngine:
+    """
+    Sliding-window city view counts in fixed memory.
+    Views land in two circular arrays of time buckets: one per minute for
+    the last hour and one per hour for the last day. Each bucket is a
+    Space-Saving heavy-hitters counter holding at most BUCKET_CAPACITY
+    cities, so memory is bounded by (60 + 24) * BUCKET_CAPACITY counters
+    no matter how many cities or views there are. A window is answered by
+    summing the buckets it covers (minute precision up to 1h, hour
+    precision beyond) - no database access.
+    """
+    MINUTE_BUCKETS = 60
+    HOUR_BUCKETS = 24
+    BUCKET_CAPACITY = 64
+    MAX_WINDOW_MINUTES = MINUTE_BUCKETS * HOUR_BUCKETS
+    RESULT_TTL = 10  # seconds a computed window is reused
+    CITY_FIELDS = ('id', 'name', 'state', 'region', 'category', 'image_url', 'badge')
+
+    def __init__(self):
+        self._minutes = TimeBucketRing(self.MINUTE_BUCKETS, self._new_bucket)
+        self._hours = TimeBucketRing(self.HOUR_BUCKETS, self._new_bucket)
+        # city_id -> display fields captured at view time (one per real city)
+        self.cities = {}
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def _new_bucket(self):
+        return SpaceSaving(self.BUCKET_CAPACITY)
+
+    def record_view(self, city_id, city_data):
+        """Count one view of a city; city_data supplies its display fields"""
+        minute = int(time.time() // 60)
+        with self._lock:
+            self._minutes.bucket(minute).add(city_id)
+            self._hours.bucket(minute // 60).add(city_id)
+            if city_id not in self.cities:
+                self.cities[city_id] = {field: city_data.get(field) for field in self.CITY_FIELDS}
+
+    def update_city(self, city_data):
+        """Refresh display fields after a city edit"""
+        with self._lock:
+            if city_data['id'] in self.cities:
+                self.cities[city_data['id']] = {field: city_data.get(field) for field in self.CITY_FIELDS}
+                self._results = {}
+
+    def remove_city(self, city_id):
+        """Drop a deleted city from every bucket"""
+        minute = int(time.time() // 60)
+        with self._lock:
+            for bucket in self._minutes.window(minute, self.MINUTE_BUCKETS):
+                bucket.remove(city_id)
+            for bucket in self._hours.window(minute // 60, self.HOUR_BUCKETS):
+                bucket.remove(city_id)
+            self.cities.pop(city_id, None)
+            self._results = {}
+
+    def get_trending(self, window_minutes=60, limit=10):
+        """
+        Most viewed cities over the last window_minutes, most views first.
+        Each entry carries the city's display fields plus `views` and
+        `views_error` (the most `views` may overcount by).
+        """
+        window_minutes = max(1, min(window_minutes, self.MAX_WINDOW_MINUTES))
+        now = time.monotonic()
+        cached = self._results.get(window_minutes)
+        if cached and now - cached[0] < self.RESULT_TTL and cached[1] >= limit:
+            return cached[2][:limit]
+
+        minute = int(time.time() // 60)
+        counts = {}
+        errors = {}
+        with self._lock:
+            if window_minutes <= self.MINUTE_BUCKETS:
+                buckets = self._minutes.window(minute, window_minutes)
+            else:
+                buckets = self._hours.window(minute // 60, math.ceil(window_minutes / 60))
+            for bucket in buckets:
+                for city_id, count in bucket.counts.items():
+                    counts[city_id] = counts.get(city_id, 0) + count
+                    errors[city_id] = errors.get(city_id, 0) + bucket.errors[city_id]
+            cities = self.cities
+
+        top_n = max(limit, 20)
+        ranked = []
+        for city_id, views in heapq.nlargest(top_n, counts.items(), key=lambda item: (item[1], -item[0])):
+            if city_id in cities:
+                ranked.append(dict(cities[city_id], views=views, views_error=errors[city_id]))
+        self._results[window_minutes] = (now, top_n, ranked)
+        return ranked[:limit]
+
+# Global trending engine instance (fed by city detail views)
+trending_engine = TrendingEngine()
+
+# -----------------------------------------------------------------------------
+# Unique Viewers
+# -----------------------------------------------------------------------------
+class UniqueViewerCounter:
+    """
+    Approximate unique viewers per city per day.
+    Each (city, UTC day) gets a HyperLogLog sketch of PRECISION bits
+    (2 KB, ~2.3% standard error) instead of a set of viewer ids. Weekly
+    and monthly figures merge the daily sketches, so a viewer who comes
+    back on several days is still counted once. Days older than
+    RETENTION_DAYS are dropped as new days begin.
+    """
+    PRECISION = 11
+    RETENTION_DAYS = 30
+    PERIOD_DAYS = {'day': 1, 'week': 7, 'month': 30}
+
+    def __init__(self):
+        # date -> {city_id: HyperLogLog}
+        self.days = {}
+        self._lock = threading.Lock()
+
+    def record_view(self, city_id, viewer_id):
+        today = datetime.utcnow().date()
+        with self._lock:
+            sketches = self.days.get(today)
+            if sketches is None:
+                sketches = self.days[today] = {}
+                cutoff = today - timedelta(days=self.RETENTION_DAYS)
+                for day in [day for day in self.days if day <= cutoff]:
+                    del self.days[day]
+            sketch = sketches.get(city_id)
+            if sketch is None:
+                sketch = sketches[city_id] = HyperLogLog(self.PRECISION)
+            sketch.add(viewer_id)
+
+    def remove_city(self, city_id):
+        with self._lock:
+            for sketches in self.days.values():
+                sketches.pop(city_id, None)
+
+    def _rollup(self, period):
+        """Merged sketch per city over the last PERIOD_DAYS[period] days"""
+        start = datetime.utcnow().date() - timedelta(days=self.PERIOD_DAYS[period] - 1)
+        merged = {}
+        with self._lock:
+            for day, sketches in self.days.items():
+                if day < start:
+                    continue
+                for city_id, sketch in sketches.items():
+                    if city_id in merged:
+                        merged[city_id].merge(sketch)
+                    else:
+                        merged[city_id] = sketch.copy()
+        return merged
+
+    def get_unique_viewers(self, period='day', limit=10):
+        """
+        Cities with the most unique viewers over the period ('day', 'week'
+        or 'month'), most first, with the sketches' error bound
+        """
+        counts = [(city_id, sketch.count()) for city_id, sketch in self._rollup(period).items()]
+        top = heapq.nlargest(limit, counts, key=lambda item: item[1])
+        standard_error = 1.04 / math.sqrt(1 << self.PRECISION)
+        return {
+            'period': period,
+            'days': self.PERIOD_DAYS[period],
+            'standard_error': round(standard_error, 4),
+            'cities_tracked': len(counts),
+            'memory_bytes': sum(len(sketches) for sketches in self.days.values()) << self.PRECISION,
+            'cities': [{'city_id': city_id, 'unique_viewers': count} for city_id, count in top]
+        }
+
+# Global unique viewer counter instance (fed by city detail views)
+unique_viewer_counter = UniqueViewerCounter()
+
+# -----------------------------------------------------------------------------
+# Catalog Watcher
+# -----------------------------------------------------------------------------
+class CatalogWatcher:
+    """
+    Change detection for the city catalog behind the in-memory indexes
+    (CitySearchIndex, CatalogFacetIndex, GeoIndex).
+    
+    Each index is built from the DB on first use and updated in place by
+    the city create / update / delete endpoints. Writes that bypass this
+    process - seed and migration scripts, other workers - are caught by
+    comparing a cheap signature of the cities and attractions tables
+    (row counts, highest ids, latest cities.updated_at) at most every
+    CHECK_INTERVAL seconds: when it moves, the generation is bumped and
+    each index reloads on its next use. Attraction edits made outside the
+    API do not move the signature and wait for the next city change.
+    """
+    CHECK_INTERVAL = 300  # seconds
+
+    def __init__(self):
+        self.generation = 0
+        self._signature = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _read_signature():
+        from app.database import db
+        from app.models.city import City
+        from app.models.attraction import Attraction
+
+        cities = db.session.query(db.func.count(City.id), db.func.max(City.id), db.func.max(City.updated_at)).one()
+        attractions = db.session.query(db.func.count(Attraction.id), db.func.max(Attraction.id)).one()
+        return tuple(cities) + tuple(attractions)
+
+    def check(self):
+        """Current generation, re-reading the signature once per CHECK_INTERVAL"""
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.CHECK_INTERVAL:
+            return self.generation
+        with self._lock:
+            if self._checked_at != checked_at:
+                return self.generation
+            signature = self._read_signature()
+            if self._signature is not None and signature != self._signature:
+                self.generation += 1
+            self._signature = signature
+            self._checked_at = time.monotonic()
+            return self.generation
+
+# Global catalog watcher instance (shared by the catalog indexes)
+catalog_watcher = CatalogWatcher()
+
+# -----------------------------------------------------------------------------
+# City Search
+# -----------------------------------------------------------------------------
+class CitySearchIndex:
+    """
+    In-process full-text index over cities and their attractions, kept in
+    sync with the DB through catalog_watcher. Searches return ranked city
+    ids only; callers hydrate them from the DB.
+    
+    Also serves typeahead suggestions for city names, states and
+    attraction names from a TopKTrie whose nodes hold the SUGGEST_K most
+    popular matches (popularity = the city's review count). Every word of
+    a name is a key, so "fort" suggests "Amber Fort". The trie is rebuilt
+    from memory, without the DB: right away after the catalog changes, and
+    in a background thread at most every SUGGEST_REFRESH_INTERVAL seconds
+    after review counts change, while the previous trie keeps serving.
+    
+    Fuzzy search matches misspellings ("Banglore", "Varansi") and known
+    alternative names ("Mysuru") through a TrigramIndex over city names,
+    their words, states and ALIAS_GROUPS, rebuilt the same way.
+    """
+    FIELD_WEIGHTS = {'name': 4, 'state': 2, 'attractions': 1.5, 'description': 1}
+    SUGGEST_K = 10
+    SUGGEST_REFRESH_INTERVAL = 30  # seconds
+    MIN_FUZZY_TERM_LENGTH = 3
+    # Names a city is also known by; a city named like any member matches all
+    ALIAS_GROUPS = (
+        ('bangalore', 'bengaluru'), ('mysore', 'mysuru'), ('mumbai', 'bombay'),
+        ('kolkata', 'calcutta'), ('chennai', 'madras'), ('varanasi', 'banaras', 'benares', 'kashi'),
+        ('kochi', 'cochin'), ('pune', 'poona'), ('shimla', 'simla'), ('gurugram', 'gurgaon'),
+        ('puducherry', 'pondicherry'), ('thiruvananthapuram', 'trivandrum'),
+        ('visakhapatnam', 'vizag'), ('vadodara', 'baroda'), ('prayagraj', 'allahabad'),
+        ('ooty', 'udhagamandalam'), ('mangaluru', 'mangalore'), ('belagavi', 'belgaum'),
+        ('kozhikode', 'calicut'), ('odisha', 'orissa')
+    )
+
+    def __init__(self):
+        self.index = InvertedIndex(self.FIELD_WEIGHTS)
+        self._generation = None  # catalog_watcher generation loaded
+        self._lock = threading.RLock()
+        # Catalog kept for suggestions: city_id -> (name, state),
+        # city_id -> [(attraction_id, name, rating)]
+        self._cities = {}
+        self._attractions = {}
+        self._trie = None  # (TopKTrie, item id -> suggestion)
+        self._trie_version = None  # ranking engine version the trie was built at
+        self._trie_built_at = 0.0
+        self._trie_refreshing = False
+        self._fuzzy = None  # (TrigramIndex, term -> set of city ids)
+
+    @staticmethod
+    def _fields(name, state, description, attractions):
+        return {
+            'name': name,
+            'state': state,
+            'description': description,
+            'attractions': ' '.join(attractions)
+        }
+
+    @staticmethod
+    def _normalize(text):
+        return ' '.join(TOKEN_PATTERN.findall((text or '').lower()))
+
+    def ensure_loaded(self):
+        """Build the index unless already built for the current catalog generation"""
+        generation = catalog_watcher.check()
+        if self._generation == generation:
+            return
+        with self._lock:
+            if self._generation == generation:
+                return
+            from app.database import db
+            from app.models.city import City
+            from app.models.attraction import Attraction
+
+            attraction_terms = {}
+            attractions = {}
+            rows = db.session.query(Attraction.id, Attraction.city_id, Attraction.name, Attraction.category, Attraction.rating)
+            for attraction_id, city_id, name, category, rating in rows:
+                attraction_terms.setdefault(city_id, []).extend(filter(None, (name, category)))
+                attractions.setdefault(city_id, []).append((attraction_id, name, rating or 0))
+
+            index = InvertedIndex(self.FIELD_WEIGHTS)
+            cities = {}
+            for city_id, name, state, description in db.session.query(City.id, City.name, City.state, City.description):
+                index.add_document(city_id, self._fields(name, state, description, attraction_terms.get(city_id, [])))
+                cities[city_id] = (name, state)
+            self.index = index
+            self._cities = cities
+            self._attractions = attractions
+            self._trie = None
+            self._fuzzy = None
+            self._generation = generation
+
+    def index_city(self, city):
+        """(Re)index a City model after it was created or updated"""
+        if self._generation is None:
+            return
+        terms = []
+        attractions = []
+        for attraction in city.attractions:
+            terms.extend(filter(None, (attraction.name, attraction.category)))
+            attractions.append((attraction.id, attraction.name, attraction.rating or 0))
+        with self._lock:
+            self.index.add_document(city.id, self._fields(city.name, city.state, city.description, terms))
+            self._cities[city.id] = (city.name, city.state)
+            self._attractions[city.id] = attractions
+            self._trie = None
+            self._fuzzy = None
+
+    def remove_city(self, city_id):
+        with self._lock:
+            self.index.remove_document(city_id)
+            self._cities.pop(city_id, None)
+            self._attractions.pop(city_id, None)
+            self._trie = None
+            self._fuzzy = None
+
+    def search(self, query):
+        """Matching city ids, best BM25 score first"""
+        self.ensure_loaded()
+        with self._lock:
+            return [city_id for city_id, _ in self.index.search(query)]
+
+    @staticmethod
+    def _popularity(city_ids):
+        """city_id -> review count, used to rank suggestions and fuzzy matches"""
+        ranking_engine.ensure_loaded()
+        popularity = {}
+        for city_id in city_ids:
+            aggregate = ranking_engine.aggregates.get(city_id)
+            popularity[city_id] = aggregate.count if aggregate else 0
+        return popularity
+
+    def _build_trie(self, cities, attractions):
+        """Build the suggestion trie and its payloads from a catalog snapshot"""
+        popularity = self._popularity(cities)
+
+        trie = TopKTrie(self.SUGGEST_K)
+        suggestions = {}
+
+        def add(item_id, text, score, payload):
+            suggestions[item_id] = dict(payload, text=text)
+            words = self._normalize(text).split()
+            for start in range(len(words)):
+                trie.insert(' '.join(words[start:]), item_id, score)
+
+        state_popularity = {}
+        for city_id, (name, state) in cities.items():
+            add(f'city:{city_id}', name, popularity[city_id] + 0.5,
+                {'type': 'city', 'city_id': city_id, 'subtitle': state})
+            if state:
+                state_popularity[state] = state_popularity.get(state, 0) + popularity[city_id]
+            for attraction_id, attraction_name, rating in attractions.get(city_id, []):
+                add(f'attraction:{attraction_id}', attraction_name, popularity[city_id] + rating / 10,
+                    {'type': 'attraction', 'city_id': city_id, 'attraction_id': attraction_id, 'subtitle': name})
+        for state, score in state_popularity.items():
+            add(f'state:{state}', state, score + 1, {'type': 'state'})
+        return trie, suggestions
+
+    def _install_trie(self, built, version):
+        self._trie = built
+        self._trie_version = version
+        self._trie_built_at = time.monotonic()
+
+    def _refresh_trie_in_background(self):
+        """Rebuild the trie with fresh review counts off the request path"""
+        with self._lock:
+            if self._trie_refreshing or time.monotonic() - self._trie_built_at < self.SUGGEST_REFRESH_INTERVAL:
+                return
+            self._trie_refreshing = True
+            current = self._trie
+            cities, attractions = dict(self._cities), dict(self._attractions)
+
+        def refresh():
+            try:
+                version = ranking_engine.version
+                built = self._build_trie(cities, attractions)
+                with self._lock:
+                    # Skip if a catalog change replaced the trie meanwhile
+                    if self._trie is current:
+                        self._install_trie(built, version)
+            except Exception:
+                logger.exception("Could not refresh the suggestion trie")
+            finally:
+                self._trie_refreshing = False
+
+        threading.Thread(target=refresh, name='city-suggest-refresh', daemon=True).start()
+
+    def suggest(self, query, limit=SUGGEST_K):
+        """Most popular cities, states and attractions matching the typed prefix"""
+        self.ensure_loaded()
+        prefix = self._normalize(query)
+        if not prefix:
+            return []
+        built = self._trie
+        if built is None:
+            with self._lock:
+                if self._trie is None:
+                    ranking_engine.ensure_loaded()
+                    version = ranking_engine.version
+                    self._install_trie(self._build_trie(self._cities, self._attractions), version)
+                built = self._trie
+        elif self._trie_version != ranking_engine.version:
+            self._refresh_trie_in_background()
+        trie, suggestions = built
+        return [suggestions[item_id] for item_id in trie.search(prefix, limit)]
+
+    def _build_fuzzy(self):
+        """Rebuild the trigram index of names, name words, states and aliases"""
+        aliases = {}
+        for group in self.ALIAS_GROUPS:
+            for name in group:
+                aliases[name] = group
+        
+        cities_by_term = {}
+        for city_id, (name, state) in self._cities.items():
+            normalized = self._normalize(name)
+            terms = {normalized, self._normalize(state)}
+            terms.update(normalized.split())
+            terms.update(self._normalize(state).split())
+            for term in list(terms):
+                terms.update(aliases.get(term, ()))
+            for term in terms:
+                if len(term) >= self.MIN_FUZZY_TERM_LENGTH:
+                    cities_by_term.setdefault(term, set()).add(city_id)
+        
+        index = TrigramIndex()
+        for term in cities_by_term:
+            index.add(term)
+        self._fuzzy = (index, cities_by_term)
+
+    def fuzzy_search(self, query):
+        """
+        City ids matching query within a few edits of a name, state or
+        alias; closest first, then most popular. Up to 1 edit is allowed
+        for words of 5 letters or fewer, 2 for longer ones.
+        """
+        self.ensure_loaded()
+        fuzzy = self._fuzzy
+        if fuzzy is None:
+            with self._lock:
+                if self._fuzzy is None:
+                    self._build_fuzzy()
+                fuzzy = self._fuzzy
+        index, cities_by_term = fuzzy
+        
+        normalized = self._normalize(query)
+        words = normalized.split()
+        if len(words) > 1:
+            words.append(normalized)
+        best = {}
+        for word in words:
+            if len(word) < self.MIN_FUZZY_TERM_LENGTH:
+                continue
+            for distance, term in index.search(word, 1 if len(word) <= 5 else 2):
+                for city_id in cities_by_term[term]:
+                    if distance < best.get(city_id, distance + 1):
+                        best[city_id] = distance
+        popularity = self._popularity(best)
+        return sorted(best, key=lambda city_id: (best[city_id], -popularity.get(city_id, 0), city_id))
+
+# Global city search index instance
+city_search = CitySearchIndex()
+
+# -----------------------------------------------------------------------------
+# Catalog Facets
+# -----------------------------------------------------------------------------
+class CatalogFacetIndex:
+    """
+    In-memory faceting over the city catalog.
+    Every facet (region, trip_type, category, budget bucket) keeps a
+    BitmapIndex with one bitmap of city ids per value, so a filter is OR
+    within a facet (or AND, for multi-valued trip types when asked) and
+    AND across facets - a handful of integer operations. Facet counts are
+    disjunctive: each facet is counted under every filter except its own,
+    which is what a filter UI needs to show. Budgets are also kept sorted
+    so budget_max cut-offs are a binary search.
+    Results are paged by keyset: each sort order is a sorted list of
+    (sort key..., city_id) tuples, and a page starts with a binary search
+    for the previous page's last entry, so deep pages cost no more than
+    the first. Orders are rebuilt lazily after the catalog (or, for
+    rating, the ranking engine) changes. Kept in sync with the DB through
+    catalog_watcher.
+    """
+    FACETS = ('region', 'trip_type', 'category', 'budget')
+    # (label, exclusive lower bound, inclusive upper bound) per day, in INR;
+    # the bounds line up with the budget_max choices on the cities page
+    BUDGET_BUCKETS = (
+        ('up_to_1500', None, 1500),
+        ('1500_2000', 1500, 2000),
+        ('2000_2500', 2000, 2500),
+        ('2500_3000', 2500, 3000),
+        ('above_3000', 3000, None),
+    )
+    SORTS = ('id', 'name', 'budget', 'rating')
+    # Types of a sort order's entry, for decoding cursors
+    SORT_KEY_TYPES = {
+        'id': [int],
+        'name': [str, int],
+        'budget': [bool, int, int],     # unknown budgets last
+        'rating': [bool, float, int],   # unrated last, then highest score first
+    }
+
+    def __init__(self):
+        self.indexes = {facet: BitmapIndex() for facet in self.FACETS}
+        self.all_ids = 0
+        self._budgets = []  # sorted (avg_budget_per_day, city_id)
+        self._sort_fields = {}  # city_id -> (name, avg_budget_per_day)
+        self._orders = {}  # sort -> (stamp, sorted entries)
+        self._version = 0
+        self._generation = None  # catalog_watcher generation loaded
+        self._lock = threading.RLock()
+
+    @property
+    def trip_types(self):
+        return self.indexes['trip_type']
+
+    @classmethod
+    def budget_bucket(cls, budget):
+        if budget is None:
+            return None
+        for label, low, high in cls.BUDGET_BUCKETS:
+            if (low is None or budget > low) and (high is None or budget <= high):
+                return label
+        return None
+
+    def _facet_values(self, region, trip_types, category, budget):
+        return {
+            'region': [region],
+            'trip_type': trip_types if isinstance(trip_types, list) else [],
+            'category': [category],
+            'budget': [self.budget_bucket(budget)]
+        }
+
+    def _add(self, city_id, name, region, trip_types, category, budget):
+        for facet, values in self._facet_values(region, trip_types, category, budget).items():
+            self.indexes[facet].add(city_id, values)
+        self.all_ids |= 1 << city_id
+        if budget is not None:
+            bisect.insort(self._budgets, (budget, city_id))
+        self._sort_fields[city_id] = (name or '', budget)
+        self._version += 1
+
+    def _remove(self, city_id):
+        for index in self.indexes.values():
+            index.remove(city_id)
+        self.all_ids &= ~(1 << city_id)
+        self._budgets = [entry for entry in self._budgets if entry[1] != city_id]
+        if self._sort_fields.pop(city_id, None) is not None:
+            self._version += 1
+
+    def ensure_loaded(self):
+        """Build the indexes unless already built for the current catalog generation"""
+        generation = catalog_watcher.check()
+        if self._generation == generation:
+            return
+        with self._lock:
+            if self._generation == generation:
+                return
+            from app.database import db
+            from app.models.city import City
+
+            self.indexes = {facet: BitmapIndex() for facet in self.FACETS}
+            self.all_ids = 0
+            self._budgets = []
+            self._sort_fields = {}
+            self._orders = {}
+            rows = db.session.query(
+                City.id, City.name, City.region, City.trip_types, City.category, City.avg_budget_per_day
+            )
+            for row in rows:
+                self._add(*row)
+            self._budgets.sort()
+            self._generation = generation
+
+    def index_city(self, city):
+        """(Re)index a City model after it was created or updated"""
+        if self._generation is None:
+            return
+        with self._lock:
+            self._remove(city.id)
+            self._add(city.id, city.name, city.region, city.trip_types, city.category, city.avg_budget_per_day)
+
+    def remove_city(self, city_id):
+        with self._lock:
+            self._remove(city_id)
+
+    def has_city(self, city_id):
+        """Whether a city id is in the catalog - a bit test, no query"""
+        self.ensure_loaded()
+        return city_id >= 0 and bool(self.all_ids >> city_id & 1)
+
+    def _budget_at_most(self, budget_max):
+        """
+        Bitmap of cities whose daily budget is <= budget_max: the budget
+        facet's bitmaps for whole buckets below the cutoff, plus the ids of
+        the bucket it falls in, found by bisecting the sorted budgets
+        """
+        bitmap = 0
+        covered = None
+        for label, _, high in self.BUDGET_BUCKETS:
+            if high is None or high > budget_max:
+                break
+            bitmap |= self.indexes['budget'].get(label)
+            covered = high
+        start = 0 if covered is None else bisect.bisect_right(self._budgets, (covered, float('inf')))
+        end = bisect.bisect_right(self._budgets, (budget_max, float('inf')))
+        return bitmap | BitmapIndex.bitmap(city_id for _, city_id in self._budgets[start:end])
+
+    def filter(self, selections, budget_max=None, match_all=(), within_ids=None, with_counts=True):
+        """
+        Apply facet filters and count facet values for the result.
+
+        Args:
+            selections: dict facet -> list of selected values (OR within a facet)
+            budget_max: Optional upper bound on avg_budget_per_day
+            match_all: Facets whose selected values must all match (AND)
+            within_ids: Optional ids to restrict to (e.g. search matches)
+            with_counts: Skip the facet counts when False
+
+        Returns:
+            (bitmap of matching city ids, {facet: {value: count}} or None)
+        """
+        self.ensure_loaded()
+        with self._lock:
+            base = self.all_ids
+            if within_ids is not None:
+                base &= BitmapIndex.bitmap(within_ids)
+            if budget_max is not None:
+                base &= self._budget_at_most(budget_max)
+
+            facet_bitmaps = {}
+            for facet, values in selections.items():
+                if facet not in self.indexes or not values:
+                    continue
+                index = self.indexes[facet]
+                facet_bitmaps[facet] = index.all_of(values) if facet in match_all else index.any_of(values)
+
+            matched = base
+            for bitmap in facet_bitmaps.values():
+                matched &= bitmap
+            if not with_counts:
+                return matched, None
+
+            counts = {}
+            for facet, index in self.indexes.items():
+                within = base
+                for other, bitmap in facet_bitmaps.items():
+                    if other != facet:
+                        within &= bitmap
+                counts[facet] = index.counts(within)
+            return matched, counts
+
+    def _sort_order(self, sort):
+        """Sorted (sort key..., city_id) entries for a sort order"""
+        stamp = (self._version, ranking_engine.version if sort == 'rating' else None)
+        cached = self._orders.get(sort)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        if sort == 'name':
+            order = [(name.lower(), city_id) for city_id, (name, _) in self._sort_fields.items()]
+        elif sort == 'budget':
+            order = [(budget is None, budget or 0, city_id) for city_id, (_, budget) in self._sort_fields.items()]
+        elif sort == 'rating':
+            # Stamped before reading: a concurrent change forces a rebuild
+            scores = ranking_engine.get_scores()
+            order = [
+                (city_id not in scores, -scores.get(city_id, 0.0), city_id)
+                for city_id in self._sort_fields
+            ]
+        else:
+            order = [(city_id,) for city_id in self._sort_fields]
+        order.sort()
+        self._orders[sort] = (stamp, order)
+        return order
+
+    def page(self, matched, sort='id', after=None, offset=0, limit=9):
+        """
+        One page of the cities in a filter() bitmap, in a sort order.
+
+        Args:
+            matched: Bitmap of city ids from filter()
+            sort: One of SORTS
+            after: Entry returned as next_key by the previous page (keyset)
+            offset: Matches to skip first (page-number paging)
+            limit: Page size
+
+        Returns:
+            (list of city ids, next_key or None on the last page)
+        """
+        self.ensure_loaded()
+        with self._lock:
+            order = self._sort_order(sort)
+            start = bisect.bisect_right(order, tuple(after)) if after else 0
+            city_ids = []
+            last = None
+            for index in range(start, len(order)):
+                entry = order[index]
+                if not matched >> entry[-1] & 1:
+                    continue
+                if offset:
+                    offset -= 1
+                elif len(city_ids) == limit:
+                    return city_ids, list(last)
+                else:
+                    city_ids.append(entry[-1])
+                    last = entry
+            return city_ids, None
+
+    def get_trip_types(self):
+        """Distinct trip types across all cities, sorted"""
+        self.ensure_loaded()
+        return self.trip_types.values()
+
+# Global catalog facet index instance
+catalog_facets = CatalogFacetIndex()
+
+# -----------------------------------------------------------------------------
+# Geo Index
+# -----------------------------------------------------------------------------
+class GeoIndex:
+    """
+    Nearby / within-radius lookups for cities and attractions.
+    Coordinates live in two GeoGrids (one per kind), kept in sync with the
+    DB through catalog_watcher. Queries return ids with distances; callers
+    load only the rows they return.
+    """
+    CELL_DEGREES = 0.5
+
+    def __init__(self):
+        self.cities = GeoGrid(self.CELL_DEGREES)
+        self.attractions = GeoGrid(self.CELL_DEGREES)
+        self._city_attractions = {}  # city_id -> set of attraction ids
+        self._generation = None  # catalog_watcher generation loaded
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _valid(lat, lng):
+        return lat is not None and lng is not None and -90 <= lat <= 90 and -180 <= lng <= 180
+
+    def ensure_loaded(self):
+        """Build the grids unless already built for the current catalog generation"""
+        generation = catalog_watcher.check()
+        if self._generation == generation:
+            return
+        with self._lock:
+            if self._generation == generation:
+                return
+            from app.database import db
+            from app.models.city import City
+            from app.models.attraction import Attraction
+
+            cities = GeoGrid(self.CELL_DEGREES)
+            for city_id, lat, lng in db.session.query(City.id, City.latitude, City.longitude):
+                if self._valid(lat, lng):
+                    cities.add(city_id, lat, lng)
+
+            attractions = GeoGrid(self.CELL_DEGREES)
+            city_attractions = {}
+            rows = db.session.query(Attraction.id, Attraction.city_id, Attraction.latitude, Attraction.longitude)
+            for attraction_id, city_id, lat, lng in rows:
+                city_attractions.setdefault(city_id, set()).add(attraction_id)
+                if self._valid(lat, lng):
+                    attractions.add(attraction_id, lat, lng)
+
+            self.cities, self.attractions = cities, attractions
+            self._city_attractions = city_attractions
+            self._generation = generation
+
+    def index_city(self, city):
+        """(Re)index a City model and its attractions after a write"""
+        if self._generation is None:
+            return
+        with self._lock:
+            self.remove_city(city.id)
+            if self._valid(city.latitude, city.longitude):
+                self.cities.add(city.id, city.latitude, city.longitude)
+            attraction_ids = self._city_attractions[city.id] = set()
+            for attraction in city.attractions:
+                attraction_ids.add(attraction.id)
+                if self._valid(attraction.latitude, attraction.longitude):
+                    self.attractions.add(attraction.id, attraction.latitude, attraction.longitude)
+
+    def remove_city(self, city_id):
+        """Drop a city and its attractions"""
+        with self._lock:
+            self.cities.remove(city_id)
+            for attraction_id in self._city_attractions.pop(city_id, ()):
+                self.attractions.remove(attraction_id)
+
+    def _query(self, kind, lat, lng, radius_km, limit):
+        self.ensure_loaded()
+        with self._lock:
+            grid = getattr(self, kind)
+            if radius_km is None:
+                return grid.nearest(lat, lng, limit)
+            return grid.within(lat, lng, radius_km, limit)
+
+    def nearby_cities(self, lat, lng, radius_km=None, limit=10):
+        """
+        Cities within radius_km of (lat, lng), or the nearest ones if no radius.
+
+        Returns:
+            list: (distance_km, city_id), nearest first
+        """
+        return self._query('cities', lat, lng, radius_km, limit)
+
+    def nearby_attractions(self, lat, lng, radius_km=None, limit=10):
+        """Same as nearby_cities, for attractions"""
+        return self._query('attractions', lat, lng, radius_km, limit)
+
+# Global geo index instance
+geo_index = GeoIndex()
@@ -30,28 +30,16 @@ class City(db.Model):
     # Relationships
     attractions = relationship("Attraction", back_populates="city", cascade="all, delete-orphan")
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'state': self.state,
-            'description': self.description,
-            'image_url': self.image_url,
-            'badge': self.badge,
-            'best_season': self.best_season,
-            'avg_budget_per_day': self.avg_budget_per_day,
-            'recommended_days': self.recommended_days,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'category': self.category,
-            'region': self.region,
-            'trip_types': self.trip_types
-        }
+    # Serialized columns, in output order
+    FIELDS = (
+        'id', 'name', 'state', 'description', 'image_url', 'badge', 'best_season',
+        'avg_budget_per_day', 'recommended_days', 'latitude', 'longitude',
+        'category', 'region', 'trip_types'
+    )
+
+    def to_dict(self, fields=None):
+        """Serialize all columns, or only the given subset of FIELDS"""
+        return {field: getattr(self, field) for field in fields or self.FIELDS}
 
-    def to_dict_details(self):
-        data = self.to_dict()
-        data['attractions'] = [a.to_dict() for a in self.attractions]
-        return data
-    
     def __repr__(self):
         return f'<City {self.name}>'
@@ -3,13 +3,20 @@ from app.database import db
 
 class Review(db.Model):
     __tablename__ = 'reviews'
+    __table_args__ = (
+        # One review per user per city; also serves lookups by user
+        db.UniqueConstraint('user_id', 'city_id', name='uq_reviews_user_city'),
+        # Keyset pagination of a city's reviews by date and by rating
+        db.Index('idx_reviews_city_created', 'city_id', 'created_at', 'id'),
+        db.Index('idx_reviews_city_rating', 'city_id', 'rating', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     city_id = db.Column(db.Integer, db.ForeignKey('cities.id'), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
     comment = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now(), nullable=False)
 
     def to_dict(self):
         return {
@@ -0,0 +1,16 @@
+from datetime import datetime
+from app.database import db
+
+class UserTrackerState(db.Model):
+    """
+    Persisted UserTracker state, one compact row per tracked user.
+    Written in bulk by the tracker's write-behind flusher and read back
+    lazily the first time a user is seen after a restart.
+    """
+    __tablename__ = 'user_tracker_state'
+
+    user_key = db.Column(db.String(100), primary_key=True)
+    # JSON arrays: navigation oldest first, recent cities most recent first
+    navigation = db.Column(db.Text, nullable=False)
+    recent_cities = db.Column(db.Text, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,8 +1,13 @@
 """
 Input Validators
-Common validation functions
+Common validation functions and request helpers
 """
 import re
+import json
+import base64
+import binascii
+from datetime import datetime
+from sqlalchemy import and_, or_
 
 def validate_email(email):
     """Validate email format"""
@@ -87,3 +92,41 @@ def sanitize_string(s, max_length=None):
         s = s[:max_length]
         
     return s
+
+def encode_cursor(values):
+    """Encode keyset pagination values as an opaque URL-safe cursor"""
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    payload = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def decode_cursor(cursor, types):
+    """
+    Decode a cursor produced by encode_cursor.
+    Each value is converted with the matching callable in types.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        raise ValueError('Invalid cursor')
+    
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError('Invalid cursor')
+    
+    try:
+        return [None if v is None else convert(v) for convert, v in zip(types, values)]
+    except (TypeError, ValueError):
+        raise ValueError('Invalid cursor')
+
+def keyset_filter(order_spec, values):
+    """
+    Build a WHERE clause selecting rows strictly after values in the
+    ordering given by order_spec, a list of (column, 'asc' | 'desc').
+    """
+    clauses = []
+    for i, (column, direction) in enumerate(order_spec):
+        equal_prefix = [c == v for (c, _), v in zip(order_spec[:i], values[:i])]
+        after = column > values[i] if direction == 'asc' else column < values[i]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
@@ -0,0 +1,53 @@
+"""
+Review Import Script
+Streams historical reviews from a CSV or JSON Lines file into the database
+
+Usage:
+    python import_reviews.py reviews.csv [--chunk-size 1000]
+
+CSV files need a header row with user_id, city_id, rating and optionally
+comment and created_at (ISO 8601). JSON Lines files hold one object per line
+with the same keys.
+"""
+import argparse
+import csv
+import json
+import sys
+sys.path.insert(0, '.')
+
+from app.main import create_app
+from app.managers import ReviewIngestor
+
+
+def read_rows(path):
+    """Yield review dicts from a CSV or JSON Lines file without loading it whole"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+parser = argparse.ArgumentParser(description='Bulk import reviews')
+parser.add_argument('path', help='CSV or JSON Lines file')
+parser.add_argument('--chunk-size', type=int, default=ReviewIngestor.DEFAULT_CHUNK_SIZE)
+args = parser.parse_args()
+
+app = create_app()
+
+with app.app_context():
+    print(f"Importing reviews from {args.path}...")
+    stats = ReviewIngestor(chunk_size=args.chunk_size).ingest(read_rows(args.path))
+    print(f"✓ Inserted {stats['inserted']} of {stats['received']} rows "
+          f"({stats['duplicates']} duplicates, {stats['invalid']} invalid)")
+    for error in stats['errors']:
+        print(f"  Row {error['row']}: {error['error']}")
+    print(f"✓ {stats['rows_per_second']} rows/s over {stats['elapsed_seconds']}s "
+          f"in {stats['chunks']} chunks")
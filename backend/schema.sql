@@ -6,6 +6,7 @@
 SET FOREIGN_KEY_CHECKS = 0;
 
 -- Drop existing tables if they exist
+DROP TABLE IF EXISTS user_tracker_state;
 DROP TABLE IF EXISTS favorites;
 DROP TABLE IF EXISTS reviews;
 DROP TABLE IF EXISTS itineraries;
@@ -101,12 +102,15 @@ CREATE TABLE reviews (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    FOREIGN KEY (city_id) REFERENCES cities(id) ON DELETE CASCADE
+    FOREIGN KEY (city_id) REFERENCES cities(id) ON DELETE CASCADE,
+    CONSTRAINT uq_reviews_user_city UNIQUE (user_id, city_id)
 );
 
 -- Create indexes for reviews
 CREATE INDEX idx_reviews_user_id ON reviews(user_id);
 CREATE INDEX idx_reviews_city_id ON reviews(city_id);
+CREATE INDEX idx_reviews_city_created ON reviews(city_id, created_at, id);
+CREATE INDEX idx_reviews_city_rating ON reviews(city_id, rating, created_at, id);
 
 -- ============================================
 -- BOOKINGS TABLE
@@ -162,13 +166,24 @@ CREATE TABLE favorites (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (city_id) REFERENCES cities(id) ON DELETE CASCADE,
-    UNIQUE(user_id, city_id)
+    CONSTRAINT uq_favorites_user_city UNIQUE (user_id, city_id)
 );
 
 -- Create indexes for favorites
 CREATE INDEX idx_favorites_user_id ON favorites(user_id);
 CREATE INDEX idx_favorites_city_id ON favorites(city_id);
 
+-- ============================================
+-- USER TRACKER STATE TABLE
+-- Write-behind copy of in-memory navigation / recent-city state
+-- ============================================
+CREATE TABLE user_tracker_state (
+    user_key VARCHAR(100) PRIMARY KEY,
+    navigation TEXT NOT NULL,
+    recent_cities TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
 -- ============================================
 -- SCHEMA CREATION COMPLETE
 -- ============================================
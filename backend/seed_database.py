@@ -15,6 +15,7 @@ with app.app_context():
     print("Dropping existing tables...")
     try:
         db.session.execute(db.text('SET FOREIGN_KEY_CHECKS = 0'))
+        db.session.execute(db.text('DROP TABLE IF EXISTS user_tracker_state'))
         db.session.execute(db.text('DROP TABLE IF EXISTS favorites'))
         db.session.execute(db.text('DROP TABLE IF EXISTS reviews'))
         db.session.execute(db.text('DROP TABLE IF EXISTS bookings'))
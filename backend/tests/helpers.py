@@ -0,0 +1,55 @@
+"""
+Shared setup for API tests: a Flask app on a throwaway SQLite database
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+_workdir = tempfile.mkdtemp(prefix='scg-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_workdir, 'test.db')
+os.environ['RATING_SNAPSHOT_PATH'] = os.path.join(_workdir, 'rating_index.bin')
+
+import jwt
+from app.main import create_app
+from app.database import db
+from app.api.auth import SECRET_KEY
+from app.models.city import City
+from app.models.user import User
+from app.models import attraction, booking, favorite, review, tracker_state  # noqa: F401 (register tables)
+
+app = create_app()
+with app.app_context():
+    db.create_all()
+client = app.test_client()
+
+
+def create_city(name='Jaipur'):
+    """Insert a city and return its id"""
+    with app.app_context():
+        city = City(name=name, state='Rajasthan', description=f'{name} test city', region='North')
+        db.session.add(city)
+        db.session.commit()
+        return city.id
+
+
+def create_user(username):
+    """Insert a user and return its id"""
+    with app.app_context():
+        user = User(email=f'{username}@example.com', username=username, hashed_password='x', full_name=username)
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+def auth_headers(user_id):
+    """Authorization header carrying a valid token for user_id"""
+    token = jwt.encode(
+        {'user_id': user_id, 'exp': datetime.utcnow() + timedelta(hours=1)},
+        SECRET_KEY, algorithm='HS256'
+    )
+    return {'Authorization': f'Bearer {token}'}
@@ -0,0 +1,47 @@
+"""
+City projections (?fields= / ?include=): canonical cache keys and a bounded
+number of cached variants per city
+"""
+import itertools
+import unittest
+
+from tests.helpers import client, create_city
+from app.managers import city_cache
+from app.models.city import City
+
+
+class CityProjectionTests(unittest.TestCase):
+    def setUp(self):
+        # A fresh city per test, so each starts with an empty cache group
+        self.city_id = create_city('Projection Test City')
+
+    def get_city(self, query=''):
+        response = client.get(f'/api/cities/{self.city_id}{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_unknown_names_are_dropped(self):
+        data = self.get_city('?fields=name,bogus&include=bogus')
+        self.assertEqual(data['city']['name'], 'Projection Test City')
+        self.assertNotIn('bogus', data['city'])
+        self.assertNotIn('attractions', data['city'])
+
+    def test_equivalent_projections_share_a_cache_entry(self):
+        first = self.get_city('?fields=state,name,name,nonexistent&include=reviews_summary,reviews_summary')
+        second = self.get_city('?fields=name,state&include=reviews_summary')
+        self.assertTrue(second['from_cache'])
+        self.assertEqual(first['city'], second['city'])
+
+    def test_cached_projections_are_capped(self):
+        columns = [field for field in City.FIELDS if field != 'id']
+        for combo in itertools.islice(itertools.combinations(columns, 2), city_cache.MAX_GROUP_SIZE + 5):
+            self.get_city('?fields=' + ','.join(combo))
+        self.assertLessEqual(len(city_cache.groups[f'city_{self.city_id}']), city_cache.MAX_GROUP_SIZE)
+
+        data = self.get_city('?fields=' + ','.join(combo))
+        self.assertFalse(data['from_cache'])
+        self.assertEqual(data['city']['id'], self.city_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+HyperLogLog accuracy and merge behaviour, and the unique viewer rollups built on it
+"""
+import unittest
+from datetime import datetime, timedelta
+
+from tests import helpers  # noqa: F401 (puts the backend on sys.path)
+from app.data_structures.hyperloglog import HyperLogLog
+from app.managers import UniqueViewerCounter
+
+
+def filled(ids, precision=11):
+    sketch = HyperLogLog(precision)
+    for item in ids:
+        sketch.add(item)
+    return sketch
+
+
+class HyperLogLogAccuracyTests(unittest.TestCase):
+    """
+    The documented relative standard error is 1.04 / sqrt(m). Hashing is
+    deterministic, so these checks are stable: every estimate must be within
+    3 standard errors, and the mean of SKETCHES independent estimates (whose
+    own spread is ~1/sqrt(SKETCHES) of that) within one.
+    """
+    CARDINALITIES = (100, 1000, 10000, 50000)
+    SKETCHES = 8
+
+    def test_estimates_within_documented_error(self):
+        for precision in (10, 11, 12):
+            tolerance = HyperLogLog(precision).standard_error
+            self.assertAlmostEqual(tolerance, 1.04 / (2 ** precision) ** 0.5)
+            for n in self.CARDINALITIES:
+                with self.subTest(precision=precision, n=n):
+                    errors = []
+                    for k in range(self.SKETCHES):
+                        estimate = filled((f'viewer-{k}-{i}' for i in range(n)), precision).count()
+                        errors.append((estimate - n) / n)
+                    for error in errors:
+                        self.assertLessEqual(abs(error), 3 * tolerance)
+                    self.assertLessEqual(abs(sum(errors) / len(errors)), tolerance)
+
+    def test_repeated_items_are_counted_once(self):
+        sketch = filled(f'viewer-{i % 500}' for i in range(20000))
+        self.assertLessEqual(abs(sketch.count() - 500) / 500, 3 * sketch.standard_error)
+
+    def test_empty_sketch_counts_zero(self):
+        self.assertEqual(HyperLogLog().count(), 0)
+
+
+class HyperLogLogMergeTests(unittest.TestCase):
+    def test_merge_equals_sketch_of_union(self):
+        first = [f'user-{i}' for i in range(0, 30000)]
+        second = [f'user-{i}' for i in range(20000, 50000)]
+        merged = filled(first)
+        merged.merge(filled(second))
+        self.assertEqual(merged.registers, filled(first + second).registers)
+        self.assertLessEqual(abs(merged.count() - 50000) / 50000, 3 * merged.standard_error)
+
+    def test_merge_is_idempotent_and_commutative(self):
+        a = filled(f'a-{i}' for i in range(5000))
+        b = filled(f'b-{i}' for i in range(7000))
+        ab = a.copy()
+        ab.merge(b)
+        ba = b.copy()
+        ba.merge(a)
+        self.assertEqual(ab.registers, ba.registers)
+        again = ab.copy()
+        again.merge(b)
+        self.assertEqual(again.registers, ab.registers)
+
+    def test_copy_is_independent(self):
+        original = filled(f'x-{i}' for i in range(100))
+        before = bytes(original.registers)
+        clone = original.copy()
+        clone.merge(filled(f'y-{i}' for i in range(10000)))
+        self.assertEqual(bytes(original.registers), before)
+
+    def test_merge_rejects_different_precision(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(11).merge(HyperLogLog(12))
+
+
+class UniqueViewerRollupTests(unittest.TestCase):
+    def test_week_counts_returning_viewers_once(self):
+        counter = UniqueViewerCounter()
+        today = datetime.utcnow().date()
+        # 7 days of 2000 viewers each, half of them the same people every day
+        for day in range(7):
+            sketch = HyperLogLog(counter.PRECISION)
+            for i in range(1000):
+                sketch.add(f'regular-{i}')
+                sketch.add(f'day{day}-visitor-{i}')
+            counter.days[today - timedelta(days=day)] = {1: sketch}
+
+        tolerance = 3 * HyperLogLog(counter.PRECISION).standard_error
+        day = counter.get_unique_viewers('day')['cities'][0]['unique_viewers']
+        week = counter.get_unique_viewers('week')['cities'][0]['unique_viewers']
+        self.assertLessEqual(abs(day - 2000) / 2000, tolerance)
+        self.assertLessEqual(abs(week - 8000) / 8000, tolerance)
+
+    def test_record_view_counts_distinct_viewers(self):
+        counter = UniqueViewerCounter()
+        for i in range(3000):
+            counter.record_view(7, f'viewer-{i % 1000}')
+        result = counter.get_unique_viewers('day')
+        self.assertEqual(result['cities'][0]['city_id'], 7)
+        self.assertLessEqual(abs(result['cities'][0]['unique_viewers'] - 1000) / 1000, 3 * result['standard_error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Bulk review ingestion: row validation and per-line error reporting
+"""
+import unittest
+
+from tests.helpers import app, create_city, create_user
+from app.managers import ReviewIngestor
+
+
+class ReviewIngestorTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.city_id = create_city('Ingest Test City')
+        cls.user_id = create_user('ingest_reviewer')
+
+    def ingest(self, rows):
+        with app.app_context():
+            return ReviewIngestor(chunk_size=2).ingest(rows)
+
+    def test_non_integral_rating_is_rejected(self):
+        stats = self.ingest([
+            {'user_id': self.user_id, 'city_id': self.city_id, 'rating': 4.7},
+            {'user_id': self.user_id, 'city_id': self.city_id, 'rating': True},
+        ])
+        self.assertEqual(stats['inserted'], 0)
+        self.assertEqual(stats['invalid'], 2)
+        self.assertEqual([error['row'] for error in stats['errors']], [1, 2])
+
+    def test_unknown_user_is_reported_per_line(self):
+        user_id = create_user('ingest_reviewer_two')
+        stats = self.ingest([
+            {'user_id': 987654, 'city_id': self.city_id, 'rating': 3},
+            {'user_id': user_id, 'city_id': self.city_id, 'rating': '5'},
+            {'user_id': 987655, 'city_id': self.city_id, 'rating': 4.0},
+        ])
+        self.assertEqual(stats['inserted'], 1)
+        self.assertEqual(stats['invalid'], len(stats['errors']))
+        self.assertEqual(stats['errors'], [
+            {'row': 1, 'error': 'Unknown user_id 987654'},
+            {'row': 3, 'error': 'Unknown user_id 987655'},
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
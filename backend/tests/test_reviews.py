@@ -0,0 +1,96 @@
+"""
+Review creation: one review per user per city, even under concurrent posts
+"""
+import threading
+import unittest
+
+from sqlalchemy import event
+
+from tests.helpers import app, client, db, create_city, create_user, auth_headers
+from app.managers import catalog_watcher
+from app.models.review import Review
+
+
+class ReviewCreateTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.city_id = create_city('Review Test City')
+
+    def post_review(self, user_id, rating=4):
+        return client.post('/api/reviews', json={
+            'city_id': self.city_id, 'rating': rating, 'comment': 'Lovely'
+        }, headers=auth_headers(user_id))
+
+    def review_count(self, user_id):
+        with app.app_context():
+            return Review.query.filter_by(user_id=user_id, city_id=self.city_id).count()
+
+    def test_second_review_is_rejected(self):
+        user_id = create_user('repeat_reviewer')
+        self.assertEqual(self.post_review(user_id).status_code, 201)
+        response = self.post_review(user_id, rating=2)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('already reviewed', response.get_json()['error'])
+        self.assertEqual(self.review_count(user_id), 1)
+
+    def test_concurrent_posts_store_one_review(self):
+        user_id = create_user('concurrent_reviewer')
+        statuses = []
+        start = threading.Barrier(8)
+
+        def post():
+            start.wait()
+            statuses.append(self.post_review(user_id).status_code)
+
+        threads = [threading.Thread(target=post) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(statuses.count(201), 1)
+        self.assertEqual(statuses.count(400), 7)
+        self.assertEqual(self.review_count(user_id), 1)
+
+    def test_post_is_a_single_insert(self):
+        # As if CHECK_INTERVAL had passed: the catalog picks up the new city
+        catalog_watcher._checked_at = None
+        self.assertEqual(self.post_review(create_user('warm_up_reviewer')).status_code, 201)
+
+        user_id = create_user('single_statement_reviewer')
+        statements = []
+        with app.app_context():
+            engine = db.engine
+        listener = lambda conn, cursor, statement, *args: statements.append(statement.upper())
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            self.assertEqual(self.post_review(user_id).status_code, 201)
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+
+        # Besides the token's user lookup: one INSERT, no SELECT beforehand
+        review_statements = [statement for statement in statements if 'REVIEWS' in statement]
+        self.assertEqual(len(review_statements), 1)
+        self.assertTrue(review_statements[0].lstrip().startswith('INSERT'))
+        self.assertFalse([statement for statement in statements if 'FROM CITIES' in statement])
+
+    def test_unknown_city_is_rejected(self):
+        user_id = create_user('lost_reviewer')
+        response = client.post('/api/reviews', json={
+            'city_id': 987654, 'rating': 4, 'comment': 'Where am I?'
+        }, headers=auth_headers(user_id))
+        self.assertEqual(response.status_code, 404)
+        with app.app_context():
+            self.assertEqual(Review.query.filter_by(user_id=user_id).count(), 0)
+
+    def test_invalid_rating_is_rejected_before_insert(self):
+        user_id = create_user('bad_rating_reviewer')
+        for rating in ('5', 0, 6, 4.5, True, None):
+            with self.subTest(rating=rating):
+                response = self.post_review(user_id, rating=rating)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.review_count(user_id), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+UserTracker write-behind persistence: table registration and bounded retries
+"""
+import unittest
+
+from tests.helpers import app, db
+from app.managers import UserTracker
+from app.models.tracker_state import UserTrackerState
+
+
+class FailingTracker(UserTracker):
+    def _upsert(self, rows):
+        raise RuntimeError('database unavailable')
+
+
+class UserTrackerPersistenceTests(unittest.TestCase):
+    def test_flush_writes_state_table(self):
+        tracker = UserTracker()
+        tracker._app = app
+        tracker.track_navigation(101, 'home')
+        self.assertEqual(tracker.flush(), 1)
+        with app.app_context():
+            self.assertIsNotNone(db.session.get(UserTrackerState, '101'))
+
+    def test_evicted_states_are_dropped_after_max_retries(self):
+        tracker = FailingTracker()
+        tracker._app = app
+        for user_id in range(5):
+            tracker.track_navigation(200 + user_id, 'home')
+            tracker._forget(200 + user_id)
+        self.assertEqual(len(tracker._evicted_states), 5)
+
+        for _ in range(tracker.MAX_FLUSH_RETRIES + 1):
+            with self.assertRaises(RuntimeError):
+                tracker.flush()
+        self.assertEqual(tracker._evicted_states, {})
+        self.assertEqual(tracker._flush_failures, {})
+        self.assertEqual(tracker.persistence_stats['dropped'], 5)
+        self.assertEqual(tracker.flush(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
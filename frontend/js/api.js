@@ -35,6 +35,13 @@ class APIClient {
             console.warn('No token found in localStorage');
         }
 
+        // Signed anonymous id issued by the navigation batch endpoint, so
+        // anonymous city views count towards recent cities and co-views
+        const trackerId = sessionStorage.getItem('scg_tracker_id');
+        if (trackerId) {
+            headers['X-Tracker-Id'] = trackerId;
+        }
+
         try {
             const response = await fetch(url, { ...options, headers });
             const data = await response.json();
@@ -57,6 +64,11 @@ class APIClient {
         return await this.request(endpoint);
     }
 
+    async getSuggestions(query, limit = 10) {
+        const params = new URLSearchParams({ q: query, limit }).toString();
+        return await this.request(`${API_CONFIG.ENDPOINTS.SUGGEST}?${params}`);
+    }
+
     async getCityById(id) {
         return await this.request(API_CONFIG.ENDPOINTS.CITY_BY_ID(id));
     }
@@ -140,8 +152,13 @@ class APIClient {
     }
 
     // Reviews
-    async getReviews(cityId) {
-        return await this.request(`${API_CONFIG.ENDPOINTS.REVIEWS}/${cityId}`);
+    async getReviews(cityId, cursor = null) {
+        const params = cursor ? `?${new URLSearchParams({ cursor }).toString()}` : '';
+        return await this.request(`${API_CONFIG.ENDPOINTS.REVIEWS}/${cityId}${params}`);
+    }
+
+    async getReviewSummary(cityId) {
+        return await this.request(`${API_CONFIG.ENDPOINTS.REVIEWS}/${cityId}/summary`);
     }
 
     async addReview(reviewData) {
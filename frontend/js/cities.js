@@ -13,6 +13,10 @@ let currentFilters = {
     limit: 6
 };
 let userFavorites = [];
+let nextCursor = null; // keyset cursor for "Load More"
+
+// Columns the city cards render; the API skips loading the rest
+const CARD_FIELDS = 'name,image_url,badge,category,description,recommended_days,avg_budget_per_day,best_season';
 
 // DOM Elements
 const elements = {
@@ -42,12 +46,6 @@ function debounce(func, wait) {
 // Initialize page
 async function init() {
     try {
-        // Load filter options
-        await Promise.all([
-            loadRegions(),
-            loadTripTypes()
-        ]);
-
         // Load favorites if user is logged in
         if (localStorage.getItem('token')) {
             await loadFavorites();
@@ -60,7 +58,7 @@ async function init() {
             if (elements.search) elements.search.value = currentFilters.search;
         }
 
-        // Initial load
+        // Initial load (also fills the region and trip type dropdowns)
         await loadCities();
 
         // Event Listeners
@@ -141,42 +139,26 @@ window.toggleFavorite = async function (cityId, btn) {
     }
 };
 
-// Load Regions for dropdown
-async function loadRegions() {
-    try {
-        const response = await api.getRegions();
-        if (response.success && elements.region) {
-            response.regions.forEach(region => {
-                if (region) {
-                    const option = document.createElement('option');
-                    option.value = region;
-                    option.textContent = region;
-                    elements.region.appendChild(option);
-                }
-            });
-        }
-    } catch (error) {
-        console.error('Error loading regions:', error);
-    }
-}
-
-// Load Trip Types for dropdown
-async function loadTripTypes() {
-    try {
-        const response = await api.getTripTypes();
-        if (response.success && elements.tripType) {
-            response.trip_types.forEach(type => {
-                if (type) {
-                    const option = document.createElement('option');
-                    option.value = type;
-                    option.textContent = type;
-                    elements.tripType.appendChild(option);
-                }
-            });
-        }
-    } catch (error) {
-        console.error('Error loading trip types:', error);
-    }
+// Fill a filter dropdown from the facet counts returned with the city list.
+// Counts follow the other active filters, so each option shows how many
+// cities picking it would leave.
+function renderFacetOptions(select, counts, selected) {
+    if (!select || !counts) return;
+
+    const values = Object.keys(counts);
+    if (selected && !values.includes(selected)) values.push(selected);
+    values.sort();
+
+    const placeholder = select.options[0];
+    select.innerHTML = '';
+    select.appendChild(placeholder);
+    values.forEach(value => {
+        const option = document.createElement('option');
+        option.value = value;
+        option.textContent = `${value} (${counts[value] || 0})`;
+        select.appendChild(option);
+    });
+    select.value = selected || '';
 }
 
 // Load Cities with current filters
@@ -194,10 +176,15 @@ async function loadCities(append = false) {
         elements.loadMoreBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Loading...';
     }
 
-    if (elements.count) elements.count.textContent = 'Searching...';
+    if (elements.count && !append) elements.count.textContent = 'Searching...';
 
     try {
-        const response = await api.getCities(currentFilters);
+        // Later pages continue from the cursor and skip the counts,
+        // which the first page already returned
+        const filters = append && nextCursor
+            ? { ...currentFilters, fields: CARD_FIELDS, cursor: nextCursor, count: 'none' }
+            : { ...currentFilters, fields: CARD_FIELDS };
+        const response = await api.getCities(filters);
 
         if (response.success) {
             if (append) {
@@ -206,7 +193,14 @@ async function loadCities(append = false) {
                 renderCities(response.cities, false);
             }
 
-            if (elements.count) {
+            nextCursor = response.next_cursor || null;
+
+            if (!append && response.facets) {
+                renderFacetOptions(elements.region, response.facets.region, currentFilters.region);
+                renderFacetOptions(elements.tripType, response.facets.trip_type, currentFilters.trip_type);
+            }
+
+            if (elements.count && response.count !== null) {
                 elements.count.textContent = `Found ${response.count} destination${response.count !== 1 ? 's' : ''}`;
             }
 
@@ -45,7 +45,10 @@ function renderCityDetail(city) {
     document.getElementById('infoSeason').textContent = city.best_season || 'Year-round';
     document.getElementById('infoBudget').textContent = `₹${city.avg_budget_per_day}`;
     document.getElementById('infoDuration').textContent = city.recommended_days || '3 Days';
-    document.getElementById('infoRating').textContent = city.rating ? `${city.rating}/5` : 'New';
+    const summary = city.reviews_summary;
+    document.getElementById('infoRating').textContent = summary && summary.count
+        ? `${summary.average}/5 (${summary.count})`
+        : 'New';
 
     // Description
     document.getElementById('cityDescription').textContent = city.description;
@@ -12,6 +12,7 @@ const API_CONFIG = {
         TRIP_TYPES: '/cities/trip-types',
         ATTRACTION_CATEGORIES: '/cities/attraction-categories',
         EXPLORE: '/cities/explore',
+        SUGGEST: '/cities/suggest',
 
         // Auth
         LOGIN: '/auth/login',
@@ -31,6 +32,9 @@ const API_CONFIG = {
         ADMIN_USERS: '/admin/users',
 
         // Favorites
-        FAVORITES: '/favorites'
+        FAVORITES: '/favorites',
+
+        // Navigation tracking
+        NAVIGATION_BATCH: '/users/navigation/batch'
     }
 };
@@ -5,6 +5,7 @@
 
 // State
 let currentReviewCityId = null;
+let reviewsCursor = null; // keyset cursor for the next page of reviews
 
 // DOM Elements
 const reviewsModal = document.getElementById('reviewsModal');
@@ -31,13 +32,14 @@ function closeReviewsModal() {
     reviewsModal.style.display = 'none';
 }
 
-// Load Reviews
-async function loadReviews(cityId) {
+// Load Reviews (append = next page after the current cursor)
+async function loadReviews(cityId, append = false) {
     try {
-        const response = await api.getReviews(cityId);
+        const response = await api.getReviews(cityId, append ? reviewsCursor : null);
         
         if (response.success) {
-            renderReviews(response.reviews);
+            reviewsCursor = response.next_cursor || null;
+            renderReviews(response.reviews, append);
         } else {
             reviewsList.innerHTML = '<p class="no-reviews">Failed to load reviews.</p>';
         }
@@ -48,8 +50,8 @@ async function loadReviews(cityId) {
 }
 
 // Render Reviews
-function renderReviews(reviews) {
-    if (!reviews || reviews.length === 0) {
+function renderReviews(reviews, append = false) {
+    if (!append && (!reviews || reviews.length === 0)) {
         reviewsList.innerHTML = `
             <div class="no-reviews">
                 <i class="far fa-comment-dots"></i>
@@ -59,7 +61,7 @@ function renderReviews(reviews) {
         return;
     }
 
-    reviewsList.innerHTML = reviews.map(review => `
+    const html = reviews.map(review => `
         <div class="review-card">
             <div class="review-header">
                 <span class="review-author"><i class="fas fa-user-circle"></i> ${review.user_name}</span>
@@ -71,6 +73,24 @@ function renderReviews(reviews) {
             <p class="review-comment">${review.comment}</p>
         </div>
     `).join('');
+
+    const oldButton = document.getElementById('loadMoreReviews');
+    if (oldButton) oldButton.remove();
+    if (append) {
+        reviewsList.insertAdjacentHTML('beforeend', html);
+    } else {
+        reviewsList.innerHTML = html;
+    }
+
+    if (reviewsCursor) {
+        reviewsList.insertAdjacentHTML('beforeend',
+            '<button id="loadMoreReviews" class="btn-load-more">Load More <i class="fas fa-chevron-down"></i></button>');
+        document.getElementById('loadMoreReviews').addEventListener('click', (e) => {
+            e.target.disabled = true;
+            e.target.classList.add('loading');
+            loadReviews(currentReviewCityId, true);
+        });
+    }
 }
 
 // Render Stars Helper
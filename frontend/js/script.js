@@ -6,8 +6,80 @@
 document.addEventListener('DOMContentLoaded', () => {
     checkLoginState();
     setupMobileMenu();
+    NavigationTracker.record(window.location.pathname);
 });
 
+// Buffered page-view tracking
+// Views are queued in sessionStorage across page loads and sent in batches,
+// either when the queue is due or when the tab is hidden.
+const NavigationTracker = {
+    STORAGE_KEY: 'scg_nav_queue',
+    FLUSH_INTERVAL_MS: 10000,
+    MAX_QUEUE: 20,
+
+    // Logged-in users are identified by their token; anonymous visitors by
+    // the signed session-scoped id the server hands back on first flush.
+    identity() {
+        const identity = {};
+        const token = localStorage.getItem('token');
+        const trackerId = sessionStorage.getItem('scg_tracker_id');
+        if (token) identity.token = token;
+        if (trackerId) identity.tracker_id = trackerId;
+        return identity;
+    },
+
+    load() {
+        try {
+            return JSON.parse(sessionStorage.getItem(this.STORAGE_KEY)) || [];
+        } catch (e) {
+            return [];
+        }
+    },
+
+    save(queue) {
+        sessionStorage.setItem(this.STORAGE_KEY, JSON.stringify(queue));
+    },
+
+    record(page) {
+        if (typeof API_CONFIG === 'undefined') return;
+        const queue = this.load();
+        queue.push({ page, client_timestamp: new Date().toISOString() });
+        this.save(queue);
+        this.flush(false);
+        if (!this.timer) {
+            this.timer = setInterval(() => this.flush(false), this.FLUSH_INTERVAL_MS / 2);
+            document.addEventListener('visibilitychange', () => {
+                if (document.visibilityState === 'hidden') this.flush(true);
+            });
+            window.addEventListener('pagehide', () => this.flush(true));
+        }
+    },
+
+    flush(unloading) {
+        const queue = this.load();
+        if (!queue.length) return;
+        const oldest = Date.parse(queue[0].client_timestamp) || 0;
+        const due = queue.length >= this.MAX_QUEUE || Date.now() - oldest >= this.FLUSH_INTERVAL_MS;
+        // Leaving the page sends whatever is queued, due or not
+        if (!due && !unloading) return;
+
+        const url = API_CONFIG.BASE_URL + API_CONFIG.ENDPOINTS.NAVIGATION_BATCH;
+        // text/plain keeps the request CORS-simple so sendBeacon is allowed
+        const payload = Object.assign({ events: queue }, this.identity());
+        const body = new Blob([JSON.stringify(payload)], { type: 'text/plain' });
+        this.save([]);
+        if (unloading && navigator.sendBeacon && navigator.sendBeacon(url, body)) return;
+        fetch(url, { method: 'POST', body, keepalive: true })
+            .then(response => response.json())
+            .then(data => {
+                if (data.tracker_id) sessionStorage.setItem('scg_tracker_id', data.tracker_id);
+            })
+            .catch(() => {
+                this.save(queue.concat(this.load()));
+            });
+    }
+};
+
 // Check if user is logged in and update UI
 function checkLoginState() {
     const token = localStorage.getItem('token');
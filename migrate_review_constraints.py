@@ -0,0 +1,70 @@
+import sys
+import os
+from sqlalchemy import text, inspect
+
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+from app.main import create_app
+from app.database import db
+
+# table -> (unique index on (user_id, city_id), other indexes)
+TABLES = {
+    'reviews': ('uq_reviews_user_city', {
+        'idx_reviews_city_created': ('city_id', 'created_at', 'id'),
+        'idx_reviews_city_rating': ('city_id', 'rating', 'created_at', 'id'),
+    }),
+    'favorites': ('uq_favorites_user_city', {}),
+}
+
+def existing_indexes(conn, table):
+    inspector = inspect(conn)
+    names = {index['name'] for index in inspector.get_indexes(table)}
+    names.update(constraint['name'] for constraint in inspector.get_unique_constraints(table))
+    return names
+
+def remove_duplicates(conn, table):
+    """Keep the oldest row (lowest id) of each (user_id, city_id) pair"""
+    result = conn.execute(text(
+        f"DELETE FROM {table} WHERE id NOT IN ("
+        f"SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM {table} GROUP BY user_id, city_id) AS keep)"
+    ))
+    return result.rowcount
+
+def migrate():
+    print("🔄 Starting Review/Favorite Constraint Migration...")
+    app = create_app()
+
+    with app.app_context():
+        try:
+            removed_reviews = 0
+            with db.engine.begin() as conn:
+                for table, (unique_name, indexes) in TABLES.items():
+                    present = existing_indexes(conn, table)
+                    if unique_name in present:
+                        print(f"ℹ️ {unique_name} already exists.")
+                    else:
+                        removed = remove_duplicates(conn, table)
+                        if table == 'reviews':
+                            removed_reviews = removed
+                        print(f"   - Removed {removed} duplicate row(s) from '{table}'")
+                        conn.execute(text(f"CREATE UNIQUE INDEX {unique_name} ON {table} (user_id, city_id)"))
+                        print(f"   - Created {unique_name}")
+
+                    for name, columns in indexes.items():
+                        if name in present:
+                            print(f"ℹ️ {name} already exists.")
+                            continue
+                        conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+                        print(f"   - Created {name}")
+
+            # The rating snapshot still counts the deleted reviews; drop it so
+            # the next start rebuilds the aggregates from the table
+            snapshot_path = app.config['RATING_SNAPSHOT_PATH']
+            if removed_reviews and os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+                print(f"   - Removed stale rating snapshot {snapshot_path}")
+            print("✅ Migration Successful.")
+        except Exception as e:
+            print(f"❌ Migration Failed: {e}")
+
+if __name__ == '__main__':
+    migrate()
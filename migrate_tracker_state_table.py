@@ -0,0 +1,27 @@
+import sys
+import os
+from sqlalchemy import inspect
+
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+from app.main import create_app
+from app.database import db
+from app.models.tracker_state import UserTrackerState
+
+def migrate():
+    print("🔄 Starting User Tracker State Migration...")
+    app = create_app()
+
+    with app.app_context():
+        try:
+            table = UserTrackerState.__table__
+            if inspect(db.engine).has_table(table.name):
+                print(f"ℹ️ Table '{table.name}' already exists.")
+            else:
+                table.create(db.engine)
+                print(f"   - Created table '{table.name}'")
+            print("✅ Migration Successful.")
+        except Exception as e:
+            print(f"❌ Migration Failed: {e}")
+
+if __name__ == '__main__':
+    migrate()